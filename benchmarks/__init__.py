@@ -0,0 +1 @@
+"""Performance benchmarks for the Dikarya BPCL dashboard (run as modules)."""
@@ -0,0 +1,100 @@
+"""Compare the legacy record parsing path with the schema-typed one.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_parsing --rows 10000000
+
+A synthetic log with the same columns as Logs/experiment_records.csv is
+written to a temporary file (or ``--csv``), then both pipelines run on it:
+
+* legacy: inferred ``read_csv``, per-row regex experiment extraction,
+  ``date + " " + time`` parsed without a format, six ``to_numeric`` passes.
+* typed: ``helper.schema`` declared dtypes, categorical ids, per-category
+  experiment/date/time parsing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.synthetic import write_synthetic_log  # noqa: E402
+from helper import schema  # noqa: E402
+
+
+def write_synthetic_csv(path: Path, rows: int, experiments: int = 20, seed: int = 0) -> None:
+    """Write ``rows`` records sampled every 2 s, cycling through experiments."""
+    write_synthetic_log(path, rows=rows, experiments=experiments, seed=seed)
+
+
+def legacy_pipeline(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df["exp_num"] = df["experiment"].apply(
+        lambda value: int(m.group()) if (m := re.search(r"\d+", str(value))) else None
+    )
+    df["date"] = df["date"].astype(str)
+    df["time"] = df["time"].astype(str)
+    df["timestamp"] = pd.to_datetime(df["date"] + " " + df["time"], errors="coerce")
+    for col in schema.NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def typed_pipeline(path: Path) -> pd.DataFrame:
+    df = schema.read_csv_typed(path)
+    df["exp_num"] = schema.experiment_numbers(df["experiment"])
+    df["timestamp"] = schema.timestamps(df)
+    return df
+
+
+def _time(func, path: Path, repeat: int) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--csv", type=Path, help="reuse or create this log file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv or Path(tmp) / "experiment_records.csv"
+        if not path.exists():
+            started = time.perf_counter()
+            write_synthetic_csv(path, args.rows)
+            print(f"generated {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+        legacy_s, legacy = _time(legacy_pipeline, path, args.repeat)
+        typed_s, typed = _time(typed_pipeline, path, args.repeat)
+
+        same = (
+            legacy["timestamp"].equals(typed["timestamp"])
+            and legacy["exp_num"].astype("Int64").equals(typed["exp_num"])
+        )
+        print(f"rows            {len(typed):,}")
+        print(f"legacy          {legacy_s:8.2f} s  {legacy.memory_usage(deep=True).sum() / 1e6:9.1f} MB")
+        print(f"schema-typed    {typed_s:8.2f} s  {typed.memory_usage(deep=True).sum() / 1e6:9.1f} MB")
+        print(f"speedup         {legacy_s / typed_s:8.2f} x")
+        print(f"results match   {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
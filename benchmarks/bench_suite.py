@@ -0,0 +1,392 @@
+"""End-to-end performance suite for ingestion, retrieval and the dashboard.
+
+Usage (from the project root)::
+
+    python -m benchmarks.bench_suite --days 7 --experiments 20 --interval 2 \\
+        --output benchmark_results.json
+
+A synthetic log (see benchmarks.synthetic) is generated in a temporary
+directory and the following are timed against it:
+
+* ``insert``: ``insert_experiment_record`` one call per record, and the
+  batched ``RecordWriter`` (rows per second).
+* ``get_data``: ``get_data_by_date_and_experiment`` through each storage path
+  (partitions, SQLite, offset index, rollups, streaming scan, and the query
+  cache cold and warm) with latency and tracemalloc peak memory.
+* ``sample_log``: exporting an experiment's rows as its binary sample log
+  (what stopping an experiment writes), opening it (memory map) and slicing
+  an hour out of it.
+* ``shm_ring``: publishing into the logger daemon's shared-memory sample
+  ring, and a read-only viewer catching up on a full ring.
+* ``prepare``: ``FullScreenWindow._prepare_dataframe_for_display``.
+* ``plot``: ``FullScreenWindow._plot_dataframe`` for every graph time scale.
+* ``tick``: one rendered frame (``FullScreenWindow._render_frame``) for a
+  newly acquired sample with a full live history, for every graph time
+  scale.
+
+The GUI benchmarks run under ``QT_QPA_PLATFORM=offscreen`` and log into the
+temporary directory, never into Logs/. Results are written as JSON so runs can
+be compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.synthetic import synthetic_records, write_synthetic_log  # noqa: E402
+from helper import data_get, data_insert, sample_log  # noqa: E402
+from helper.sensors import CHANNELS  # noqa: E402
+
+RESULT_VERSION = 1
+
+
+def _summary(samples_s: list[float]) -> dict[str, float]:
+    ms = sorted(value * 1000 for value in samples_s)
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))], 3),
+        "max_ms": round(ms[-1], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+    }
+
+
+def _repeat(func: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None):
+    samples, result = [], None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return samples, result
+
+
+def _peak_bytes(func: Callable[[], object], setup: Callable[[], None] | None = None) -> int:
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _metadata() -> dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+# ---------------------------------------------------------------- ingestion
+def bench_insert(workdir: Path, records: int, sync_records: int) -> dict[str, object]:
+    payload = synthetic_records(records)
+
+    sync_path = workdir / "insert_sync.csv"
+    started = time.perf_counter()
+    for record in payload[:sync_records]:
+        data_insert.insert_experiment_record(record, csv_path=sync_path)
+    sync_s = time.perf_counter() - started
+
+    writer_path = workdir / "insert_writer.csv"
+    writer = data_insert.RecordWriter(writer_path, max_queue=records + 1, fsync="never").start()
+    started = time.perf_counter()
+    for record in payload:
+        writer.submit(record)
+    writer.flush()
+    writer_s = time.perf_counter() - started
+    writer.close()
+
+    return {
+        "insert_experiment_record": {
+            "records": sync_records,
+            "seconds": round(sync_s, 4),
+            "rows_per_s": round(sync_records / sync_s, 1),
+        },
+        "record_writer": {
+            "records": records,
+            "seconds": round(writer_s, 4),
+            "rows_per_s": round(records / writer_s, 1),
+            "stats": writer.stats(),
+        },
+    }
+
+
+# ---------------------------------------------------------------- retrieval
+_QUERY_MODES: dict[str, dict[str, object]] = {
+    "partitions": {"backend": "partitions", "use_cache": False},
+    "sqlite": {"backend": "sqlite", "use_cache": False},
+    "cache_cold": {"backend": "partitions"},
+    "cache_warm": {"backend": "partitions"},
+    "index": {"backend": "partitions", "use_partitions": False, "use_cache": False},
+    "rollup_minute": {"resolution": "minute"},
+    "rollup_hour": {"resolution": "hour"},
+    "streaming": {"streaming": True},
+}
+
+
+def bench_get_data(csv_path: Path, start: str, end: str, experiments: list[int], repeat: int):
+    data_insert.ensure_partition_store(csv_path)
+    data_insert.ensure_sqlite_store(csv_path)
+    data_insert.ensure_rollups(csv_path)
+    results = {}
+    frame = None
+    for mode, options in _QUERY_MODES.items():
+        def run(options=options):
+            return data_get.get_data_by_date_and_experiment(
+                start, end, experiments, csv_path, **options
+            )
+
+        setup = data_get.clear_cache if mode == "cache_cold" else None
+        if mode == "cache_warm":
+            run()
+        samples, frame = _repeat(run, repeat, setup)
+        results[mode] = {
+            **_summary(samples),
+            "rows": len(frame),
+            "result_bytes": int(frame.memory_usage(deep=True).sum()),
+            "peak_traced_bytes": _peak_bytes(run, setup),
+        }
+    results["cache_stats"] = data_get.cache_stats()
+    data_get.clear_cache()
+    return results, frame
+
+
+def bench_sample_log(workdir: Path, frame: pd.DataFrame, repeat: int) -> dict[str, object]:
+    path = workdir / f"sample_log{sample_log.SUFFIX}"
+    samples, records = _repeat(
+        lambda: sample_log.write_frame(path, frame, CHANNELS, experiment="EXP_1"), repeat
+    )
+    log = sample_log.SampleLog(path)
+    middle_ms = int(log.column("ms")[len(log) // 2]) if len(log) else 0
+    open_samples, _ = _repeat(lambda: sample_log.SampleLog(path), repeat)
+    slice_samples, window = _repeat(lambda: log.between(middle_ms, middle_ms + 3_600_000), repeat)
+    return {
+        "records": records,
+        "bytes": path.stat().st_size,
+        "export": _summary(samples),
+        "export_rows_per_s": round(records / statistics.median(samples), 1),
+        "open": _summary(open_samples),
+        "slice_hour": {**_summary(slice_samples), "rows": len(window)},
+    }
+
+
+def bench_shm_ring(records: int, repeat: int) -> dict[str, object]:
+    from helper.shm_ring import SampleRing
+
+    capacity = max(2, min(records, 1 << 16))
+    values = {name: 1.0 for name in CHANNELS}
+    ring = SampleRing.create(f"bpcl_bench_{os.getpid()}", CHANNELS, capacity)
+    try:
+        started = time.perf_counter()
+        for i in range(records):
+            ring.publish(i, values)
+        publish_s = time.perf_counter() - started
+
+        viewer = SampleRing.attach(ring.name)
+        try:
+            catch_up, (_, views) = _repeat(lambda: viewer.since(0), repeat)
+            rows = sum(len(view) for view in views)
+            del views
+        finally:
+            viewer.close()
+    finally:
+        ring.close()
+    return {
+        "records": records,
+        "capacity": capacity,
+        "publish_rows_per_s": round(records / publish_s, 1),
+        "catch_up": {**_summary(catch_up), "rows": rows},
+    }
+
+
+# --------------------------------------------------------------------- GUI
+def _window(workdir: Path):
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    from source import main as dashboard
+
+    dashboard.data.log_dir = str(workdir)
+    dashboard.data.check_file = str(workdir / "last_exp.txt")
+    dashboard.data.catalog_path = str(workdir / "experiments.sqlite3")
+    window = dashboard.FullScreenWindow()
+    window.show()
+    app.processEvents()
+    return app, dashboard, window
+
+
+def bench_prepare(dashboard, frame: pd.DataFrame, repeat: int) -> dict[str, object]:
+    samples, clean = _repeat(
+        lambda: dashboard.FullScreenWindow._prepare_dataframe_for_display(frame), repeat
+    )
+    return {**_summary(samples), "rows": len(clean)}
+
+
+def bench_plot(app, window, clean: pd.DataFrame, repeat: int) -> dict[str, object]:
+    results = {}
+    for scale in window.time_scales:
+        window.time_scale_combo.setCurrentText(scale)
+        app.processEvents()
+        samples, _ = _repeat(lambda: window._plot_dataframe(clean), repeat)
+        results[scale] = {**_summary(samples), "points": len(window._plotted_series[0])}
+    window._clear_plot_items()
+    return results
+
+
+def _tick(window, rig) -> None:
+    rig.pending.append(rig.engine.read_now())
+    window._render_frame()
+
+
+def bench_tick(app, dashboard, window, workdir: Path, interval_s: float, ticks: int):
+    previous = data_insert.set_record_writer(
+        data_insert.RecordWriter(workdir / "tick_records.csv", fsync="never").start()
+    )
+    results = {}
+    try:
+        window.interval_input.setText(f"{interval_s:g}")
+        window.interval_unit_combo.setCurrentText("Seconds")
+        window._start_experiment()
+        rig = window.rig
+        rig.engine.stop()
+
+        # A day-long experiment up to now: the raw buffer wraps, the tiers fill up
+        history = rig.history
+        step_ms = interval_s * 1000
+        count = int(24 * 3600 / interval_s)
+        start_ms = time.time() * 1000 - count * step_ms
+        rig.experiment_start_ms = start_ms
+        for i in range(count):
+            history.append({
+                "ms": start_ms + i * step_ms,
+                "temp_1": 29.8, "temp_2": 27.3,
+                "weight_1": 30.15 - i * 1e-5, "weight_2": 15.18 - i * 5e-6,
+                "room_temp": 0.0,
+            })
+
+        for scale in window.time_scales:
+            started = time.perf_counter()
+            window.time_scale_combo.setCurrentText(scale)
+            switch_s = time.perf_counter() - started
+            app.processEvents()
+            samples, _ = _repeat(lambda: _tick(window, rig), ticks)
+            results[scale] = {
+                **_summary(samples),
+                "switch_ms": round(switch_s * 1000, 3),
+                "tier": history.select(window._scale_span_s() * 1000, 4 * window._plot_buckets()),
+                "drawn_points": len(window._plotted_series[0]),
+            }
+        results["sensor_latency"] = rig.source.latency_stats()
+        window._stop_experiment(silent=True)
+        window._shutdown_finishers()
+    finally:
+        writer = data_insert.set_record_writer(previous)
+        if writer is not None:
+            writer.close()
+            results["writer_stats"] = writer.stats()
+    return results
+
+
+# --------------------------------------------------------------------- main
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=7.0)
+    parser.add_argument("--experiments", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=2.0, help="sample interval in seconds")
+    parser.add_argument("--records", type=int, default=20_000, help="records for the writer benchmark")
+    parser.add_argument("--sync-records", type=int, default=2_000, help="records inserted one call each")
+    parser.add_argument("--query-experiments", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--skip-gui", action="store_true", help="skip prepare/plot/tick benchmarks")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    args = parser.parse_args(argv)
+
+    report: dict[str, object] = {
+        "version": RESULT_VERSION,
+        "meta": _metadata(),
+        "params": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "results": {},
+    }
+    results = report["results"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        csv_path = workdir / "experiment_records.csv"
+        started = time.perf_counter()
+        rows = write_synthetic_log(
+            csv_path, days=args.days, experiments=args.experiments, interval_s=args.interval
+        )
+        results["generate"] = {
+            "rows": rows,
+            "bytes": csv_path.stat().st_size,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        print(f"generated {rows:,} rows")
+
+        results["insert"] = bench_insert(workdir, args.records, min(args.sync_records, args.records))
+        print("insert done")
+
+        start = "2025-01-01"
+        end = (pd.Timestamp(start) + pd.Timedelta(days=max(0.0, args.days - 1))).strftime("%Y-%m-%d")
+        experiments = list(range(1, min(args.query_experiments, args.experiments) + 1))
+        results["get_data"], frame = bench_get_data(csv_path, start, end, experiments, args.repeat)
+        print("get_data done")
+
+        results["sample_log"] = bench_sample_log(workdir, frame, args.repeat)
+        print("sample_log done")
+
+        results["shm_ring"] = bench_shm_ring(args.records, args.repeat)
+        print("shm_ring done")
+
+        if not args.skip_gui:
+            app, dashboard, window = _window(workdir)
+            results["prepare"] = bench_prepare(dashboard, frame, args.repeat)
+            clean = dashboard.FullScreenWindow._prepare_dataframe_for_display(frame)
+            results["plot"] = bench_plot(app, window, clean, args.repeat)
+            results["tick"] = bench_tick(app, dashboard, window, workdir, args.interval, args.ticks)
+            window.close()
+            print("gui done")
+
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
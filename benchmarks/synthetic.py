@@ -0,0 +1,89 @@
+"""Synthetic experiment logs shaped like Logs/experiment_records.csv.
+
+Samples are spaced ``interval_s`` apart from midnight of ``start`` and the
+experiment label advances every ``experiment_span_s`` seconds, cycling
+through ``experiments`` labels, so every day holds several contiguous runs
+just like a rig that is started and stopped through the day.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from helper import schema  # noqa: E402
+
+_CHUNK_ROWS = 1_000_000
+
+
+def synthetic_rows(days: float, interval_s: float) -> int:
+    """Number of samples ``days`` of logging at ``interval_s`` produces."""
+    return int(days * 86_400 / interval_s)
+
+
+def write_synthetic_log(
+    path: Path | str,
+    *,
+    days: float = 1.0,
+    experiments: int = 20,
+    interval_s: float = 2.0,
+    rows: int | None = None,
+    experiment_span_s: int = 7200,
+    start: str = "2025-01-01",
+    seed: int = 0,
+) -> int:
+    """Write a log of ``days`` (or exactly ``rows``) samples; returns the row count."""
+    path = Path(path)
+    total = synthetic_rows(days, interval_s) if rows is None else int(rows)
+    rng = np.random.default_rng(seed)
+    clock = np.arange(86_400)
+    time_text = np.array(
+        [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in clock.tolist()]
+    )
+    exp_text = np.array([f"EXP_{n + 1}" for n in range(experiments)])
+    origin = pd.Timestamp(start)
+
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        handle.write(",".join(schema.COLUMNS) + "\n")
+        for offset in range(0, total, _CHUNK_ROWS):
+            sample = np.arange(offset, min(offset + _CHUNK_ROWS, total))
+            seconds = np.floor(sample * interval_s).astype(np.int64)
+            days_idx, second_of_day = np.divmod(seconds, 86_400)
+            unique_days, day_codes = np.unique(days_idx, return_inverse=True)
+            day_text = (origin + pd.to_timedelta(unique_days, unit="D")).strftime(schema.DATE_FORMAT)
+            frame = pd.DataFrame({
+                "date": np.asarray(day_text)[day_codes],
+                "time": time_text[second_of_day],
+                "experiment": exp_text[seconds // experiment_span_s % experiments],
+            })
+            for name in schema.NUMERIC_COLUMNS:
+                frame[name] = np.round(rng.uniform(10, 35, len(frame)), 4)
+            naive_ms = (origin.value // 1_000_000) + np.floor(sample * interval_s * 1000).astype(np.int64)
+            frame["ms"] = schema.local_to_epoch_ms(naive_ms)
+            frame.to_csv(handle, header=False, index=False)
+    return total
+
+
+def synthetic_records(count: int, experiment: str = "EXP_1", seed: int = 0) -> list[dict[str, object]]:
+    """Records shaped the way the dashboard hands them to data_insert (raw values)."""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(10, 35, (count, len(schema.NUMERIC_COLUMNS)))
+    midnight_ms = int(schema.local_to_epoch_ms(np.datetime64("2025-01-01", "ms").astype(np.int64)))
+    records = []
+    for i, row in enumerate(values.tolist()):
+        record = {
+            "date": "2025-01-01",
+            "time": f"{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+            "experiment": experiment,
+            "ms": midnight_ms + i % 86_400 * 1000,
+        }
+        record.update(zip(schema.NUMERIC_COLUMNS, row))
+        records.append(record)
+    return records
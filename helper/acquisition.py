@@ -0,0 +1,190 @@
+"""Sampling engine that runs independently of the GUI event loop.
+
+``AcquisitionEngine`` calls a ``read`` function from its own thread on a
+fixed schedule derived from ``time.monotonic()``: the n-th sample is due at
+``anchor + n * interval``, so a late wake-up or a slow read never pushes the
+following samples back (no cumulative drift). If a read overruns whole
+intervals, the missed slots are skipped and counted instead of being fired
+back to back.
+
+Each sample is stamped with the wall-clock and monotonic time at which the
+read was issued and published to every subscriber, in the engine thread.
+Subscribers must therefore be quick and thread-safe; the dashboard hands
+samples over to the Qt thread through a queued signal, the recorder pushes
+them onto the RecordWriter queue.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+Subscriber = Callable[["Sample"], None]
+
+# Seconds ``stop`` waits for the thread by default.
+_STOP_TIMEOUT_S = 5.0
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One reading of every channel."""
+
+    seq: int
+    ms: int  # wall-clock epoch milliseconds when the read was issued
+    monotonic: float  # time.monotonic() when the read was issued
+    values: Mapping[str, float]
+
+
+class AcquisitionEngine:
+    """Samples ``read()`` every ``interval_s`` seconds and publishes the results."""
+
+    def __init__(self, read: Callable[[], Mapping[str, float]], interval_s: float = 2.0):
+        if interval_s <= 0:
+            raise ValueError(f"interval_s must be positive, got {interval_s!r}")
+        self._read = read
+        self._interval_s = float(interval_s)
+        self._subscribers: list[Subscriber] = []
+        self._subscribers_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # Each run of the thread gets its own events, so a thread still
+        # finishing a read after ``stop`` never picks up a later run's.
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._seq = 0
+        self.started_at = 0.0  # monotonic time of the latest start()
+
+        self.samples = 0
+        self.missed = 0
+        self.read_errors = 0
+        self.subscriber_errors = 0
+        self.max_lateness_ms = 0.0
+        self._total_lateness_ms = 0.0
+
+    # ------------------------------------------------------------ subscribers
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Register ``callback``; returns a function that unregisters it."""
+        with self._subscribers_lock:
+            self._subscribers = [*self._subscribers, callback]
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def _publish(self, sample: Sample) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(sample)
+            except Exception as exc:
+                self.subscriber_errors += 1
+                print(f"[acquisition] Subscriber {callback!r} failed: {exc}")
+
+    # ---------------------------------------------------------------- control
+    @property
+    def interval_s(self) -> float:
+        return self._interval_s
+
+    def set_interval(self, interval_s: float) -> None:
+        """Change the sampling interval; the schedule restarts from the next read."""
+        if interval_s <= 0:
+            raise ValueError(f"interval_s must be positive, got {interval_s!r}")
+        self._interval_s = float(interval_s)
+        self._wake.set()
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and not self._stopping.is_set()
+        )
+
+    def start(self) -> "AcquisitionEngine":
+        if self.running:
+            return self
+        previous = self._thread
+        if previous is not None and previous is not threading.current_thread():
+            previous.join(_STOP_TIMEOUT_S)  # a read still in progress after stop(timeout=0)
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stopping, self._wake), name="Acquisition", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def is_current(self, sample: Sample) -> bool:
+        """True if ``sample`` was taken since the engine was last (re)started."""
+        return sample.monotonic >= self.started_at
+
+    def stop(self, timeout: float | None = _STOP_TIMEOUT_S) -> None:
+        """Stop sampling, waiting up to ``timeout`` seconds for the thread to end.
+
+        Once the thread has ended no subscriber is called. With ``timeout=0``
+        this returns at once: the thread is idle between reads and ends right
+        away, but a read already in progress may still publish its sample.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def read_now(self) -> Sample:
+        """Take one sample synchronously in the caller's thread without publishing it."""
+        mono = time.monotonic()
+        ms = time.time_ns() // 1_000_000
+        self._seq += 1
+        return Sample(self._seq, ms, mono, dict(self._read()))
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "samples": self.samples,
+            "missed": self.missed,
+            "read_errors": self.read_errors,
+            "subscriber_errors": self.subscriber_errors,
+            "interval_ms": round(self._interval_s * 1000, 3),
+            "max_lateness_ms": round(self.max_lateness_ms, 3),
+            "mean_lateness_ms": round(self._total_lateness_ms / self.samples, 3) if self.samples else 0.0,
+        }
+
+    # ----------------------------------------------------------------- thread
+    def _run(self, stopping: threading.Event, wake: threading.Event) -> None:
+        interval = self._interval_s
+        due = time.monotonic()
+        while not stopping.is_set():
+            delay = due - time.monotonic()
+            if delay > 0 and wake.wait(delay):
+                wake.clear()
+                if stopping.is_set():
+                    break
+                if self._interval_s != interval:
+                    interval = self._interval_s
+                    due = time.monotonic()
+                continue
+
+            try:
+                sample = self.read_now()
+            except Exception as exc:
+                self.read_errors += 1
+                print(f"[acquisition] Read failed: {exc}")
+            else:
+                lateness_ms = max(0.0, (sample.monotonic - due) * 1000)
+                self.samples += 1
+                self._total_lateness_ms += lateness_ms
+                self.max_lateness_ms = max(self.max_lateness_ms, lateness_ms)
+                if not stopping.is_set():
+                    self._publish(sample)
+
+            due += interval
+            behind = time.monotonic() - due
+            if behind >= interval:
+                # Whole slots already passed during the read: skip, keep the phase.
+                skipped = int(behind // interval)
+                self.missed += skipped
+                due += skipped * interval
@@ -0,0 +1,160 @@
+"""SQLite catalog of experiments (``Logs/experiments.sqlite3``).
+
+One row per experiment, written when it starts and completed when it stops::
+
+    id           unique across days (EXP_n numbers restart every day)
+    day, number  local start date and the EXP_n number shown in the GUI
+    rig, source  which rig ran it and its sensor source
+    interval_ms  sampling interval
+    started_ms   epoch milliseconds
+    stopped_ms   NULL while running, or if the program died before the stop
+    samples      records submitted to the record store
+    record_log   record store (CSV log) the samples went to
+    sample_log   per-experiment sample log exported at the stop
+
+``(day, number)`` is a unique index, so allocating the next number for a day
+and listing the experiments of a date range are index lookups rather than
+scans of ``Logs/``. The database runs in WAL mode so readers never block the
+dashboard's writes.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    day         TEXT    NOT NULL,
+    number      INTEGER NOT NULL,
+    rig         TEXT    NOT NULL,
+    source      TEXT,
+    interval_ms INTEGER NOT NULL,
+    started_ms  INTEGER NOT NULL,
+    stopped_ms  INTEGER,
+    samples     INTEGER NOT NULL DEFAULT 0,
+    record_log  TEXT,
+    sample_log  TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS experiments_day_number ON experiments (day, number);
+CREATE INDEX IF NOT EXISTS experiments_started ON experiments (started_ms);
+"""
+
+_COLUMNS = (
+    "id", "day", "number", "rig", "source", "interval_ms",
+    "started_ms", "stopped_ms", "samples", "record_log", "sample_log",
+)
+
+
+@dataclass(frozen=True)
+class Experiment:
+    id: int
+    day: str
+    number: int
+    rig: str
+    source: str | None
+    interval_ms: int
+    started_ms: int
+    stopped_ms: int | None
+    samples: int
+    record_log: str | None
+    sample_log: str | None
+
+    @property
+    def label(self) -> str:
+        return f"EXP_{self.number}"
+
+    @property
+    def running(self) -> bool:
+        return self.stopped_ms is None
+
+
+class ExperimentCatalog:
+    """Thread-safe access to the experiment catalog (one connection, one lock)."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------- numbering
+    def last_number(self, day: str) -> int:
+        """Highest EXP number used on ``day`` (0 when none)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(number) FROM experiments WHERE day = ?", (day,)
+            ).fetchone()
+        return row[0] or 0
+
+    def begin(
+        self,
+        day: str,
+        *,
+        rig: str,
+        interval_ms: int,
+        started_ms: int,
+        source: str | None = None,
+        record_log: str | None = None,
+        min_number: int = 0,
+    ) -> Experiment:
+        """Allocate the next EXP number for ``day`` and record the experiment start.
+
+        The number is above both every number already used that day and
+        ``min_number``; allocation and insert happen in one transaction.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (last,) = self._conn.execute(
+                    "SELECT MAX(number) FROM experiments WHERE day = ?", (day,)
+                ).fetchone()
+                number = max(last or 0, min_number) + 1
+                cursor = self._conn.execute(
+                    "INSERT INTO experiments (day, number, rig, source, interval_ms, started_ms, record_log)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (day, number, rig, source, int(interval_ms), int(started_ms), record_log),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(cursor.lastrowid)
+
+    def finish(
+        self, experiment_id: int, *, stopped_ms: int, samples: int, sample_log: str | None = None
+    ) -> None:
+        """Record the stop time, sample count and exported sample log."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE experiments SET stopped_ms = ?, samples = ?, sample_log = ? WHERE id = ?",
+                (int(stopped_ms), int(samples), sample_log, experiment_id),
+            )
+
+    # --------------------------------------------------------------- queries
+    def get(self, experiment_id: int) -> Experiment | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM experiments WHERE id = ?", (experiment_id,)
+            ).fetchone()
+        return Experiment(*row) if row else None
+
+    def between(self, start_day: str, end_day: str) -> list[Experiment]:
+        """Experiments started on ``start_day`` .. ``end_day`` (inclusive), in start order."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM experiments"
+                " WHERE day BETWEEN ? AND ? ORDER BY day, number",
+                (start_day, end_day),
+            ).fetchall()
+        return [Experiment(*row) for row in rows]
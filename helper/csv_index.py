@@ -0,0 +1,235 @@
+"""Sidecar byte-offset index over the append-only CSV log.
+
+For every ``(date, experiment)`` pair the index records the byte ranges its
+rows occupy in the CSV. A pair's next row extends its last range when only
+rows of other experiments of the same day, at most ``MERGE_GAP_BYTES`` of
+them, lie in between, so rigs logging side by side (whose rows interleave)
+still get a few long ranges instead of one per row. A range may therefore
+hold other experiments' rows of its day, and readers filter what they
+parse by experiment. The index is extended by data_insert as batches are
+appended and saved from time to time (see ``save``); it can always be
+brought up to date from the CSV itself:
+
+* missing or unreadable index -> full rebuild
+* CSV shorter than the indexed size, or the bytes just before the indexed end
+  no longer match the stored signature -> full rebuild
+* CSV longer than the indexed size -> only the new tail is scanned
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+INDEX_VERSION = 2
+_SIGNATURE_BYTES = 64
+# Largest stretch of other experiments' rows a range may span to stay merged.
+MERGE_GAP_BYTES = 64 * 1024
+_EXP_RE = re.compile(r"\d+")
+
+
+def index_path_for(csv_path: Path | str) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".idx")
+
+
+def _split_key(line: bytes) -> tuple[str, str] | None:
+    """Return the ``(date, experiment)`` fields of one CSV data line."""
+    text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+    if '"' in text:
+        fields = next(csv.reader([text]), [])
+    else:
+        fields = text.split(",", 3)
+    if len(fields) < 3:
+        return None
+    return fields[0].strip(), fields[2].strip()
+
+
+def _merge(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sorted, non-overlapping union of ``spans`` (ranges of different pairs may overlap)."""
+    spans.sort()
+    merged: list[tuple[int, int]] = []
+    for s, e in spans:
+        if merged and merged[-1][1] >= s:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+class CsvIndex:
+    """``{date: {experiment: [[start, end], ...]}}`` plus the CSV coverage."""
+
+    def __init__(self, csv_path: Path | str):
+        self.csv_path = Path(csv_path)
+        self.path = index_path_for(self.csv_path)
+        self.header_end = 0
+        self.size = 0
+        self.signature = ""
+        self.ranges: dict[str, dict[str, list[list[int]]]] = {}
+        self.rebuilds = 0
+        self.dirty = False
+        # Day of the latest row added, and where its unbroken run of rows began.
+        self._run_day: str | None = None
+        self._run_start = 0
+        self._run_end = 0
+
+    # --------------------------------------------------------------- building
+    def add(self, day: str, experiment: str, start: int, end: int) -> None:
+        if day != self._run_day or start != self._run_end:
+            self._run_day, self._run_start = day, start
+        self._run_end = end
+        spans = self.ranges.setdefault(day, {}).setdefault(experiment, [])
+        last = spans[-1] if spans else None
+        if last is not None and last[1] >= self._run_start and start - last[1] <= MERGE_GAP_BYTES:
+            last[1] = end
+        else:
+            spans.append([start, end])
+        self.dirty = True
+
+    def extend(self, keys: Iterable[tuple[str, str]], lengths: Iterable[int], start: int) -> None:
+        """Record rows written contiguously from byte ``start``."""
+        offset = start
+        for (day, experiment), length in zip(keys, lengths):
+            self.add(day, experiment, offset, offset + length)
+            offset += length
+        self.size = offset
+        self.signature = self._read_signature()
+
+    def _scan(self, handle, start: int) -> None:
+        handle.seek(start)
+        offset = start
+        if offset == 0:
+            header = handle.readline()
+            offset = self.header_end = len(header)
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break  # partially written row; picked up on the next refresh
+            key = _split_key(line)
+            if key is not None:
+                self.add(key[0], key[1], offset, offset + len(line))
+            offset += len(line)
+        self.size = offset
+
+    def rebuild(self) -> "CsvIndex":
+        self.rebuilds += 1
+        self.ranges = {}
+        self.header_end = self.size = 0
+        self._run_day = None
+        self.dirty = True
+        if self.csv_path.exists():
+            with self.csv_path.open("rb") as handle:
+                self._scan(handle, 0)
+        self.signature = self._read_signature()
+        return self
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the CSV. Returns True if it changed."""
+        if not self.csv_path.exists():
+            changed = bool(self.ranges)
+            self.ranges, self.size, self.header_end, self.signature = {}, 0, 0, ""
+            self._run_day = None
+            self.dirty = self.dirty or changed
+            return changed
+        current = self.csv_path.stat().st_size
+        if current < self.size or self._read_signature() != self.signature:
+            self.rebuild()
+            return True
+        if current == self.size:
+            return False
+        with self.csv_path.open("rb") as handle:
+            self._scan(handle, self.size)
+        self.signature = self._read_signature()
+        return True
+
+    def _read_signature(self) -> str:
+        if self.size == 0 or not self.csv_path.exists():
+            return ""
+        with self.csv_path.open("rb") as handle:
+            handle.seek(max(0, self.size - _SIGNATURE_BYTES))
+            return handle.read(min(self.size, _SIGNATURE_BYTES)).hex()
+
+    # ------------------------------------------------------------ persistence
+    def save(self) -> None:
+        """Rewrite the sidecar (the whole index, so callers batch this).
+
+        A sidecar that lags the CSV is still valid: ``load`` scans only the
+        rows appended since it was saved, continuing the run of rows the
+        latest one belongs to so ranges merge as they would have in memory.
+        """
+        payload = {
+            "version": INDEX_VERSION,
+            "header_end": self.header_end,
+            "size": self.size,
+            "signature": self.signature,
+            "ranges": self.ranges,
+            "run": [self._run_day, self._run_start, self._run_end],
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, csv_path: Path | str) -> "CsvIndex":
+        """Load the sidecar, rebuilding it from the CSV if missing or stale."""
+        index = cls(csv_path)
+        try:
+            payload = json.loads(index.path.read_text(encoding="utf-8"))
+            if payload.get("version") != INDEX_VERSION:
+                raise ValueError("index version mismatch")
+            index.header_end = int(payload["header_end"])
+            index.size = int(payload["size"])
+            index.signature = str(payload["signature"])
+            index.ranges = payload["ranges"]
+            run_day, run_start, run_end = payload.get("run") or (None, 0, 0)
+            index._run_day, index._run_start, index._run_end = run_day, int(run_start), int(run_end)
+        except (OSError, ValueError, KeyError, TypeError):
+            return index.rebuild()
+        index.refresh()
+        return index
+
+    # ---------------------------------------------------------------- queries
+    def select(
+        self, start: date, end: date, experiment_numbers: Iterable[int]
+    ) -> list[tuple[int, int]]:
+        """Byte ranges holding rows for the given dates and experiment numbers."""
+        wanted = {int(num) for num in experiment_numbers}
+        spans: list[tuple[int, int]] = []
+        for day, experiments in self.ranges.items():
+            try:
+                day_value = date.fromisoformat(day)
+            except ValueError:
+                continue
+            if not (start <= day_value <= end):
+                continue
+            for experiment, ranges in experiments.items():
+                match = _EXP_RE.search(experiment)
+                if match and int(match.group()) in wanted:
+                    spans.extend((s, e) for s, e in ranges)
+        return _merge(spans)
+
+    def iter_bytes(
+        self, spans: Iterable[tuple[int, int]], block_size: int | None = None
+    ) -> Iterator[bytes]:
+        """Yield the header line followed by the raw bytes of each span.
+
+        With ``block_size`` set, spans are yielded in pieces of at most that
+        many bytes, so a large selection can be streamed.
+        """
+        with self.csv_path.open("rb") as handle:
+            yield handle.read(self.header_end)
+            for s, e in spans:
+                handle.seek(s)
+                step = (e - s) if not block_size else int(block_size)
+                while s < e:
+                    piece = handle.read(min(step, e - s))
+                    if not piece:
+                        break
+                    s += len(piece)
+                    yield piece
@@ -1,38 +1,172 @@
 """Data retrieval helpers for the PyQt dashboard.
 
-Reads logged experiment records from the CSV written by data_insert.py and
-filters them by date range and experiment number.
+Reads logged experiment records written by data_insert.py and filters them by
+date range and experiment number. With the SQLite storage backend the query is
+an indexed range query against the database paired with the CSV. When the
+partitioned column store paired with the CSV has been built, only the
+matching (date, experiment) partitions are read. Long ranges can be served
+from the per-minute/per-hour rollups instead of raw rows (``resolution``).
+Until the store is built, the CSV's byte-offset index is used to seek to
+and parse just the requested pairs. The last resort is a streaming scan
+that filters the CSV chunk by chunk under a hard memory ceiling. Raw rows
+read by any of these are kept per day in an in-process cache
+(helper.record_cache) that the record writer invalidates as it commits, so
+repeated retrievals only read days and experiments not seen before.
+``stream_data_by_date_and_experiment`` yields a query's rows chunk by chunk
+instead of assembling them (see helper.export).
 """
 
 from __future__ import annotations
 
-import re
+import io
+import threading
+import time
 from pathlib import Path
-from typing import Sequence
+from typing import Callable, Iterator, Sequence
 
 import pandas as pd
 
+from helper import partitions, record_cache, rollups, schema, sqlite_store
+from helper.data_insert import storage_backend
+from helper.csv_index import CsvIndex
 from helper.paths import get_project_root
 
 PROJECT_ROOT = get_project_root()
 _LOG_PATH = PROJECT_ROOT / "Logs" / "experiment_records.csv"
 
-_COLUMNS = [
-    "date",
-    "time",
-    "experiment",
-    "temp_1",
-    "temp_2",
-    "weight_1",
-    "weight_2",
-    "difference",
-    "room_temp",
-]
+_COLUMNS = list(schema.COLUMNS)
 
 
-def _extract_experiment_number(value: str) -> int | None:
-    match = re.search(r"\d+", str(value))
-    return int(match.group()) if match else None
+# Upper bound on the rows a streaming scan keeps, and on each chunk it parses.
+DEFAULT_MAX_RESULT_BYTES = 256 * 1024 * 1024
+DEFAULT_CHUNK_ROWS = 100_000
+
+RESOLUTIONS = ("raw", *rollups.RESOLUTIONS, "auto")
+
+
+class QueryMemoryLimitExceeded(MemoryError):
+    """Raised when a streaming query's matching rows exceed the memory ceiling."""
+
+
+class QueryCancelled(Exception):
+    """Raised from inside a query once its cancel event has been set."""
+
+
+ProgressCallback = Callable[[float], None]
+
+
+def configure_cache(max_bytes: int) -> None:
+    """Set the memory cap (in bytes) of the query cache, evicting as needed."""
+    record_cache.shared_cache().configure(max_bytes)
+
+
+def clear_cache() -> None:
+    record_cache.shared_cache().clear()
+
+
+def cache_stats() -> dict[str, float]:
+    """Hit/miss, eviction, invalidation, memory and refresh timing counters of the query cache."""
+    return record_cache.shared_cache().stats()
+
+
+def _make_step(
+    progress: ProgressCallback | None, cancel_event: threading.Event | None
+) -> Callable[[int, int], None]:
+    """Build the ``step(done, total)`` hook the storage readers call per unit of work."""
+
+    def step(done: int, total: int) -> None:
+        if cancel_event is not None and cancel_event.is_set():
+            raise QueryCancelled()
+        if progress is not None and total:
+            progress(min(1.0, done / total))
+
+    return step
+
+
+def _query_mask(df: pd.DataFrame, start, end, experiments_set: set[int]) -> pd.Series:
+    """Vectorized date-range and experiment-number predicate over raw rows."""
+    days = schema.parse_dates(df["date"])
+    in_range = days.between(pd.Timestamp(start), pd.Timestamp(end), inclusive="both")
+    return in_range & schema.experiment_numbers(df["experiment"]).isin(experiments_set)
+
+
+def _read_indexed(path: Path, start, end, experiment_numbers: Sequence[int]) -> pd.DataFrame:
+    """Parse only the byte ranges the offset index lists for the query."""
+    index = CsvIndex.load(path)
+    spans = index.select(start, end, experiment_numbers)
+    if not spans:
+        return pd.DataFrame(columns=_COLUMNS)
+    return schema.read_csv_typed(io.BytesIO(b"".join(index.iter_bytes(spans))))
+
+
+def iter_data_by_date_and_experiment(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    csv_path: Path | str = _LOG_PATH,
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress: ProgressCallback | None = None,
+    cancel_event: threading.Event | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Scan the CSV in chunks, yielding only the rows matching the query.
+
+    At most one raw chunk of ``chunk_rows`` rows is held at a time; no helper
+    columns are added to it, the predicates are evaluated as masks. Progress
+    is reported as the fraction of the file consumed.
+    """
+    path = Path(csv_path)
+    start = pd.to_datetime(start_date, errors="coerce")
+    end = pd.to_datetime(end_date, errors="coerce")
+    if pd.isna(start) or pd.isna(end) or not path.exists():
+        return
+    start, end = start.date(), end.date()
+    experiments_set = {int(num) for num in experiment_numbers}
+    step = _make_step(progress, cancel_event)
+    total = path.stat().st_size
+
+    with path.open("rb") as handle:
+        reader = schema.read_csv_typed(handle, chunksize=max(1, int(chunk_rows)))
+        with reader:
+            for chunk in reader:
+                step(handle.tell(), total)
+                mask = _query_mask(chunk, start, end, experiments_set)
+                if mask.any():
+                    yield chunk.loc[mask, _COLUMNS]
+    step(total, total)
+
+
+def _read_streaming(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    path: Path,
+    max_result_bytes: int,
+    chunk_rows: int,
+    progress: ProgressCallback | None,
+    cancel_event: threading.Event | None,
+) -> pd.DataFrame:
+    kept = []
+    kept_bytes = 0
+    for rows in iter_data_by_date_and_experiment(
+        start_date,
+        end_date,
+        experiment_numbers,
+        path,
+        chunk_rows=chunk_rows,
+        progress=progress,
+        cancel_event=cancel_event,
+    ):
+        kept_bytes += int(rows.memory_usage(deep=True).sum())
+        if kept_bytes > max_result_bytes:
+            raise QueryMemoryLimitExceeded(
+                f"Query result exceeds {max_result_bytes / (1024 * 1024):.1f} MB; "
+                "narrow the date range or experiment list."
+            )
+        kept.append(rows)
+    if not kept:
+        return pd.DataFrame(columns=_COLUMNS)
+    return pd.concat(kept, ignore_index=True)
 
 
 def get_data_by_date_and_experiment(
@@ -40,32 +174,332 @@ def get_data_by_date_and_experiment(
     end_date: str,
     experiment_numbers: Sequence[int],
     csv_path: Path | str = _LOG_PATH,
+    *,
+    backend: str | None = None,
+    resolution: str = "raw",
+    max_points: int = 2000,
+    span_s: float | None = None,
+    use_partitions: bool = True,
+    use_index: bool = True,
+    use_cache: bool = True,
+    streaming: bool = False,
+    max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress: ProgressCallback | None = None,
+    cancel_event: threading.Event | None = None,
 ) -> pd.DataFrame:
-    """Return experiment rows within the requested date bounds and experiment ids."""
+    """Return experiment rows within the requested date bounds and experiment ids.
+
+    ``backend`` names the store to query (default: the configured
+    ``data_insert.storage_backend()``); the CSV paths below are the fallback
+    while that store has not been built.
+
+    ``resolution`` is ``"raw"``, ``"minute"``, ``"hour"`` or ``"auto"``. The
+    rollup resolutions return one row per bucket holding the bucket means
+    plus ``count`` and ``<column>_min/_max/_first/_last``. ``"auto"`` picks
+    the coarsest one that still gives ``max_points`` buckets across
+    ``span_s`` seconds (default: the whole date range). Raw rows are
+    returned when the rollups are not built. The resolution used is in
+    ``result.attrs["resolution"]``.
+
+    ``progress`` receives a 0..1 fraction as partitions, days or chunks are
+    read; setting ``cancel_event`` aborts the query with ``QueryCancelled``.
+
+    Raw rows come from the query cache where it holds them (see
+    helper.record_cache); ``use_cache=False`` reads everything from the
+    store.
+
+    ``streaming=True`` (or ``use_index=False``) scans the CSV chunk by chunk
+    and raises ``QueryMemoryLimitExceeded`` once the matching rows would
+    exceed ``max_result_bytes``. Whatever the source, the result follows
+    ``helper.schema``: categorical date/experiment, text time and float64
+    measurements.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of {RESOLUTIONS}, got {resolution!r}")
     path = Path(csv_path)
-    if not path.exists():
+    if resolution == "auto":
+        resolution = _auto_resolution(start_date, end_date, max_points, span_s)
+    if resolution != "raw" and not streaming and rollups.is_ready(rollups.rollup_root_for(path)):
+        result = _run_rollup_query(
+            start_date, end_date, experiment_numbers, path, resolution, progress, cancel_event
+        )
+    else:
+        resolution = "raw"
+        query = _cached_query if use_cache and use_index and not streaming else _run_query
+        result = query(
+            start_date,
+            end_date,
+            experiment_numbers,
+            path,
+            backend=backend or storage_backend(),
+            use_partitions=use_partitions,
+            use_index=use_index,
+            streaming=streaming,
+            max_result_bytes=max_result_bytes,
+            chunk_rows=chunk_rows,
+            progress=progress,
+            cancel_event=cancel_event,
+        )
+    result = schema.conform(result.reset_index(drop=True))
+    for col in ("date", "experiment"):
+        result[col] = result[col].cat.remove_unused_categories()
+    result.attrs["resolution"] = resolution
+    return result
+
+
+class _ByteStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte pieces."""
+
+    def __init__(self, pieces: Iterator[bytes]):
+        self._pieces = pieces
+        self._pending = b""
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            piece = next(self._pieces, None)
+            if piece is None:
+                return 0
+            self._pending = piece
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self.consumed += size
+        return size
+
+
+def _iter_spans(
+    index: CsvIndex, spans: list[tuple[int, int]], chunk_rows: int, step: Callable[[int, int], None]
+) -> Iterator[pd.DataFrame]:
+    """Parse the index's byte ranges ``chunk_rows`` rows at a time."""
+    total = sum(e - s for s, e in spans) + index.header_end
+    raw = _ByteStream(index.iter_bytes(spans, block_size=1 << 20))
+    step(0, total)
+    with schema.read_csv_typed(io.BufferedReader(raw), chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            step(raw.consumed, total)
+            yield chunk
+    step(total, total)
+
+
+def stream_data_by_date_and_experiment(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    csv_path: Path | str = _LOG_PATH,
+    *,
+    backend: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress: ProgressCallback | None = None,
+    cancel_event: threading.Event | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the raw rows of a query as a sequence of DataFrames.
+
+    The same stores as ``get_data_by_date_and_experiment`` are used (SQLite
+    blocks, one partition at a time, or the CSV through its offset index,
+    falling back to the chunked scan), but the result is never assembled:
+    each chunk is conformed to ``helper.schema`` and handed out on its own,
+    so memory stays bounded by about one chunk whatever the range.
+    ``progress`` and ``cancel_event`` behave as in
+    ``get_data_by_date_and_experiment``.
+    """
+    path = Path(csv_path)
+    start = pd.to_datetime(start_date, errors="coerce")
+    end = pd.to_datetime(end_date, errors="coerce")
+    if pd.isna(start) or pd.isna(end):
+        return
+    start, end = start.date(), end.date()
+    chunk_rows = max(1, int(chunk_rows))
+    step = _make_step(progress, cancel_event)
+    backend = backend or storage_backend()
+
+    db_path = sqlite_store.db_path_for(path)
+    partition_root = partitions.partition_root_for(path)
+    if backend == "sqlite" and sqlite_store.is_ready(db_path):
+        chunks = sqlite_store.iter_query(
+            db_path, start, end, experiment_numbers, _COLUMNS, on_step=step, chunk_rows=chunk_rows
+        )
+    elif backend == "partitions" and partitions.is_ready(partition_root):
+        chunks = partitions.iter_query(
+            partition_root, start, end, experiment_numbers, _COLUMNS, on_step=step
+        )
+    elif not path.exists():
+        return
+    else:
+        experiments_set = {int(num) for num in experiment_numbers}
+        try:
+            index = CsvIndex.load(path)
+            spans = index.select(start, end, experiment_numbers)
+            chunks = (
+                rows.loc[_query_mask(rows, start, end, experiments_set), _COLUMNS]
+                for rows in _iter_spans(index, spans, chunk_rows, step)
+            )
+        except Exception as exc:
+            print(f"[data_get] Offset index unavailable ({exc}); scanning the CSV.")
+            chunks = iter_data_by_date_and_experiment(
+                start_date,
+                end_date,
+                experiment_numbers,
+                path,
+                chunk_rows=chunk_rows,
+                progress=progress,
+                cancel_event=cancel_event,
+            )
+
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        yield schema.conform(chunk.reset_index(drop=True))
+
+
+def _auto_resolution(start_date: str, end_date: str, max_points: int, span_s: float | None) -> str:
+    if span_s is None:
+        start = pd.to_datetime(start_date, errors="coerce")
+        end = pd.to_datetime(end_date, errors="coerce")
+        if pd.isna(start) or pd.isna(end):
+            return "raw"
+        span_s = ((end - start).days + 1) * 86400
+    return rollups.choose_resolution(span_s, max(1, int(max_points)))
+
+
+def _run_rollup_query(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    path: Path,
+    resolution: str,
+    progress: ProgressCallback | None,
+    cancel_event: threading.Event | None,
+) -> pd.DataFrame:
+    start = pd.to_datetime(start_date, errors="coerce")
+    end = pd.to_datetime(end_date, errors="coerce")
+    if pd.isna(start) or pd.isna(end):
         return pd.DataFrame(columns=_COLUMNS)
+    return rollups.query(
+        rollups.rollup_root_for(path),
+        start.date(),
+        end.date(),
+        experiment_numbers,
+        resolution,
+        _COLUMNS,
+        on_step=_make_step(progress, cancel_event),
+    )
 
-    try:
-        df = pd.read_csv(path)
-    except Exception:
+
+def _cached_query(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    path: Path,
+    *,
+    progress: ProgressCallback | None,
+    cancel_event: threading.Event | None,
+    **options,
+) -> pd.DataFrame:
+    """``_run_query`` through the query cache: only the missing (day, experiment) pairs are read.
+
+    Rows come back by day, then experiment, each experiment's in log order.
+    """
+    cache = record_cache.shared_cache()
+    start = pd.to_datetime(start_date, errors="coerce")
+    end = pd.to_datetime(end_date, errors="coerce")
+    generation = cache.begin(path)
+    if pd.isna(start) or pd.isna(end) or generation is None:
+        return _run_query(
+            start_date, end_date, experiment_numbers, path, progress=progress, cancel_event=cancel_event, **options
+        )
+    days = [day.isoformat() for day in pd.date_range(start.date(), end.date()).date]
+    numbers = sorted({int(num) for num in experiment_numbers})
+    pieces, missing = cache.lookup(path, days, numbers)
+    if missing:
+        started = time.perf_counter()
+        frame = _run_query(
+            min(day for day, _ in missing),
+            max(day for day, _ in missing),
+            sorted({number for _, number in missing}),
+            path,
+            progress=progress,
+            cancel_event=cancel_event,
+            **options,
+        )
+        frame = schema.conform(frame.reset_index(drop=True))
+        pieces.update(cache.store(path, generation, missing, frame, time.perf_counter() - started))
+    else:
+        _make_step(progress, cancel_event)(1, 1)
+
+    frames = [pieces[(day, number)] for day in days for number in numbers]
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
         return pd.DataFrame(columns=_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
 
-    for col in _COLUMNS:
-        if col not in df.columns:
-            df[col] = ""
 
-    experiments_set = {int(num) for num in experiment_numbers}
-    df["date_dt"] = pd.to_datetime(df["date"], errors="coerce").dt.date
-    df["exp_num"] = df["experiment"].apply(_extract_experiment_number)
+def _run_query(
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    path: Path,
+    *,
+    backend: str,
+    use_partitions: bool,
+    use_index: bool,
+    streaming: bool,
+    max_result_bytes: int,
+    chunk_rows: int,
+    progress: ProgressCallback | None,
+    cancel_event: threading.Event | None,
+) -> pd.DataFrame:
+    step = _make_step(progress, cancel_event)
+    start = pd.to_datetime(start_date, errors="coerce")
+    end = pd.to_datetime(end_date, errors="coerce")
+    if pd.isna(start) or pd.isna(end):
+        return pd.DataFrame(columns=_COLUMNS)
+    start, end = start.date(), end.date()
 
-    start = pd.to_datetime(start_date, errors="coerce").date()
-    end = pd.to_datetime(end_date, errors="coerce").date()
+    db_path = sqlite_store.db_path_for(path)
+    if backend == "sqlite" and not streaming and sqlite_store.is_ready(db_path):
+        return sqlite_store.query(db_path, start, end, experiment_numbers, _COLUMNS, on_step=step)
 
-    mask = (
-        df["date_dt"].between(start, end, inclusive="both")
-        & df["exp_num"].isin(experiments_set)
-    )
+    partition_root = partitions.partition_root_for(path)
+    if backend == "partitions" and use_partitions and not streaming and partitions.is_ready(partition_root):
+        return partitions.query(
+            partition_root, start, end, experiment_numbers, _COLUMNS, on_step=step
+        )
 
-    filtered = df.loc[mask, _COLUMNS].reset_index(drop=True)
-    return filtered
+    if not path.exists():
+        return pd.DataFrame(columns=_COLUMNS)
+
+    if use_index and not streaming:
+        try:
+            step(0, 1)
+            df = _read_indexed(path, start, end, experiment_numbers)
+            step(1, 1)
+        except QueryCancelled:
+            raise
+        except Exception as exc:
+            print(f"[data_get] Offset index unavailable ({exc}); scanning the CSV.")
+        else:
+            experiments_set = {int(num) for num in experiment_numbers}
+            mask = _query_mask(df, start, end, experiments_set)
+            return df.loc[mask, _COLUMNS].reset_index(drop=True)
+
+    try:
+        return _read_streaming(
+            start_date,
+            end_date,
+            experiment_numbers,
+            path,
+            max_result_bytes,
+            chunk_rows,
+            progress,
+            cancel_event,
+        )
+    except (QueryMemoryLimitExceeded, QueryCancelled):
+        raise
+    except Exception as exc:
+        print(f"[data_get] Could not read {path}: {exc}")
+        return pd.DataFrame(columns=_COLUMNS)
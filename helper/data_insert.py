@@ -1,56 +1,769 @@
 """Utility helpers for persisting experiment records produced by the GUI.
 
-The GUI writes each record from a background thread, so this module keeps the
-file operations lightweight and thread-safe. Data is appended to
-Logs/experiment_records.csv for easy auditing/debugging.
+Records are handed to a single long-lived ``RecordWriter`` thread that keeps
+the CSV open and appends them in batches (group commit), so the GUI never
+spawns a thread or reopens the file per sample. ``insert_experiment_record``
+remains available for synchronous one-off writes. Data is appended to
+Logs/experiment_records.csv for easy auditing/debugging, and mirrored into the
+store data_get queries: the date/experiment partitioned column store (see
+helper.partitions) or, with ``BPCL_STORAGE_BACKEND=sqlite``, an SQLite
+database in WAL mode (see helper.sqlite_store) that the writer fills one
+transaction per batch. Whatever the backend, every batch is also folded
+into the per-minute and per-hour rollups (see helper.rollups), and every
+append extends the CSV's byte-offset sidecar index (see helper.csv_index).
+Once a batch is in every store, the query cache drops what it holds of the
+batch's days and experiments (see helper.record_cache).
+
+Records carry raw values (floats and the epoch-ms ``ms`` timestamp of
+schema version 2, see helper.schema): the stores receive them as they are,
+and the only text formatting is the CSV row itself, written at full
+precision. An existing version 1 log is upgraded before the first append
+(see ``upgrade_log``): its header gains ``ms`` and every row the timestamp
+readers already derive for it, so new rows keep their sub-second ``ms``.
+
+Importing this module has no side effects: directories are created by the
+first write, and the column store (and pandas with it) is loaded by the
+writer thread rather than at import.
 """
 
 from __future__ import annotations
 
+import atexit
 import csv
+import io
+import os
+import queue
 import threading
+import time
 from pathlib import Path
-from typing import Mapping
+from typing import Iterable, Mapping
 
+from helper import record_cache, schema
+from helper.csv_index import CsvIndex, index_path_for
 from helper.paths import get_project_root
 
 PROJECT_ROOT = get_project_root()
 _LOG_DIR = PROJECT_ROOT / "Logs"
-_LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 _CSV_PATH = _LOG_DIR / "experiment_records.csv"
 
-_HEADERS = (
-    "date",
-    "time",
-    "experiment",
-    "temp_1",
-    "temp_2",
-    "weight_1",
-    "weight_2",
-    "difference",
-    "room_temp",
-)
+_HEADERS = schema.COLUMNS
 
 # This is a lock to ensure that only one thread writes to the experiment_records.csv file at a time, making file operations thread-safe.
 _FILE_LOCK = threading.Lock()
 
+FSYNC_POLICIES = ("never", "batch", "interval")
+STORAGE_BACKENDS = ("partitions", "sqlite")
+
+# Queue marker asking the writer to commit whatever it has buffered right away.
+_FLUSH = object()
+
+# Seconds ``flush`` waits for the writer before giving up.
+DEFAULT_FLUSH_TIMEOUT_S = 30.0
+
+# Offset indexes kept in memory between appends, keyed by CSV path.
+_INDEXES: dict[Path, CsvIndex] = {}
+# Seconds between saves of an index's sidecar; a lagging sidecar only costs
+# the next loader a scan of the rows appended since.
+INDEX_SAVE_INTERVAL_S = 30.0
+_INDEX_SAVED: dict[Path, float] = {}
+# Column count of each log's header, keyed by CSV path, with the file's inode.
+_HEADER_WIDTHS: dict[Path, tuple[int, int]] = {}
+# Inode of each log whose upgrade failed, so it is not retried every batch.
+_UPGRADE_FAILED: dict[Path, int] = {}
+# Bytes of rows rewritten at a time when upgrading a version 1 log.
+_UPGRADE_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def _to_row(record: Mapping[str, object]) -> list[object]:
+    return [record.get(field, "") for field in _HEADERS]
+
+
+class _FlushRequest:
+    """Queue marker like ``_FLUSH``, set once everything queued before it is committed."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+def storage_backend() -> str:
+    """Store mirroring the CSV, from ``BPCL_STORAGE_BACKEND`` (default ``partitions``)."""
+    backend = (os.environ.get("BPCL_STORAGE_BACKEND") or "partitions").strip().lower()
+    if backend not in STORAGE_BACKENDS:
+        print(f"[data_insert] Unknown storage backend {backend!r}; using partitions")
+        return "partitions"
+    return backend
+
 
 def insert_experiment_record(
-    record: Mapping[str, str], *, csv_path: Path | str = _CSV_PATH
+    record: Mapping[str, object], *, csv_path: Path | str = _CSV_PATH, backend: str | None = None
 ) -> None:
     """Append a single experiment record to the CSV log."""
+    insert_experiment_records((record,), csv_path=csv_path, backend=backend)
+
+
+def insert_experiment_records(
+    records: Iterable[Mapping[str, object]],
+    *,
+    csv_path: Path | str = _CSV_PATH,
+    backend: str | None = None,
+) -> None:
+    """Append several experiment records to the CSV log in one open/write."""
     path = Path(csv_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    row = {field: str(record.get(field, "")) for field in _HEADERS}
+    rows = [_to_row(record) for record in records]
+    if not rows:
+        return
 
     try:
         with _FILE_LOCK:
-            file_exists = path.exists()
-            with path.open("a", newline="", encoding="utf-8") as csv_file:
-                writer = csv.DictWriter(csv_file, fieldnames=_HEADERS)
-                if not file_exists or path.stat().st_size == 0:
-                    writer.writeheader()
-                writer.writerow(row)
+            if needs_upgrade(path):
+                upgrade_log(path)
+            with path.open("ab") as csv_file:
+                span = _write_rows(csv_file, path, rows)
+            _append_store(path, rows, backend or storage_backend())
+            _append_rollups(path, rows)
+            record_cache.note_commit(path, rows, span)
     except Exception as exc:
         print(f"[data_insert] Failed to persist experiment record: {exc}")
+
+
+def _append_store(csv_path: Path, rows: list[list[object]], backend: str, db=None) -> bool:
+    """Mirror rows into the ``backend`` store paired with ``csv_path``; False if that failed.
+
+    ``db`` is an open SQLite connection to reuse (sqlite backend only); it
+    is closed when the insert fails. Must be called with ``_FILE_LOCK``
+    held. Failures are reported but never prevent the CSV write, which
+    stays the source the store is rebuilt from: a store that missed rows,
+    partitioned or SQLite, is discarded, so the next ``ensure_store``
+    rebuilds it (until then queries read the CSV).
+    """
+    try:
+        if backend == "sqlite":
+            from helper import sqlite_store
+
+            conn = db or sqlite_store.connect(sqlite_store.db_path_for(csv_path))
+            try:
+                sqlite_store.append_rows(conn, _HEADERS, rows)
+            finally:
+                if db is None:
+                    conn.close()
+        else:
+            from helper import partitions
+
+            partitions.append_rows(partitions.partition_root_for(csv_path), _HEADERS, rows)
+    except Exception as exc:
+        print(f"[data_insert] Failed to update {backend} store: {exc}")
+        if db is not None:
+            db.close()  # the database is discarded; the caller reconnects
+        _discard_store(csv_path, backend)
+        return False
+    return True
+
+
+def _append_rollups(csv_path: Path, rows: list[list[object]]) -> None:
+    """Fold rows into the rollups paired with ``csv_path`` (``_FILE_LOCK`` held).
+
+    Rollups that missed rows are marked as not built, like the partitioned store.
+    """
+    try:
+        from helper import rollups
+
+        rollups.append_rows(rollups.rollup_root_for(csv_path), _HEADERS, rows)
+    except Exception as exc:
+        print(f"[data_insert] Failed to update rollups: {exc}")
+        _discard_rollups(csv_path)
+
+
+def _backend_marker(csv_path: Path) -> Path:
+    return csv_path.with_name(f"{csv_path.stem}.backend")
+
+
+def ensure_store(csv_path: Path | str = _CSV_PATH, backend: str | None = None) -> None:
+    """Make sure the ``backend`` store mirrors the CSV log, building it if needed.
+
+    A store that was not the active backend for a while has missed rows, so
+    switching backends rebuilds the newly selected store from the CSV.
+    """
+    path = Path(csv_path)
+    backend = backend or storage_backend()
+    marker = _backend_marker(path)
+    try:
+        previous = marker.read_text(encoding="utf-8").strip()
+    except OSError:
+        previous = "partitions"
+    if previous != backend:
+        _discard_store(path, backend)
+    if backend == "sqlite":
+        ensure_sqlite_store(path)
+    else:
+        ensure_partition_store(path)
+    ensure_rollups(path)
+    if previous != backend:
+        try:
+            marker.write_text(backend, encoding="utf-8")
+        except OSError as exc:
+            print(f"[data_insert] Failed to record storage backend: {exc}")
+
+
+def _discard_store(csv_path: Path, backend: str) -> None:
+    """Mark a possibly stale store as not built, so it is rebuilt from the CSV."""
+    try:
+        if backend == "sqlite":
+            from helper import sqlite_store
+
+            db_path = sqlite_store.db_path_for(csv_path)
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        else:
+            from helper import partitions
+
+            root = partitions.partition_root_for(csv_path)
+            (root / partitions.MANIFEST_NAME).unlink(missing_ok=True)
+    except OSError as exc:
+        print(f"[data_insert] Failed to discard stale {backend} store: {exc}")
+
+
+def _discard_rollups(csv_path: Path) -> None:
+    """Mark possibly stale rollups as not built, so they are rebuilt from the CSV."""
+    try:
+        from helper import rollups
+
+        (rollups.rollup_root_for(csv_path) / rollups.MANIFEST_NAME).unlink(missing_ok=True)
+    except OSError as exc:
+        print(f"[data_insert] Failed to discard stale rollups: {exc}")
+
+
+def ensure_partition_store(csv_path: Path | str = _CSV_PATH) -> None:
+    """Build the partitioned store from the CSV log if it does not exist yet."""
+    from helper import partitions
+
+    path = Path(csv_path)
+    root = partitions.partition_root_for(path)
+    if partitions.is_ready(root):
+        return
+    try:
+        with _FILE_LOCK:
+            if not partitions.is_ready(root):
+                rows = partitions.rebuild_from_csv(root, path)
+                print(f"[data_insert] Built partitioned store from {rows} CSV rows at {root}")
+    except Exception as exc:
+        print(f"[data_insert] Failed to build partitioned store: {exc}")
+
+
+def ensure_rollups(csv_path: Path | str = _CSV_PATH) -> None:
+    """Build the per-minute/per-hour rollups from the CSV log if they do not exist yet."""
+    from helper import rollups
+
+    path = Path(csv_path)
+    root = rollups.rollup_root_for(path)
+    if rollups.is_ready(root):
+        return
+    try:
+        with _FILE_LOCK:
+            if not rollups.is_ready(root):
+                rows = rollups.rebuild_from_csv(root, path)
+                print(f"[data_insert] Built rollups from {rows} CSV rows at {root}")
+    except Exception as exc:
+        print(f"[data_insert] Failed to build rollups: {exc}")
+
+
+def ensure_sqlite_store(csv_path: Path | str = _CSV_PATH) -> None:
+    """Build the SQLite store from the CSV log if it does not exist yet."""
+    from helper import sqlite_store
+
+    path = Path(csv_path)
+    db_path = sqlite_store.db_path_for(path)
+    if sqlite_store.is_ready(db_path):
+        return
+    try:
+        with _FILE_LOCK:
+            if not sqlite_store.is_ready(db_path):
+                rows = sqlite_store.rebuild_from_csv(db_path, path)
+                print(f"[data_insert] Built SQLite store from {rows} CSV rows at {db_path}")
+    except Exception as exc:
+        print(f"[data_insert] Failed to build SQLite store: {exc}")
+
+
+def _encode_rows(rows: Iterable[Iterable[object]]) -> list[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    encoded = []
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        encoded.append(buffer.getvalue().encode("utf-8"))
+    return encoded
+
+
+def _index_for(csv_path: Path) -> CsvIndex | None:
+    index = _INDEXES.get(csv_path)
+    try:
+        if index is None:
+            index = _INDEXES[csv_path] = CsvIndex.load(csv_path)
+        else:
+            index.refresh()
+    except Exception as exc:
+        print(f"[data_insert] Failed to load CSV offset index: {exc}")
+        _INDEXES.pop(csv_path, None)
+        return None
+    return index
+
+
+def _save_index(csv_path: Path, index: CsvIndex, force: bool = False) -> None:
+    """Save ``index``'s sidecar if it changed and, unless ``force``, is due."""
+    now = time.monotonic()
+    if not index.dirty:
+        return
+    if not force and now - _INDEX_SAVED.get(csv_path, float("-inf")) < INDEX_SAVE_INTERVAL_S:
+        return
+    index.save()
+    _INDEX_SAVED[csv_path] = now
+
+
+def save_indexes(csv_path: Path | str | None = None) -> None:
+    """Write out the offset index of ``csv_path`` (default: every log) if it has unsaved changes."""
+    with _FILE_LOCK:
+        for path, index in list(_INDEXES.items()):
+            if csv_path is not None and path != Path(csv_path):
+                continue
+            if not path.exists():
+                _INDEXES.pop(path, None)  # log removed meanwhile
+                continue
+            try:
+                _save_index(path, index, force=True)
+            except Exception as exc:
+                print(f"[data_insert] Failed to save CSV offset index: {exc}")
+
+
+def _header_width(csv_path: Path, inode: int) -> int:
+    """Columns in the header of the non-empty log ``csv_path`` (read once per file)."""
+    cached = _HEADER_WIDTHS.get(csv_path)
+    if cached is not None and cached[0] == inode:
+        return cached[1]
+    width = len(schema.read_header(csv_path)) or len(_HEADERS)
+    _HEADER_WIDTHS[csv_path] = (inode, width)
+    return width
+
+
+def needs_upgrade(csv_path: Path | str) -> bool:
+    """True for a non-empty log with an older schema that ``upgrade_log`` has not failed on."""
+    path = Path(csv_path)
+    try:
+        info = path.stat()
+    except OSError:
+        return False
+    if info.st_size == 0 or _UPGRADE_FAILED.get(path) == info.st_ino:
+        return False
+    return _header_width(path, info.st_ino) < len(_HEADERS)
+
+
+def _with_ms(lines: list[bytes]) -> list[bytes]:
+    """Version 1 CSV lines with their epoch-ms timestamp appended (empty when unknown)."""
+    import pandas as pd
+
+    keys = [line.decode("utf-8", "replace").split(",", 2)[:2] for line in lines]
+    frame = pd.DataFrame([key if len(key) == 2 else ["", ""] for key in keys], columns=["date", "time"])
+    upgraded = []
+    for line, ms in zip(lines, schema.epoch_ms(frame).tolist()):
+        body = line.rstrip(b"\r\n")
+        if body:
+            stamp = b"" if ms is pd.NA else str(ms).encode("ascii")
+            line = body + b"," + stamp + line[len(body):]
+        upgraded.append(line)
+    return upgraded
+
+
+def upgrade_log(csv_path: Path | str) -> bool:
+    """Rewrite a version 1 log as version 2. Returns True if it was upgraded.
+
+    The header gains ``ms`` and every row the epoch-ms timestamp of its local
+    date/time text (``schema.epoch_ms``), the value readers derive for version
+    1 rows, so the stores built from the old log stay valid. Row bytes are
+    otherwise kept as they are. The new log is written next to the old one
+    and renamed over it, and the offset index is rebuilt from it. Must be
+    called with ``_FILE_LOCK`` held and the log not open for appending.
+    """
+    path = Path(csv_path)
+    if schema.read_header(path) != schema.LEGACY_COLUMNS:
+        print(f"[data_insert] {path} has an unknown header; rows appended to it lose their extra columns")
+        _UPGRADE_FAILED[path] = path.stat().st_ino
+        return False
+    partial = path.with_name(path.name + ".upgrade")
+    try:
+        with path.open("rb") as source, partial.open("wb") as target:
+            source.readline()
+            target.write(_encode_rows([_HEADERS])[0])
+            while lines := source.readlines(_UPGRADE_CHUNK_BYTES):
+                target.write(b"".join(_with_ms(lines)))
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(partial, path)
+    except Exception as exc:
+        partial.unlink(missing_ok=True)
+        try:
+            _UPGRADE_FAILED[path] = path.stat().st_ino
+        except OSError:
+            pass
+        print(f"[data_insert] Failed to upgrade {path} to schema version {schema.SCHEMA_VERSION}: {exc}; "
+              "rows appended to it lose their ms timestamps")
+        return False
+    _HEADER_WIDTHS[path] = (path.stat().st_ino, len(_HEADERS))
+    _INDEXES.pop(path, None)
+    _INDEX_SAVED.pop(path, None)
+    index_path_for(path).unlink(missing_ok=True)
+    print(f"[data_insert] Upgraded {path} to schema version {schema.SCHEMA_VERSION}")
+    return True
+
+
+def _write_rows(csv_file, csv_path: Path, rows: list[list[object]]) -> tuple[int, int]:
+    """Append ``rows`` to a binary append-mode handle and extend the offset index.
+
+    Adds the (current schema) header to an empty file; rows appended to an
+    older log that ``upgrade_log`` could not upgrade are cut to its header's
+    columns. The index's sidecar is saved at most every
+    ``INDEX_SAVE_INTERVAL_S``. Returns the byte range written. Must be called
+    with ``_FILE_LOCK`` held.
+    """
+    csv_file.flush()
+    index = _index_for(csv_path)
+    start = os.fstat(csv_file.fileno()).st_size
+    header = b""
+    if start == 0:
+        header = _encode_rows([_HEADERS])[0]
+        encoded = _encode_rows(rows)
+        _HEADER_WIDTHS[csv_path] = (os.fstat(csv_file.fileno()).st_ino, len(_HEADERS))
+    else:
+        width = _header_width(csv_path, os.fstat(csv_file.fileno()).st_ino)
+        encoded = _encode_rows(row[:width] for row in rows)
+    written = header + b"".join(encoded)
+    csv_file.write(written)
+    csv_file.flush()
+    span = (start, start + len(written))
+    if index is None:
+        return span
+
+    try:
+        if index.size == start:
+            if header:
+                index.header_end = len(header)
+            index.extend(
+                ((row[0], row[2]) for row in rows),
+                (len(line) for line in encoded),
+                start + len(header),
+            )
+        else:
+            index.refresh()
+        _save_index(csv_path, index)
+    except Exception as exc:
+        print(f"[data_insert] Failed to update CSV offset index: {exc}")
+        _INDEXES.pop(csv_path, None)
+    return span
+
+
+class RecordWriter:
+    """Background writer that batches records into the CSV log.
+
+    ``submit`` never blocks the caller by default: when the bounded queue is
+    full the record is dropped and counted. Batches are committed every
+    ``batch_size`` rows or ``flush_interval_ms`` milliseconds, whichever comes
+    first. ``fsync`` selects durability: ``"never"`` leaves it to the OS,
+    ``"batch"`` fsyncs every commit and ``"interval"`` at most once per
+    ``fsync_interval_s``. ``backend`` picks the store mirroring the CSV
+    (default: ``storage_backend()``).
+    """
+
+    def __init__(
+        self,
+        csv_path: Path | str = _CSV_PATH,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        fsync: str = "interval",
+        fsync_interval_s: float = 5.0,
+        block_timeout_s: float = 0.0,
+        backend: str | None = None,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        backend = backend or storage_backend()
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"backend must be one of {STORAGE_BACKENDS}, got {backend!r}")
+        self.backend = backend
+        self.csv_path = Path(csv_path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_s = max(0.0, flush_interval_ms / 1000)
+        self.fsync = fsync
+        self.fsync_interval_s = fsync_interval_s
+        self.block_timeout_s = block_timeout_s
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._file = None
+        self._db = None
+        self._last_fsync = time.monotonic()
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+
+    # ------------------------------------------------------------------ control
+    def start(self) -> "RecordWriter":
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="RecordWriter", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, record: Mapping[str, object]) -> bool:
+        """Queue a record for writing. Returns False if it had to be dropped."""
+        if not self.running or self._stopping.is_set():
+            self.dropped += 1
+            return False
+        try:
+            if self.block_timeout_s > 0:
+                self._queue.put(record, timeout=self.block_timeout_s)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return True
+
+    def flush(self, timeout: float | None = DEFAULT_FLUSH_TIMEOUT_S) -> bool:
+        """Wait until every record submitted so far has been written.
+
+        Returns False (after printing why) if the writer thread died or did
+        not get there within ``timeout`` seconds, instead of blocking forever.
+        """
+        if not self.running:
+            if self._queue.qsize():
+                print(f"[data_insert] Flush abandoned: the writer thread has stopped ({self._queue.qsize()} records queued)")
+                return False
+            return True
+        request = _FlushRequest()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            print(f"[data_insert] Flush timed out after {timeout} s: the writer queue stayed full")
+            return False
+        while not request.done.wait(0.5):
+            if not self.running:
+                print("[data_insert] Flush abandoned: the writer thread has stopped")
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"[data_insert] Flush timed out after {timeout} s ({self._queue.qsize()} records queued)")
+                return False
+        return True
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Drain the queue, commit the last batch and stop the thread."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._queue.put(_FLUSH)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    # ------------------------------------------------------------------- thread
+    def _run(self) -> None:
+        ensure_store(self.csv_path, self.backend)
+        try:
+            while not (self._stopping.is_set() and self._queue.empty()):
+                batch, taken, flushes = self._collect_batch()
+                if batch:
+                    self._commit(batch)
+                for _ in range(taken):
+                    self._queue.task_done()
+                for request in flushes:
+                    request.done.set()
+        finally:
+            self._close_file()
+            save_indexes(self.csv_path)
+
+    def _collect_batch(self) -> tuple[list[list[object]], int, list[_FlushRequest]]:
+        """Wait for the first record, then gather more until size or time runs out.
+
+        Also returns the flush requests met on the way; they are answered
+        once the batch is committed.
+        """
+        batch: list[list[object]] = []
+        flushes: list[_FlushRequest] = []
+        taken = 0
+        try:
+            item = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return batch, taken, flushes
+        taken += 1
+        if isinstance(item, _FlushRequest):
+            flushes.append(item)
+        if item is _FLUSH or flushes:
+            return batch, taken, flushes
+        batch.append(_to_row(item))
+
+        deadline = time.monotonic() + self.flush_interval_s
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            taken += 1
+            if isinstance(item, _FlushRequest):
+                flushes.append(item)
+            if item is _FLUSH or flushes:
+                break
+            batch.append(_to_row(item))
+        return batch, taken, flushes
+
+    def _commit(self, batch: list[list[object]]) -> None:
+        try:
+            with _FILE_LOCK:
+                if needs_upgrade(self.csv_path):
+                    self._close_file()  # the log is replaced; reopen it afterwards
+                    upgrade_log(self.csv_path)
+                csv_file = self._open_file()
+                span = _write_rows(csv_file, self.csv_path, batch)
+                self._maybe_fsync(csv_file)
+                if not _append_store(self.csv_path, batch, self.backend, self._store_connection()):
+                    self._db = None
+                _append_rollups(self.csv_path, batch)
+                record_cache.note_commit(self.csv_path, batch, span)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as exc:
+            self.errors += 1
+            self._close_file()
+            print(f"[data_insert] Failed to persist {len(batch)} experiment records: {exc}")
+
+    def _open_file(self):
+        if self._file is None or self._file.closed:
+            self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.csv_path.open("ab")
+        return self._file
+
+    def _store_connection(self):
+        """The writer thread's SQLite connection (sqlite backend only)."""
+        if self.backend != "sqlite":
+            return None
+        if self._db is None:
+            from helper import sqlite_store
+
+            try:
+                self._db = sqlite_store.connect(sqlite_store.db_path_for(self.csv_path))
+            except Exception as exc:
+                print(f"[data_insert] Failed to open SQLite store: {exc}")
+                return None
+        return self._db
+
+    def _close_file(self) -> None:
+        if self._file is not None and not self._file.closed:
+            try:
+                self._file.flush()
+                if self.fsync != "never":
+                    os.fsync(self._file.fileno())
+            except OSError:
+                pass
+            self._file.close()
+        self._file = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _maybe_fsync(self, csv_file) -> None:
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "batch" or now - self._last_fsync >= self.fsync_interval_s:
+            os.fsync(csv_file.fileno())
+            self._last_fsync = now
+
+
+_WRITER: RecordWriter | None = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_record_writer() -> RecordWriter:
+    """Return the process-wide writer, starting it on first use."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None or not _WRITER.running:
+            _WRITER = RecordWriter().start()
+        return _WRITER
+
+
+def set_record_writer(writer: RecordWriter | None) -> RecordWriter | None:
+    """Install ``writer`` as the shared writer and return the previous one.
+
+    The previous writer is left running; callers decide whether to close it.
+    """
+    global _WRITER
+    with _WRITER_LOCK:
+        previous, _WRITER = _WRITER, writer
+    return previous
+
+
+def record_log_path() -> Path:
+    """CSV log the shared writer appends to (the default one if none is running)."""
+    writer = _WRITER
+    return writer.csv_path if writer is not None else _CSV_PATH
+
+
+def submit_experiment_record(record: Mapping[str, object]) -> bool:
+    """Queue a record on the shared writer without blocking the caller."""
+    return get_record_writer().submit(record)
+
+
+def flush_experiment_records(timeout: float | None = DEFAULT_FLUSH_TIMEOUT_S) -> bool:
+    """Wait until the shared writer has committed everything queued so far.
+
+    Returns False if it could not within ``timeout`` seconds (see ``RecordWriter.flush``).
+    """
+    if _WRITER is not None:
+        return _WRITER.flush(timeout)
+    return True
+
+
+def shutdown_record_writer() -> None:
+    """Drain and stop the shared writer (safe to call more than once)."""
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close()
+        stats = writer.stats()
+        if stats["dropped"] or stats["errors"]:
+            print(f"[data_insert] Writer stopped with {stats}")
+    save_indexes()
+
+
+atexit.register(shutdown_record_writer)
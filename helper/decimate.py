@@ -0,0 +1,57 @@
+"""Level-of-detail reduction for plotted time series.
+
+``minmax_decimate`` splits the x span into ``buckets`` equal-width bins
+(normally one per horizontal pixel) and keeps, for every bin, its first,
+minimum, maximum and last points in their original order. The drawn line
+therefore still reaches every spike and trough while the point count is
+bounded by ``4 * buckets`` regardless of how many samples are in view.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def minmax_decimate(x, y, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce ``(x, y)`` (x ascending) to the min/max envelope per x bucket.
+
+    Non-finite points are dropped. Series already small enough are returned
+    unchanged (as arrays).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+
+    buckets = max(1, int(buckets))
+    n = len(x)
+    if n <= 4 * buckets:
+        return x, y
+
+    span = x[-1] - x[0]
+    if span <= 0:
+        bins = np.arange(n) * buckets // n
+    else:
+        bins = ((x - x[0]) * (buckets / span)).astype(np.int64)
+        np.minimum(bins, buckets - 1, out=bins)
+
+    # Segment boundaries of each non-empty bin (x is sorted, so bins are runs).
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    counts = ends - starts + 1
+    segment = np.repeat(np.arange(len(starts)), counts)
+    argmin = _first_per_segment(y == np.minimum.reduceat(y, starts)[segment], segment)
+    argmax = _first_per_segment(y == np.maximum.reduceat(y, starts)[segment], segment)
+
+    keep = np.unique(np.concatenate((starts, argmin, argmax, ends)))
+    return x[keep], y[keep]
+
+
+def _first_per_segment(hits: np.ndarray, segment: np.ndarray) -> np.ndarray:
+    """Index of the first True in ``hits`` for every segment id."""
+    positions = np.flatnonzero(hits)
+    owners = segment[positions]
+    first = np.r_[True, owners[1:] != owners[:-1]]
+    return positions[first]
@@ -0,0 +1,179 @@
+"""Streaming export of query results to CSV, Parquet or Excel.
+
+``export_query`` pulls a query's rows from the record store chunk by chunk
+(``data_get.stream_data_by_date_and_experiment``) and appends each chunk to
+the output file as it arrives, so only about one chunk is ever held in
+memory, however many months are exported. The format follows the file
+suffix:
+
+    .csv      the record log's columns, text
+    .parquet  one row group per chunk (needs ``pyarrow``)
+    .xlsx     write-only workbook, a new sheet every 1,048,575 rows (needs
+              ``openpyxl``)
+
+The file is written under a ``.part`` name and renamed into place once
+complete; a failed or cancelled export removes it and leaves any existing
+file at the destination untouched.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from helper import data_get, schema
+
+FORMATS: dict[str, str] = {".csv": "csv", ".parquet": "parquet", ".xlsx": "excel"}
+
+# Rows read from the store, and handed to the writer, at a time.
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Excel's row limit, minus the header row.
+EXCEL_SHEET_ROWS = 1_048_575
+
+
+class ExportError(RuntimeError):
+    """The export could not be written (unknown format, missing writer library)."""
+
+
+def format_for(path: Path | str) -> str:
+    """Export format named by ``path``'s suffix."""
+    suffix = Path(path).suffix.lower()
+    try:
+        return FORMATS[suffix]
+    except KeyError:
+        raise ExportError(
+            f"Unsupported export format {suffix or '(none)'!r}; use one of {', '.join(FORMATS)}."
+        ) from None
+
+
+def _plain(frame: pd.DataFrame) -> pd.DataFrame:
+    """Chunk with text date/experiment columns, so every chunk has the same types."""
+    frame = frame.copy()
+    for column in ("date", "experiment"):
+        frame[column] = frame[column].astype(str)
+    return frame
+
+
+class _CsvSink:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        self._handle = path.open("w", newline="", encoding="utf-8")
+        csv.writer(self._handle).writerow(columns)
+
+    def write(self, frame: pd.DataFrame) -> None:
+        frame.to_csv(self._handle, header=False, index=False, lineterminator="\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("Parquet export needs pyarrow (pip install pyarrow).") from None
+        self._pa = pa
+        types = {name: pa.float64() for name in schema.NUMERIC_COLUMNS}
+        types.update(date=pa.string(), time=pa.string(), experiment=pa.string(), ms=pa.int64())
+        self._schema = pa.schema([(name, types[name]) for name in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, frame: pd.DataFrame) -> None:
+        table = self._pa.Table.from_pandas(_plain(frame), schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ExcelSink:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ExportError("Excel export needs openpyxl (pip install openpyxl).") from None
+        self._path = path
+        self._columns = list(columns)
+        self._book = Workbook(write_only=True)
+        self._sheet = None
+        self._rows = EXCEL_SHEET_ROWS
+
+    def write(self, frame: pd.DataFrame) -> None:
+        values = _plain(frame).astype(object)
+        values = values.where(values.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self._rows >= EXCEL_SHEET_ROWS:
+                self._sheet = self._book.create_sheet(f"records_{len(self._book.worksheets) + 1}")
+                self._sheet.append(self._columns)
+                self._rows = 0
+            self._sheet.append([v.item() if isinstance(v, np.generic) else v for v in row])
+            self._rows += 1
+
+    def close(self) -> None:
+        if self._sheet is None:
+            self._book.create_sheet("records_1").append(self._columns)
+        self._book.save(self._path)
+
+
+_SINKS = {"csv": _CsvSink, "parquet": _ParquetSink, "excel": _ExcelSink}
+
+
+def export_query(
+    destination: Path | str,
+    start_date: str,
+    end_date: str,
+    experiment_numbers: Sequence[int],
+    csv_path: Path | str | None = None,
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress: Callable[[float], None] | None = None,
+    cancel_event: threading.Event | None = None,
+) -> int:
+    """Stream the raw rows of a query into ``destination``. Returns the rows written.
+
+    ``progress`` receives the 0..1 fraction of the query read so far; setting
+    ``cancel_event`` aborts with ``data_get.QueryCancelled`` and removes the
+    partial file. Raises ``ExportError`` for an unsupported suffix or a
+    missing writer library before anything is read.
+    """
+    destination = Path(destination)
+    sink_type = _SINKS[format_for(destination)]
+    columns = list(schema.COLUMNS)
+    partial = destination.with_name(destination.name + ".part")
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    query_kwargs = {} if csv_path is None else {"csv_path": csv_path}
+    written = 0
+    sink = sink_type(partial, columns)
+    try:
+        for chunk in data_get.stream_data_by_date_and_experiment(
+            start_date,
+            end_date,
+            experiment_numbers,
+            chunk_rows=chunk_rows,
+            progress=progress,
+            cancel_event=cancel_event,
+            **query_kwargs,
+        ):
+            if cancel_event is not None and cancel_event.is_set():
+                raise data_get.QueryCancelled()
+            sink.write(chunk[columns])
+            written += len(chunk)
+        sink.close()
+    except BaseException:
+        try:
+            sink.close()
+        except Exception:
+            pass
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, destination)
+    return written
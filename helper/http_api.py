@@ -0,0 +1,425 @@
+"""Optional embedded HTTP API: live sample feed and cached historical queries.
+
+Enabled with ``BPCL_HTTP_API=[host:]port`` (needs ``flask``); the host
+defaults to ``127.0.0.1``, so nothing is reachable from other machines
+unless a host is named explicitly. Endpoints::
+
+    GET /api/rigs      every rig: source, interval, experiment, latest sample
+    GET /api/live      live samples of every rig as Server-Sent Events, or as
+                       chunked JSON lines with ?format=jsonl; resumes after
+                       Last-Event-ID (or ?since=<id>)
+    GET /api/records   ?start=YYYY-MM-DD&end=YYYY-MM-DD&experiments=1,2
+                       [&resolution=raw|minute|hour|auto][&max_points=N]
+
+The live feed is one shared backlog of encoded events. Each sample is
+serialised once in the engine thread and every client reads the same bytes,
+so browsers do not add work per sample beyond the socket write. A client
+that falls more than the backlog behind skips ahead.
+
+``/api/records`` answers from ``data_get.get_data_by_date_and_experiment``
+as JSON (``orient="split"``, the resolution in ``X-Resolution``). The CSV
+log is append-only and every store mirrors it, so the byte ranges the
+offset index lists for a query identify the data it returns. Those ranges,
+hashed with the query, are the ETag: a conditional request for unchanged
+data gets 304 without running the query, and a past range keeps its ETag
+while today's rows are appended. Encoded bodies (plain and gzip) are kept
+in a byte-bounded LRU, and concurrent identical queries run once.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from helper.csv_index import CsvIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Live events kept for clients that are behind or reconnecting.
+DEFAULT_BACKLOG = 1024
+# Seconds between keep-alive lines on an idle live stream.
+HEARTBEAT_S = 15.0
+# Encoded query responses kept in memory.
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Bodies smaller than this are not worth compressing.
+_GZIP_MIN_BYTES = 1024
+
+
+class LiveFeed:
+    """Fan-out of rig samples to any number of streaming HTTP clients."""
+
+    def __init__(self, backlog: int = DEFAULT_BACKLOG):
+        self._events: deque[tuple[int, bytes]] = deque(maxlen=backlog)
+        self._last_id = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._unsubscribe: list = []
+
+    def attach(self, rigs: Sequence) -> None:
+        """Publish every sample of ``rigs`` (subscribes to their engines)."""
+        for rig in rigs:
+            callback = lambda sample, rig=rig: self._on_sample(rig, sample)
+            self._unsubscribe.append(rig.engine.subscribe(callback))
+
+    def _on_sample(self, rig, sample) -> None:
+        self.publish(
+            {
+                "rig": rig.name,
+                "experiment": rig.experiment,
+                "seq": sample.seq,
+                "ms": sample.ms,
+                "values": dict(sample.values),
+            }
+        )
+
+    def publish(self, event: dict) -> int:
+        """Append one event (encoded once, here) and wake the clients; returns its id."""
+        payload = json.dumps(event, separators=(",", ":")).encode("utf-8")
+        with self._cond:
+            self._last_id += 1
+            self._events.append((self._last_id, payload))
+            self._cond.notify_all()
+            return self._last_id
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def wait(self, after_id: int, timeout: float) -> list[tuple[int, bytes]]:
+        """Events newer than ``after_id``, waiting up to ``timeout`` seconds for one."""
+        with self._cond:
+            if self._last_id <= after_id and not self._closed:
+                self._cond.wait(timeout)
+            if not self._events or self._last_id <= after_id:
+                return []
+            first_id = self._events[0][0]
+            return list(islice(self._events, max(0, after_id + 1 - first_id), None))
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        """Detach from the rigs and end every client's stream."""
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stream(self, after_id: int, fmt: str = "sse") -> Iterator[bytes]:
+        """Response body of one live client, in ``"sse"`` or ``"jsonl"`` framing."""
+        if fmt == "sse":
+            yield b"retry: 2000\n\n"
+        last = after_id
+        while not self._closed:
+            events = self.wait(last, HEARTBEAT_S)
+            if not events:
+                yield b": keep-alive\n\n" if fmt == "sse" else b"\n"
+                continue
+            if fmt == "sse":
+                yield b"".join(b"id: %d\ndata: %s\n\n" % (event_id, payload) for event_id, payload in events)
+            else:
+                yield b"".join(payload + b"\n" for _, payload in events)
+            last = events[-1][0]
+
+
+class QueryCache:
+    """Encoded ``/api/records`` bodies keyed by ETag, evicted least recently used."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[str, dict[str, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str) -> dict[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+                self.hits += 1
+            return entry
+
+    def put(self, etag: str, entry: dict[str, bytes]) -> None:
+        size = sum(len(value) for value in entry.values())
+        with self._lock:
+            self.misses += 1
+            if size > self.max_bytes:
+                return
+            old = self._entries.pop(etag, None)
+            if old is not None:
+                self._bytes -= sum(len(value) for value in old.values())
+            self._entries[etag] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sum(len(value) for value in evicted.values())
+
+    def lock_for(self, etag: str) -> threading.Lock:
+        """Lock serialising the computation of one ETag's body."""
+        with self._lock:
+            return self._inflight.setdefault(etag, threading.Lock())
+
+    def release(self, etag: str) -> None:
+        with self._lock:
+            self._inflight.pop(etag, None)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+class RecordQueries:
+    """Validated, versioned and cached historical queries against one record log."""
+
+    def __init__(self, csv_path: Path | str, cache: QueryCache | None = None):
+        self.csv_path = Path(csv_path)
+        self.cache = cache or QueryCache()
+        self._index: CsvIndex | None = None
+        self._index_lock = threading.Lock()
+
+    @staticmethod
+    def parse(args) -> dict:
+        """Query parameters from a request's ``args``; raises ValueError when invalid."""
+        from helper.data_get import RESOLUTIONS
+
+        try:
+            start = date.fromisoformat(args.get("start", ""))
+            end = date.fromisoformat(args.get("end", "") or args.get("start", ""))
+        except ValueError:
+            raise ValueError("start and end must be dates (YYYY-MM-DD)") from None
+        if end < start:
+            raise ValueError("end is before start")
+        numbers = sorted({int(part) for part in args.get("experiments", "").replace(" ", "").split(",") if part.isdigit()})
+        if not numbers:
+            raise ValueError("experiments must list at least one experiment number, e.g. 1,2")
+        resolution = args.get("resolution", "raw")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+        try:
+            max_points = max(1, int(args.get("max_points", 2000)))
+        except ValueError:
+            raise ValueError("max_points must be an integer") from None
+        return {"start": start, "end": end, "numbers": numbers, "resolution": resolution, "max_points": max_points}
+
+    def version(self, query: dict) -> tuple[str, float]:
+        """ETag of ``query``'s current result and the log's modification time."""
+        with self._index_lock:
+            if self._index is None:
+                self._index = CsvIndex.load(self.csv_path)
+            else:
+                self._index.refresh()
+            spans = self._index.select(query["start"], query["end"], query["numbers"])
+            rebuilds = self._index.rebuilds
+        try:
+            modified = self.csv_path.stat().st_mtime
+        except OSError:
+            modified = 0.0
+        key = json.dumps({**query, "start": str(query["start"]), "end": str(query["end"])}, sort_keys=True)
+        digest = hashlib.sha1(f"{key}|{rebuilds}|{spans}".encode("utf-8")).hexdigest()
+        return f'"{digest}"', modified
+
+    def body(self, query: dict, etag: str) -> dict[str, bytes]:
+        """Encoded result for ``query`` (from the cache when possible)."""
+        entry = self.cache.get(etag)
+        if entry is not None:
+            return entry
+        try:
+            with self.cache.lock_for(etag):
+                entry = self.cache.get(etag)
+                if entry is None:
+                    entry = self._run(query)
+                    self.cache.put(etag, entry)
+        finally:
+            self.cache.release(etag)
+        return entry
+
+    def _run(self, query: dict) -> dict[str, bytes]:
+        from helper.data_get import get_data_by_date_and_experiment
+
+        frame = get_data_by_date_and_experiment(
+            query["start"].isoformat(),
+            query["end"].isoformat(),
+            query["numbers"],
+            self.csv_path,
+            resolution=query["resolution"],
+            max_points=query["max_points"],
+        )
+        body = frame.to_json(orient="split", index=False).encode("utf-8")
+        entry = {"identity": body, "resolution": frame.attrs.get("resolution", "raw").encode("ascii")}
+        if len(body) >= _GZIP_MIN_BYTES:
+            entry["gzip"] = gzip.compress(body, compresslevel=5)
+        return entry
+
+
+def _not_modified(request, etag: str, modified: float) -> bool:
+    """RFC 7232 validation: If-None-Match wins over If-Modified-Since."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since and modified:
+        try:
+            return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def create_app(rigs: Sequence, feed: LiveFeed, queries: RecordQueries):
+    """Flask application serving ``rigs``' live feed and ``queries``."""
+    from flask import Flask, Response, jsonify, request
+
+    app = Flask("bpcl_http_api")
+
+    def error(status: int, message: str):
+        response = jsonify({"error": message})
+        response.status_code = status
+        return response
+
+    @app.get("/api/rigs")
+    def list_rigs():
+        rows = []
+        for rig in rigs:
+            latest = rig.latest
+            rows.append(
+                {
+                    "name": rig.name,
+                    "source": rig.source_name,
+                    "interval_ms": rig.interval_ms,
+                    "experiment": rig.experiment,
+                    "latest": None if latest is None else {"seq": latest.seq, "ms": latest.ms, "values": dict(latest.values)},
+                }
+            )
+        response = jsonify({"rigs": rows, "live_last_id": feed.last_id})
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    @app.get("/api/live")
+    def live():
+        fmt = request.args.get("format", "sse")
+        if fmt not in ("sse", "jsonl"):
+            return error(400, "format must be sse or jsonl")
+        since = request.headers.get("Last-Event-ID") or request.args.get("since")
+        try:
+            after_id = min(int(since), feed.last_id) if since is not None else feed.last_id
+        except ValueError:
+            return error(400, "since / Last-Event-ID must be an event id")
+        mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+        response = Response(feed.stream(after_id, fmt), mimetype=mimetype)
+        response.headers["Cache-Control"] = "no-store"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    @app.get("/api/records")
+    def records():
+        from helper.data_get import QueryMemoryLimitExceeded
+
+        try:
+            query = RecordQueries.parse(request.args)
+        except ValueError as exc:
+            return error(400, str(exc))
+        etag, modified = queries.version(query)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if modified:
+            headers["Last-Modified"] = formatdate(modified, usegmt=True)
+        if _not_modified(request, etag, modified):
+            return Response(status=304, headers=headers)
+        try:
+            entry = queries.body(query, etag)
+        except QueryMemoryLimitExceeded as exc:
+            return error(413, str(exc))
+        except Exception as exc:
+            return error(500, f"Query failed: {exc}")
+
+        headers["X-Resolution"] = entry["resolution"].decode("ascii")
+        body = entry["identity"]
+        if "gzip" in entry and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = entry["gzip"]
+            headers["Content-Encoding"] = "gzip"
+        return Response(body, mimetype="application/json", headers=headers)
+
+    @app.get("/api/stats")
+    def stats():
+        return jsonify({"query_cache": queries.cache.stats(), "live_last_id": feed.last_id})
+
+    return app
+
+
+class ApiServer:
+    """The API served from a background thread (threaded WSGI server)."""
+
+    def __init__(self, rigs: Sequence, csv_path: Path | str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        from werkzeug.serving import make_server
+
+        self.feed = LiveFeed()
+        self.queries = RecordQueries(csv_path)
+        self.app = create_app(rigs, self.feed, self.queries)
+        self._server = make_server(host, port, self.app, threaded=True)
+        self.host, self.port = host, self._server.server_port
+        self.feed.attach(rigs)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "ApiServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="http-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """End the live streams, then stop accepting requests."""
+        self.feed.close()
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def parse_address(spec: str) -> tuple[str, int]:
+    """``"port"`` or ``"host:port"`` -> (host, port); the host defaults to loopback."""
+    host, _, port = spec.strip().rpartition(":")
+    return host or DEFAULT_HOST, int(port or DEFAULT_PORT)
+
+
+def start_from_env(rigs: Sequence, csv_path: Path | str | None = None) -> ApiServer | None:
+    """Start the API if ``BPCL_HTTP_API`` is set; None when disabled or unavailable."""
+    spec = os.environ.get("BPCL_HTTP_API", "").strip()
+    if not spec:
+        return None
+    if csv_path is None:
+        from helper.data_insert import record_log_path
+
+        csv_path = record_log_path()
+    try:
+        host, port = parse_address(spec)
+        server = ApiServer(rigs, csv_path, host, port).start()
+    except ImportError:
+        print("[http_api] flask is not installed; HTTP API disabled.")
+        return None
+    except (OSError, ValueError) as exc:
+        print(f"[http_api] Could not start the HTTP API on {spec!r}: {exc}")
+        return None
+    print(f"[http_api] Serving on {server.url}")
+    return server
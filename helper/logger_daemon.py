@@ -0,0 +1,637 @@
+"""Standalone acquisition and logging process, and the dashboard's view of it.
+
+    python -m helper.logger_daemon [--rigs SPEC] [--address HOST:PORT] [--capacity N]
+
+runs the rigs (``BPCL_RIGS`` syntax) in a process of its own. It samples,
+persists every record through the shared RecordWriter, exports sample logs
+and publishes each rig's samples into a shared-memory ``SampleRing``
+(helper.shm_ring). Dashboards started with ``BPCL_LOGGER_DAEMON=HOST:PORT``
+attach to it instead of sampling themselves, so closing, crashing or
+restarting a dashboard no longer interrupts an experiment.
+
+An attached dashboard gets ``RemoteRig`` objects with the ``Rig`` interface
+it already uses. Samples are read straight out of the rings, with no copy
+in between and no trip through the disk; ``rig.engine.subscribe`` callbacks
+(the HTTP API's live feed) get each one as ``drain`` reads it.
+
+Commands (start/stop experiment, pause sampling) go to the daemon over a
+``multiprocessing.connection`` socket. It is authenticated with
+``BPCL_LOGGER_AUTHKEY`` when set, or else with a random key the daemon
+writes to ``Logs/logger_daemon.key`` (readable by its owner only) for local
+dashboards to read; without an explicit key the daemon listens on loopback
+addresses only. The daemon applies commands one at a time and announces
+the new session in the ring's status words, so every attached dashboard
+follows it. A dashboard that attaches mid-experiment refills its live
+history from the ring.
+
+Stopping an experiment returns at once; the daemon flushes and exports it
+on a thread of its own, and ``finish_experiment`` (sent on a connection of
+its own, so other commands are not held up) waits for that to complete.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import os
+import secrets
+import signal
+import threading
+from functools import partial
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Callable, Sequence
+
+from helper import shm_ring
+from helper.acquisition import Sample, Subscriber
+from helper.rig import DEFAULT_HISTORY_CAPACITY, Rig, StoppedExperiment, finish_catalog_entry, rigs_from_spec
+from helper.ring_buffer import TieredHistory
+from helper.shm_ring import SampleRing
+
+DEFAULT_ADDRESS = ("127.0.0.1", 8766)
+# The generated control key, in the log directory.
+KEY_FILE = "logger_daemon.key"
+# Samples kept per ring: at least the raw history a dashboard refills on attach.
+DEFAULT_RING_CAPACITY = DEFAULT_HISTORY_CAPACITY
+# Seconds between the daemon's housekeeping passes (heartbeat, draining).
+_TICK_S = 0.5
+
+
+def parse_address(spec: str | None) -> tuple[str, int]:
+    """``"port"`` or ``"host:port"`` -> (host, port); the host defaults to loopback."""
+    if not spec:
+        return DEFAULT_ADDRESS
+    host, _, port = spec.strip().rpartition(":")
+    return host or DEFAULT_ADDRESS[0], int(port)
+
+
+def key_path(log_dir: Path | str | None = None) -> Path:
+    """Where the daemon keeps its generated key (next to the logs by default)."""
+    if log_dir is None:
+        from helper.paths import get_project_root
+
+        log_dir = get_project_root() / "Logs"
+    return Path(log_dir) / KEY_FILE
+
+
+def authkey(log_dir: Path | str | None = None, create: bool = False) -> bytes:
+    """The control socket's key: ``BPCL_LOGGER_AUTHKEY``, else the daemon's key file.
+
+    With ``create`` (the daemon) a random key is written to the file, owner
+    read/write only, if there is none yet. Raises ConnectionError when there
+    is no key to use.
+    """
+    explicit = os.environ.get("BPCL_LOGGER_AUTHKEY")
+    if explicit:
+        return explicit.encode("utf-8")
+    path = key_path(log_dir)
+    if create and not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # another daemon wrote one first
+        else:
+            with os.fdopen(fd, "w", encoding="ascii") as handle:
+                handle.write(secrets.token_hex(32))
+    try:
+        key = path.read_bytes().strip()
+    except FileNotFoundError:
+        raise ConnectionError(
+            f"no key for the logger daemon: set BPCL_LOGGER_AUTHKEY or start the daemon, which writes {path}"
+        ) from None
+    if not key:
+        raise ConnectionError(f"the logger daemon's key file {path} is empty")
+    return key
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # a host name, or "" for every interface
+
+
+def check_address(address: tuple[str, int]) -> None:
+    """Raise ValueError for a non-loopback address unless ``BPCL_LOGGER_AUTHKEY`` is set.
+
+    The generated key only protects dashboards on this machine; the socket
+    unpickles what authenticated clients send.
+    """
+    if not is_loopback(address[0]) and not os.environ.get("BPCL_LOGGER_AUTHKEY"):
+        raise ValueError(
+            f"refusing to accept dashboards on {address[0] or 'every interface'} without an explicit key; "
+            "set BPCL_LOGGER_AUTHKEY (to the same value for the dashboards)"
+        )
+
+
+# ------------------------------------------------------------------ daemon
+class LoggerDaemon:
+    """Owns the rigs and their rings; serves control requests."""
+
+    def __init__(
+        self, rigs: Sequence[Rig], capacity: int = DEFAULT_RING_CAPACITY, log_dir: Path | str | None = None
+    ):
+        self.rigs = list(rigs)
+        self.log_dir = log_dir
+        self.rings: list[SampleRing] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Per rig: the last stopped experiment's number, its finishing thread
+        # and the result that thread fills in.
+        self._finishers: dict[int, tuple[int, threading.Thread, dict]] = {}
+        prefix = f"bpcl_{os.getpid()}"
+        for index, rig in enumerate(self.rigs):
+            ring = SampleRing.create(f"{prefix}_{index}", rig.history.channels, capacity)
+            ring.set_status(interval_ms=rig.interval_ms)
+            rig.engine.subscribe(partial(self._publish, rig, ring))
+            self.rings.append(ring)
+
+    @staticmethod
+    def _publish(rig: Rig, ring: SampleRing, sample: Sample) -> None:
+        """Engine-thread subscriber (after the recorder): one ring slot per sample."""
+        ring.publish(sample.ms, sample.values)
+        if rig.recording:
+            ring.set_status(new_session=False, samples_recorded=rig.samples_recorded)
+
+    def describe(self, index: int) -> dict:
+        rig, ring = self.rigs[index], self.rings[index]
+        return {
+            "index": index,
+            "name": rig.name,
+            "source": rig.source_name,
+            "ring": ring.name,
+            "interval_ms": rig.interval_ms,
+            "experiment_number": rig.experiment_number,
+            "samples_recorded": rig.samples_recorded,
+            "log_file": str(rig.log_file) if rig.log_file else None,
+        }
+
+    def handle(self, request: dict) -> dict:
+        """Apply one control request; replies are plain dicts."""
+        op = request.get("op")
+        if op == "finish_experiment":
+            return self._await_finish(request)  # may take long: not under the lock
+        with self._lock:
+            if op == "describe":
+                return {"ok": True, "rigs": [self.describe(i) for i in range(len(self.rigs))]}
+            if op == "shutdown":
+                self._stopping.set()
+                return {"ok": True}
+            index = int(request.get("rig", -1))
+            if not 0 <= index < len(self.rigs):
+                return {"ok": False, "error": f"no rig {index}"}
+            rig, ring = self.rigs[index], self.rings[index]
+            if op == "start_monitoring":
+                rig.start_monitoring()
+            elif op == "pause":
+                rig.engine.stop(timeout=request.get("timeout", 5.0))
+            elif op == "start_experiment":
+                # Announce the session before sampling restarts, so readers
+                # never take one of its samples for the previous session's.
+                rig.engine.stop()
+                ring.set_status(
+                    experiment_number=request["number"],
+                    experiment_start_ms=request["start_ms"],
+                    experiment_id=-1 if request.get("experiment_id") is None else request["experiment_id"],
+                    interval_ms=request["interval_ms"],
+                    samples_recorded=0,
+                    first_seq=ring.write_seq + 1,
+                )
+                rig.start_experiment(
+                    int(request["number"]),
+                    int(request["interval_ms"]),
+                    int(request["start_ms"]),
+                    experiment_id=request.get("experiment_id"),
+                )
+            elif op == "stop_experiment":
+                stopped = rig.stop_experiment()
+                ring.set_status(experiment_number=0, samples_recorded=rig.samples_recorded)
+                reply = {"ok": True, "number": None, **self.describe(index)}
+                if stopped is not None:
+                    self._start_finisher(index, stopped, bool(request.get("export", True)))
+                    reply.update(
+                        number=stopped.number,
+                        start_ms=stopped.start_ms,
+                        stopped_ms=stopped.stopped_ms,
+                        samples=stopped.samples,
+                        experiment_id=stopped.experiment_id,
+                    )
+                return reply
+            else:
+                return {"ok": False, "error": f"unknown request {op!r}"}
+            return {"ok": True, **self.describe(index)}
+
+    def _start_finisher(self, index: int, stopped: StoppedExperiment, export: bool) -> None:
+        """Flush and export ``stopped`` on a thread of its own (called under the lock)."""
+        rig, result = self.rigs[index], {}
+
+        def finish() -> None:
+            path = rig.finish_experiment(stopped, export=export)
+            result["log_file"] = str(path) if path else None
+            if not rig.recording and rig.last_experiment_number == stopped.number:
+                rig.log_file = path
+
+        thread = threading.Thread(target=finish, name=f"finish-{stopped.label}", daemon=True)
+        self._finishers[index] = (stopped.number, thread, result)
+        thread.start()
+
+    def _await_finish(self, request: dict) -> dict:
+        index, number = int(request.get("rig", -1)), request.get("number")
+        with self._lock:
+            finisher = self._finishers.get(index)
+        if finisher is None or finisher[0] != number:
+            return {"ok": False, "error": f"EXP_{number} is not being finished on rig {index}"}
+        _, thread, result = finisher
+        thread.join()
+        return {"ok": True, "number": number, "log_file": result.get("log_file")}
+
+    def _serve_connection(self, conn) -> None:
+        with conn:
+            while not self._stopping.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self.handle(request)
+                except Exception as exc:
+                    reply = {"ok": False, "error": str(exc)}
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+
+    def _accept(self, listener: Listener) -> None:
+        while not self._stopping.is_set():
+            try:
+                conn = listener.accept()
+            except OSError:
+                return  # listener closed
+            except Exception as exc:
+                print(f"[logger_daemon] Rejected a connection: {exc}")
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def serve(self, address: tuple[str, int]) -> None:
+        """Sample and serve until ``shutdown`` is requested or the process is signalled.
+
+        Raises ValueError (see ``check_address``) before serving anything.
+        """
+        check_address(address)
+        listener = Listener(address, authkey=authkey(self.log_dir, create=True))
+        threading.Thread(target=self._accept, args=(listener,), name="logger-control", daemon=True).start()
+        for rig in self.rigs:
+            rig.start_monitoring()
+        print(f"[logger_daemon] {len(self.rigs)} rig(s) on {address[0]}:{address[1]}: "
+              + ", ".join(f"{rig.name} -> {ring.name}" for rig, ring in zip(self.rigs, self.rings)))
+        try:
+            while not self._stopping.wait(_TICK_S):
+                for rig, ring in zip(self.rigs, self.rings):
+                    rig.drain()  # keeps the daemon's own pending queues short
+                    ring.beat()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            self.close()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def close(self) -> None:
+        """Stop running experiments (flushing and exporting them), then drop the rings."""
+        from helper.data_insert import shutdown_record_writer
+
+        with self._lock:
+            for rig in self.rigs:
+                stopped = rig.stop_experiment()
+                if stopped is not None:
+                    path = rig.finish_experiment(stopped)
+                    _finish_catalog_entry(rig, stopped, path)
+                    print(f"[logger_daemon] {rig.name}: stopped {stopped.label} at shutdown")
+                rig.close()
+            for _, thread, _ in self._finishers.values():
+                thread.join()
+            shutdown_record_writer()
+            for ring in self.rings:
+                ring.close()
+            self.rings = []
+
+
+def _finish_catalog_entry(rig: Rig, stopped: StoppedExperiment, sample_log: Path | None) -> None:
+    if stopped.experiment_id is None:
+        return
+    from helper.catalog import ExperimentCatalog
+
+    try:
+        catalog = ExperimentCatalog(rig.log_dir / "experiments.sqlite3")
+    except Exception as exc:
+        print(f"[logger_daemon] {rig.name}: could not complete the catalog entry: {exc}")
+        return
+    try:
+        finish_catalog_entry(catalog, stopped, sample_log)
+    finally:
+        catalog.close()
+
+
+# ------------------------------------------------------------------ viewers
+class _DaemonClient:
+    """One control connection, shared by a dashboard's rigs."""
+
+    def __init__(self, address: tuple[str, int], key: bytes):
+        self.address = address
+        self._key = key
+        try:
+            self._conn = Client(address, authkey=key)
+        except AuthenticationError as exc:
+            raise ConnectionError(f"the logger daemon did not accept our key: {exc}") from None
+        self._lock = threading.Lock()
+
+    def request(self, op: str, **fields) -> dict | None:
+        """Send one request; None (after printing why) when it failed."""
+        try:
+            with self._lock:
+                self._conn.send({"op": op, **fields})
+                reply = self._conn.recv()
+        except (EOFError, OSError) as exc:
+            print(f"[logger_daemon] Lost the logger daemon at {self.address[0]}:{self.address[1]}: {exc}")
+            return None
+        return self._checked(op, reply)
+
+    def request_alone(self, op: str, **fields) -> dict | None:
+        """Like ``request``, on a connection of its own (for requests that may wait long)."""
+        try:
+            with Client(self.address, authkey=self._key) as conn:
+                conn.send({"op": op, **fields})
+                reply = conn.recv()
+        except (AuthenticationError, EOFError, OSError) as exc:
+            print(f"[logger_daemon] Lost the logger daemon at {self.address[0]}:{self.address[1]}: {exc}")
+            return None
+        return self._checked(op, reply)
+
+    @staticmethod
+    def _checked(op: str, reply: dict) -> dict | None:
+        if not reply.get("ok"):
+            print(f"[logger_daemon] {op} failed: {reply.get('error')}")
+            return None
+        return reply
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _EngineProxy:
+    """The engine calls a dashboard makes: pause sampling, subscribe to samples."""
+
+    def __init__(self, rig: "RemoteRig"):
+        self._rig = rig
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._rig._request("pause", timeout=timeout)
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback`` with every sample published from now on; returns an unsubscriber.
+
+        Unlike a local engine's subscribers, it runs in the thread calling
+        ``RemoteRig.drain`` (the GUI thread), as samples are read from the ring.
+        """
+        return self._rig._subscribe(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        self._rig._unsubscribe(callback)
+
+
+class RemoteRig:
+    """A daemon-owned rig as seen by a dashboard: same interface as ``Rig``.
+
+    ``drain`` reads new samples straight out of the rig's shared ring into
+    the local live history. It follows session changes made by any attached
+    dashboard through the ring's status words.
+    """
+
+    def __init__(self, client: _DaemonClient, info: dict, history_capacity: int = DEFAULT_HISTORY_CAPACITY):
+        self._client = client
+        self.index = int(info["index"])
+        self.name = info["name"]
+        self.source_name = info["source"]
+        self.ring = SampleRing.attach(info["ring"])
+        self.log_file: Path | None = Path(info["log_file"]) if info.get("log_file") else None
+        self.history = TieredHistory(history_capacity)
+        self.latest: Sample | None = None
+        self.engine = _EngineProxy(self)
+
+        self.interval_ms = int(info["interval_ms"])
+        self.experiment_number: int | None = None
+        self.last_experiment_number: int | None = None
+        self.experiment_id: int | None = None
+        self.experiment_start_ms = 0
+        self.samples_recorded = int(info.get("samples_recorded") or 0)
+        self.skipped = 0
+
+        self._generation = -1
+        # Not recording: only the newest sample matters (for the labels).
+        self._last_seq = max(0, self.ring.write_seq - 1)
+        # (callback, last seq already published when it subscribed)
+        self._subscribers: list[tuple[Subscriber, int]] = []
+        self._subscribers_lock = threading.Lock()
+        self.subscriber_errors = 0
+        self._sync_session()
+
+    def __repr__(self) -> str:
+        return f"RemoteRig({self.name!r}, ring={self.ring.name!r})"
+
+    @property
+    def recording(self) -> bool:
+        return self.experiment_number is not None
+
+    @property
+    def experiment(self) -> str | None:
+        number = self.experiment_number
+        return None if number is None else f"EXP_{number}"
+
+    def _request(self, op: str, **fields) -> dict | None:
+        return self._client.request(op, rig=self.index, **fields)
+
+    # ---------------------------------------------------------------- control
+    def start_monitoring(self) -> None:
+        self._request("start_monitoring")
+
+    def start_experiment(
+        self,
+        number: int,
+        interval_ms: int,
+        start_ms: int,
+        history_capacity: int | None = None,
+        experiment_id: int | None = None,
+    ) -> None:
+        reply = self._request(
+            "start_experiment",
+            number=int(number),
+            interval_ms=int(interval_ms),
+            start_ms=int(start_ms),
+            experiment_id=experiment_id,
+        )
+        if reply is None:
+            return
+        if history_capacity:
+            self.history.resize(history_capacity)
+        self.log_file = None
+        self._sync_session()
+
+    def stop_experiment(self, export: bool = True) -> StoppedExperiment | None:
+        """Stop recording; the daemon starts finishing (and, with ``export``, exporting) it."""
+        self._read_samples()
+        reply = self._request("stop_experiment", export=export)
+        if reply is None:
+            return None
+        self._read_samples()
+        self._sync_session()
+        self.samples_recorded = int(reply["samples_recorded"])
+        if reply["number"] is None:
+            return None
+        return StoppedExperiment(
+            int(reply["number"]),
+            int(reply["start_ms"]),
+            int(reply["stopped_ms"]),
+            int(reply["samples"]),
+            reply["experiment_id"],
+        )
+
+    def finish_experiment(
+        self, stopped: StoppedExperiment, catalog=None, export: bool = True
+    ) -> Path | None:
+        """Wait for the daemon to finish ``stopped``, then complete its catalog entry.
+
+        Whether the sample log is exported was decided by ``stop_experiment``.
+        """
+        reply = self._client.request_alone("finish_experiment", rig=self.index, number=stopped.number)
+        path = Path(reply["log_file"]) if reply and reply.get("log_file") else None
+        finish_catalog_entry(catalog, stopped, path)
+        return path
+
+    def close(self) -> None:
+        """Detach; the daemon (and any experiment it is running) carries on."""
+        self.ring.close()
+
+    # -------------------------------------------------------------- samples
+    def _subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        with self._subscribers_lock:
+            self._subscribers = [*self._subscribers, (callback, self.ring.write_seq)]
+        return lambda: self._unsubscribe(callback)
+
+    def _unsubscribe(self, callback: Subscriber) -> None:
+        with self._subscribers_lock:
+            self._subscribers = [entry for entry in self._subscribers if entry[0] is not callback]
+
+    def _publish(self, sample: Sample) -> None:
+        for callback, after in self._subscribers:
+            if sample.seq <= after:
+                continue  # a refill of samples published before it subscribed
+            try:
+                callback(sample)
+            except Exception as exc:
+                self.subscriber_errors += 1
+                print(f"[logger_daemon] Subscriber {callback!r} failed: {exc}")
+
+    def _sync_session(self) -> None:
+        """Adopt the session the daemon announced in the ring's status words."""
+        status = self.ring.status
+        generation = int(status[shm_ring.GENERATION])
+        if generation == self._generation:
+            return
+        self._generation = generation
+        number = int(status[shm_ring.EXPERIMENT_NUMBER])
+        start_ms = int(status[shm_ring.EXPERIMENT_START_MS])
+        self.interval_ms = int(status[shm_ring.INTERVAL_MS]) or self.interval_ms
+        if not number:
+            if self.experiment_number is not None:
+                self.last_experiment_number = self.experiment_number
+            self.experiment_number = None
+            return
+        if number != self.experiment_number or start_ms != self.experiment_start_ms:
+            # New experiment: refill from its first sample still in the ring.
+            self.history.clear()
+            self.latest = None
+            self._last_seq = int(status[shm_ring.FIRST_SEQ]) - 1
+        self.experiment_number = number
+        self.experiment_start_ms = start_ms
+        experiment_id = int(status[shm_ring.EXPERIMENT_ID])
+        self.experiment_id = None if experiment_id < 0 else experiment_id
+
+    def _read_samples(self) -> int:
+        first, views = self.ring.since(self._last_seq)
+        if first > self._last_seq + 1 and views:
+            self.skipped += first - self._last_seq - 1
+        taken = 0
+        channels = self.ring.channels
+        for view in views:
+            seqs, stamps = view["seq"], view["ms"]
+            columns = [view[name] for name in channels]
+            for row in range(len(view)):
+                values = {name: float(column[row]) for name, column in zip(channels, columns)}
+                ms = int(stamps[row])
+                if self.recording:
+                    self.history.append({"ms": ms, **values})
+                self.latest = Sample(int(seqs[row]), ms, 0.0, values)
+                if self._subscribers:
+                    self._publish(self.latest)
+                taken += 1
+        if taken:
+            self._last_seq = first + taken - 1
+            if not self.ring.still_valid(first):
+                self.skipped += 1
+                print(f"[logger_daemon] {self.name}: fell behind the ring; some samples were skipped")
+        if self.recording:
+            self.samples_recorded = int(self.ring.status[shm_ring.SAMPLES_RECORDED])
+        return taken
+
+    def drain(self) -> int:
+        """Move samples published since the last call into the history (GUI thread)."""
+        self._sync_session()
+        return self._read_samples()
+
+
+def attach_rigs(
+    spec: str | None, history_capacity: int = DEFAULT_HISTORY_CAPACITY, log_dir: Path | str | None = None
+) -> list[RemoteRig]:
+    """Connect to the daemon at ``spec`` (``[host:]port``) and view its rigs.
+
+    ``log_dir`` is where a daemon without ``BPCL_LOGGER_AUTHKEY`` keeps its key.
+    """
+    client = _DaemonClient(parse_address(spec), authkey(log_dir))
+    reply = client.request("describe")
+    if reply is None:
+        client.close()
+        raise ConnectionError("the logger daemon did not describe its rigs")
+    return [RemoteRig(client, info, history_capacity) for info in reply["rigs"]]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from helper.paths import get_project_root
+
+    parser = argparse.ArgumentParser(description="Run the rigs and record their samples in a process of their own.")
+    parser.add_argument("--rigs", default=os.environ.get("BPCL_RIGS") or os.environ.get("BPCL_SENSOR_SOURCE"),
+                        help="rig spec, as BPCL_RIGS (default: one simulator)")
+    parser.add_argument("--address", default=os.environ.get("BPCL_LOGGER_DAEMON"),
+                        help="[host:]port to accept dashboards on (default 127.0.0.1:8766)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_RING_CAPACITY,
+                        help="samples kept per shared-memory ring")
+    args = parser.parse_args(argv)
+    address = parse_address(args.address)
+    try:
+        check_address(address)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    log_dir = get_project_root() / "Logs"
+    daemon = LoggerDaemon(rigs_from_spec(args.rigs, log_dir), args.capacity, log_dir)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    daemon.serve(address)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Date/experiment partitioned column store for experiment records.
+
+The store sits next to the CSV log it mirrors (``Logs/experiment_records.csv``
+is paired with ``Logs/experiment_records_partitions``)::
+
+    _manifest.json
+    2025-11-08/
+        EXP_1/
+            _rows          committed row count (decimal text)
+            ms.i8          epoch milliseconds (int64 min when unknown)
+            time.i4        local seconds since midnight (-1 when unknown)
+            temp_1.f8      one raw little-endian array per numeric column
+            ...
+
+The date and experiment live in the directory names only, so a query prunes
+partitions from the requested date range and experiment numbers before any
+file is opened, and then reads just the column files it needs. Columns are
+plain NumPy arrays, which keeps the format dependency-free and appendable.
+
+Each column file is appended on its own, so ``_rows`` is replaced only once
+every column of a batch is written. Readers stop at that count, and the next
+append first cuts the columns back to it, so a batch torn by an error or a
+crash never leaves the columns misaligned.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from helper import schema
+
+FORMAT_VERSION = 2
+MANIFEST_NAME = "_manifest.json"
+ROWS_NAME = "_rows"
+
+NUMERIC_COLUMNS = schema.NUMERIC_COLUMNS
+_MS_DTYPE = np.dtype("<i8")
+_MS_MISSING = np.iinfo(np.int64).min
+_TIME_DTYPE = np.dtype("<i4")
+_VALUE_DTYPE = np.dtype("<f8")
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_EXP_RE = re.compile(r"\d+")
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _column_file(partition: Path, column: str) -> Path:
+    suffix = {"ms": "i8", "time": "i4"}.get(column, "f8")
+    return partition / f"{column}.{suffix}"
+
+
+def _column_dtype(column: str) -> np.dtype:
+    return {"ms": _MS_DTYPE, "time": _TIME_DTYPE}.get(column, _VALUE_DTYPE)
+
+
+def committed_rows(partition: Path) -> int | None:
+    """Rows every column of ``partition`` holds, or None for stores without ``_rows``."""
+    try:
+        return int((partition / ROWS_NAME).read_text(encoding="ascii"))
+    except (OSError, ValueError):
+        return None
+
+
+def _commit_rows(partition: Path, rows: int) -> None:
+    path = partition / ROWS_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(str(rows), encoding="ascii")
+    os.replace(tmp_path, path)
+
+
+def _column_lengths(partition: Path) -> list[int]:
+    lengths = []
+    for column in ("ms", "time", *NUMERIC_COLUMNS):
+        path = _column_file(partition, column)
+        try:
+            lengths.append(path.stat().st_size // _column_dtype(column).itemsize)
+        except FileNotFoundError:
+            lengths.append(0)
+    return lengths
+
+
+def experiment_dir_name(experiment: str) -> str:
+    """Filesystem-safe directory name for an experiment label."""
+    return _UNSAFE_RE.sub("_", experiment.strip()) or "unknown"
+
+
+def format_seconds(seconds: np.ndarray) -> np.ndarray:
+    """Seconds since midnight -> ``hh:mm:ss`` strings (empty for negatives)."""
+    hours, rest = np.divmod(seconds, 3600)
+    minutes, secs = np.divmod(rest, 60)
+    text = np.char.add(
+        np.char.add(np.char.zfill(hours.astype(str), 2), ":"),
+        np.char.add(
+            np.char.add(np.char.zfill(minutes.astype(str), 2), ":"),
+            np.char.zfill(secs.astype(str), 2),
+        ),
+    )
+    return np.where(seconds >= 0, text, "")
+
+
+def partition_root_for(csv_path: Path | str) -> Path:
+    """Directory holding the partitioned copy of ``csv_path``."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_partitions")
+
+
+def is_ready(root: Path | str) -> bool:
+    """True once the store has been built in this format (the manifest is written last)."""
+    return read_manifest(root).get("format_version") == FORMAT_VERSION
+
+
+def read_manifest(root: Path | str) -> dict:
+    """The store's manifest, or an empty dict when missing or unreadable."""
+    try:
+        return json.loads((Path(root) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def epoch_columns(frame: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """``(ms, time)`` column arrays for CSV-shaped rows, with their missing markers."""
+    ms = schema.epoch_ms(frame)
+    valid = ms.notna().to_numpy()
+    ms_values = np.full(len(ms), _MS_MISSING, dtype=_MS_DTYPE)
+    ms_values[valid] = ms[valid].to_numpy(dtype=np.int64)
+    seconds = np.full(len(ms), -1, dtype=_TIME_DTYPE)
+    seconds[valid] = schema.local_seconds(ms_values[valid])
+    return ms_values, seconds
+
+
+def record_frame(headers: Sequence[str], rows: Iterable[Sequence[object]]) -> pd.DataFrame:
+    """CSV-shaped rows (raw values or text) as a current-schema frame, valid dates only."""
+    frame = pd.DataFrame(list(rows), columns=list(headers))
+    frame = frame.reindex(columns=list(schema.COLUMNS))
+    for column in schema.TEXT_COLUMNS:
+        frame[column] = frame[column].astype("string")
+    return frame[frame["date"].str.match(_DATE_RE.pattern, na=False)]
+
+
+def append_rows(root: Path | str, headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    """Append CSV-shaped rows to their ``(date, experiment)`` partitions.
+
+    Values may be raw (as the record writer passes them) or CSV text.
+    Callers are expected to hold the same lock that guards the CSV log so both
+    stores see rows in the same order.
+    """
+    frame = record_frame(headers, rows)
+    if frame.empty:
+        return
+    root = Path(root)
+    for (day, experiment), group in frame.groupby(["date", "experiment"], sort=False):
+        partition = root / str(day) / experiment_dir_name(str(experiment))
+        partition.mkdir(parents=True, exist_ok=True)
+        committed = committed_rows(partition)
+        if committed is None:
+            committed = min(_column_lengths(partition))
+        columns = dict(zip(("ms", "time"), epoch_columns(group)))
+        for column in NUMERIC_COLUMNS:
+            columns[column] = pd.to_numeric(group[column], errors="coerce").to_numpy(dtype=_VALUE_DTYPE)
+        for column, values in columns.items():
+            with _column_file(partition, column).open("ab") as fh:
+                size = committed * values.dtype.itemsize
+                if os.fstat(fh.fileno()).st_size != size:
+                    fh.truncate(size)  # drop what a torn append left behind
+                fh.write(values.tobytes())
+        _commit_rows(partition, committed + len(group))
+
+
+def rebuild_from_csv(root: Path | str, csv_path: Path | str, chunksize: int = 200_000) -> int:
+    """Recreate the store from the CSV log. Returns the number of rows written."""
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    total = 0
+    csv_path = Path(csv_path)
+    if csv_path.exists() and csv_path.stat().st_size > 0:
+        for chunk in schema.read_csv_typed(csv_path, chunksize=chunksize):
+            headers = list(chunk.columns)
+            append_rows(root, headers, chunk.itertuples(index=False, name=None))
+            total += len(chunk)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "schema_version": schema.SCHEMA_VERSION,
+        "columns": {
+            "ms": _MS_DTYPE.str,
+            "time": _TIME_DTYPE.str,
+            **{c: _VALUE_DTYPE.str for c in NUMERIC_COLUMNS},
+        },
+    }
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return total
+
+
+def select_partitions(
+    root: Path | str, start: date, end: date, experiment_numbers: Iterable[int]
+) -> list[tuple[str, str, Path]]:
+    """Return ``(date, experiment, path)`` for partitions matching the query."""
+    wanted = {int(num) for num in experiment_numbers}
+    selected = []
+    root = Path(root)
+    for day_dir in sorted(root.iterdir()) if root.exists() else ():
+        if not day_dir.is_dir() or not _DATE_RE.match(day_dir.name):
+            continue
+        day = date.fromisoformat(day_dir.name)
+        if not (start <= day <= end):
+            continue
+        for exp_dir in sorted(day_dir.iterdir()):
+            match = _EXP_RE.search(exp_dir.name)
+            if exp_dir.is_dir() and match and int(match.group()) in wanted:
+                selected.append((day_dir.name, exp_dir.name, exp_dir))
+    return selected
+
+
+def map_file(path: Path, dtype: np.dtype) -> np.ndarray:
+    """Read-only memory map of a column file (empty or missing files give an empty array)."""
+    try:
+        count = path.stat().st_size // np.dtype(dtype).itemsize
+    except FileNotFoundError:
+        count = 0
+    if not count:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+def ms_array(values: np.ndarray) -> pd.arrays.IntegerArray:
+    """Stored epoch milliseconds as a nullable Int64 array."""
+    values = np.asarray(values, dtype=np.int64)
+    return pd.arrays.IntegerArray(values, values == _MS_MISSING)
+
+
+def read_partition(partition: Path, columns: Sequence[str] = NUMERIC_COLUMNS) -> dict[str, np.ndarray]:
+    """Map the requested columns of one partition, trimmed to the committed rows.
+
+    The arrays are zero-copy views of the column files; pages are read only
+    when the values are touched.
+    """
+    arrays = {
+        "ms": map_file(_column_file(partition, "ms"), _MS_DTYPE),
+        "time": map_file(_column_file(partition, "time"), _TIME_DTYPE),
+    }
+    for column in columns:
+        arrays[column] = map_file(_column_file(partition, column), _VALUE_DTYPE)
+    rows = min(len(values) for values in arrays.values())
+    committed = committed_rows(partition)
+    if committed is not None:
+        rows = min(rows, committed)
+    return {name: values[:rows] for name, values in arrays.items()}
+
+
+def iter_query(
+    root: Path | str,
+    start: date,
+    end: date,
+    experiment_numbers: Iterable[int],
+    output_columns: Sequence[str],
+    on_step: Callable[[int, int], None] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield one CSV-shaped DataFrame per matching, non-empty partition.
+
+    ``on_step(done, total)`` is called before each partition is read and once
+    at the end; it may raise to abort the query.
+    """
+    selected = select_partitions(root, start, end, experiment_numbers)
+    for done, (day, experiment, partition) in enumerate(selected):
+        if on_step is not None:
+            on_step(done, len(selected))
+        arrays = read_partition(partition)
+        rows = len(arrays["time"])
+        if not rows:
+            continue
+        frame = pd.DataFrame({name: arrays[name] for name in NUMERIC_COLUMNS})
+        frame.insert(0, "experiment", experiment)
+        frame.insert(0, "time", format_seconds(arrays["time"]))
+        frame.insert(0, "date", day)
+        frame["ms"] = ms_array(arrays["ms"])
+        yield frame[list(output_columns)]
+    if on_step is not None:
+        on_step(len(selected), len(selected))
+
+
+def query(
+    root: Path | str,
+    start: date,
+    end: date,
+    experiment_numbers: Iterable[int],
+    output_columns: Sequence[str],
+    on_step: Callable[[int, int], None] | None = None,
+) -> pd.DataFrame:
+    """Read matching partitions into a DataFrame shaped like the CSV log.
+
+    ``on_step`` is passed through to ``iter_query``.
+    """
+    frames = list(iter_query(root, start, end, experiment_numbers, output_columns, on_step))
+    if not frames:
+        return pd.DataFrame(columns=list(output_columns))
+    return pd.concat(frames, ignore_index=True)
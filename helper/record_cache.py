@@ -0,0 +1,290 @@
+"""In-process cache of raw query results, kept per day.
+
+``data_get`` reads raw rows from whichever store is active (SQLite, the
+partitions, or the CSV through its offset index). ``RecordCache`` keeps what
+those reads returned as one frame per ``(day, experiment number)`` pair, so
+a retrieval that only moves its dates or adds an experiment reads just the
+pairs it has not seen yet. Days are evicted least recently used first once
+the memory cap (``BPCL_QUERY_CACHE_MB``, default 256) is exceeded.
+
+The record writer reports every commit (``note_commit``) and only the pairs
+it appended to are dropped, so the day being logged is read again while the
+earlier days stay cached. Rows appended by another process (a logger
+daemon) are caught by the log's size: just the appended tail is scanned for
+the pairs it touched. Any other change to the log (it shrank, was replaced
+or rewritten) drops all of its entries.
+
+Importing this module does not load pandas; only caching a result does.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from helper import schema
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Bookkeeping charged per cached pair, so days without rows still count.
+_PAIR_BYTES = 64
+_EXP_RE = re.compile(r"\d+")
+
+Pair = tuple[str, int]
+
+
+def max_bytes_from_env() -> int:
+    """Memory cap from ``BPCL_QUERY_CACHE_MB`` (default ``DEFAULT_MAX_BYTES``)."""
+    value = (os.environ.get("BPCL_QUERY_CACHE_MB") or "").strip()
+    if not value:
+        return DEFAULT_MAX_BYTES
+    try:
+        return max(0, int(float(value) * 1024 * 1024))
+    except ValueError:
+        print(f"[record_cache] Invalid BPCL_QUERY_CACHE_MB {value!r}; using {DEFAULT_MAX_BYTES // 2**20}")
+        return DEFAULT_MAX_BYTES
+
+
+def log_key(csv_path: Path | str) -> Path:
+    return Path(os.path.abspath(csv_path))
+
+
+def _log_state(path: Path) -> tuple[int, int, int] | None:
+    """``(inode, size, mtime_ns)`` of the log, or None when it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _pair(day: object, experiment: object) -> Pair | None:
+    match = _EXP_RE.search(str(experiment))
+    return (str(day).strip(), int(match.group())) if match else None
+
+
+def _tail_pairs(path: Path, start: int, end: int) -> tuple[set[Pair], int]:
+    """Pairs of the complete rows between bytes ``start`` and ``end``, and where they stop."""
+    with path.open("rb") as handle:
+        handle.seek(start)
+        tail = handle.read(end - start)
+    tail = tail[: tail.rfind(b"\n") + 1]  # a row still being written is read next time
+    pairs = set()
+    for fields in csv.reader(io.StringIO(tail.decode("utf-8", errors="replace"))):
+        pair = _pair(fields[0], fields[2]) if len(fields) >= 3 else None
+        if pair is not None:
+            pairs.add(pair)
+    return pairs, start + len(tail)
+
+
+def _split(frame, pairs: Iterable[Pair]) -> dict:
+    """``frame``'s rows grouped by pair; requested pairs without rows map to None."""
+    pieces = dict.fromkeys(pairs)
+    if frame.empty:
+        return pieces
+    days = frame["date"].astype(str).to_numpy()
+    numbers = schema.experiment_numbers(frame["experiment"])
+    for (day, number), rows in frame.groupby([days, numbers], sort=False):
+        key = (str(day), int(number))
+        if key in pieces:
+            pieces[key] = rows.reset_index(drop=True)
+    return pieces
+
+
+def _size(piece) -> int:
+    return _PAIR_BYTES + (int(piece.memory_usage(deep=True).sum()) if piece is not None else 0)
+
+
+class RecordCache:
+    """Raw query results of record logs, one frame per (day, experiment), evicted by day."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._days: OrderedDict[tuple[Path, str], dict[int, object]] = OrderedDict()
+        self._day_bytes: dict[tuple[Path, str], int] = {}
+        self._logs: dict[Path, tuple[int, int, int]] = {}
+        self._generations: dict[Path, int] = {}
+        self.memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.tail_scans = 0
+        self.refreshes = 0
+        self.last_refresh_ms = 0.0
+        self.total_refresh_ms = 0.0
+
+    # ------------------------------------------------------------- validity
+    def begin(self, csv_path: Path | str) -> int | None:
+        """Catch up with changes made to the log elsewhere; returns its generation.
+
+        The generation is handed back to ``store``, which drops results read
+        while the log changed. None means the log does not exist (nothing is
+        cached for it).
+        """
+        path = log_key(csv_path)
+        current = _log_state(path)
+        with self._lock:
+            state = self._logs.get(path)
+            if current is None:
+                if state is not None:
+                    self._drop_log(path)
+                    del self._logs[path]
+                return None
+            if state is None:
+                self._logs[path] = current
+            elif state != current:
+                inode, size, _ = state
+                if current[0] == inode and current[1] > size:
+                    try:
+                        pairs, scanned = _tail_pairs(path, size, current[1])
+                    except OSError:
+                        self._drop_log(path)
+                        self._logs[path] = current
+                    else:
+                        self.tail_scans += 1
+                        self._invalidate(path, pairs)
+                        self._logs[path] = (inode, scanned, current[2])
+                else:
+                    self._drop_log(path)
+                    self._logs[path] = current
+                self._generations[path] = self._generations.get(path, 0) + 1
+            return self._generations.setdefault(path, 0)
+
+    def note_commit(
+        self, csv_path: Path | str, rows: Sequence[Sequence[object]], span: tuple[int, int]
+    ) -> None:
+        """Drop the pairs of ``rows``, just appended to the log at byte range ``span``.
+
+        Called by the record writer after the stores were updated.
+        """
+        path = log_key(csv_path)
+        with self._lock:
+            state = self._logs.get(path)
+            if state is None:
+                return
+            pairs = {pair for pair in (_pair(row[0], row[2]) for row in rows) if pair is not None}
+            self._invalidate(path, pairs)
+            self._generations[path] = self._generations.get(path, 0) + 1
+            current = _log_state(path)
+            if current is not None and current[0] == state[0] and (state[1], current[1]) == span:
+                self._logs[path] = current  # nothing else changed: no tail to scan
+
+    # -------------------------------------------------------------- entries
+    def lookup(
+        self, csv_path: Path | str, days: Sequence[str], numbers: Sequence[int]
+    ) -> tuple[dict, list[Pair]]:
+        """Cached frames (None: no rows) of the requested pairs, and the pairs missing."""
+        path = log_key(csv_path)
+        found, missing = {}, []
+        with self._lock:
+            for day in days:
+                entry = self._days.get((path, day))
+                if entry is not None:
+                    self._days.move_to_end((path, day))
+                for number in numbers:
+                    if entry is not None and number in entry:
+                        found[(day, number)] = entry[number]
+                        self.hits += 1
+                    else:
+                        missing.append((day, number))
+                        self.misses += 1
+        return found, missing
+
+    def store(
+        self, csv_path: Path | str, generation: int, pairs: Sequence[Pair], frame, elapsed_s: float
+    ) -> dict:
+        """Split ``frame`` (read for ``pairs`` in ``elapsed_s``) into the cache; returns the pieces."""
+        path = log_key(csv_path)
+        pieces = _split(frame, pairs)
+        with self._lock:
+            self.refreshes += 1
+            self.last_refresh_ms = elapsed_s * 1000
+            self.total_refresh_ms += self.last_refresh_ms
+            if self._generations.get(path) != generation:
+                return pieces
+            for (day, number), piece in pieces.items():
+                key = (path, day)
+                entry = self._days.setdefault(key, {})
+                self._days.move_to_end(key)
+                change = _size(piece) - (_size(entry[number]) if number in entry else 0)
+                self._day_bytes[key] = self._day_bytes.get(key, 0) + change
+                self.memory_bytes += change
+                entry[number] = piece
+            self._evict()
+        return pieces
+
+    def _invalidate(self, path: Path, pairs: Iterable[Pair]) -> None:
+        for day, number in pairs:
+            key = (path, day)
+            entry = self._days.get(key)
+            if entry is None or number not in entry:
+                continue
+            size = _size(entry.pop(number))
+            self._day_bytes[key] -= size
+            self.memory_bytes -= size
+            self.invalidations += 1
+            if not entry:
+                del self._days[key]
+                del self._day_bytes[key]
+
+    def _drop_log(self, path: Path) -> None:
+        for key in [key for key in self._days if key[0] == path]:
+            self.invalidations += len(self._days.pop(key))
+            self.memory_bytes -= self._day_bytes.pop(key)
+
+    def _evict(self) -> None:
+        while self.memory_bytes > self.max_bytes and self._days:
+            key, _ = self._days.popitem(last=False)
+            self.memory_bytes -= self._day_bytes.pop(key)
+            self.evictions += 1
+
+    # ---------------------------------------------------------------- admin
+    def configure(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._days.clear()
+            self._day_bytes.clear()
+            self._logs.clear()
+            self.memory_bytes = 0
+            for path in self._generations:
+                self._generations[path] += 1  # results being read now are not kept
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "tail_scans": self.tail_scans,
+                "refreshes": self.refreshes,
+                "last_refresh_ms": round(self.last_refresh_ms, 3),
+                "total_refresh_ms": round(self.total_refresh_ms, 3),
+                "cached_days": len(self._days),
+                "memory_bytes": self.memory_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_CACHE = RecordCache(max_bytes_from_env())
+
+
+def shared_cache() -> RecordCache:
+    """The process-wide cache ``data_get`` reads through and the writer invalidates."""
+    return _CACHE
+
+
+def note_commit(csv_path: Path | str, rows: Sequence[Sequence[object]], span: tuple[int, int]) -> None:
+    _CACHE.note_commit(csv_path, rows, span)
@@ -0,0 +1,68 @@
+"""Counters for the dashboard's fixed-rate render loop.
+
+The frame timer fires at most ``fps`` times per second whatever the sampling
+rate. ``FrameStats`` records how long each drawn frame took, how many
+samples it folded together, and how many frame slots were lost because the
+GUI thread was busy (the gap between two timer ticks spanned more than one
+period).
+"""
+
+from __future__ import annotations
+
+import time
+
+
+class FrameStats:
+    """Frame-time and dropped-frame counters for one render loop."""
+
+    def __init__(self, fps: float):
+        self.period_s = 1.0 / fps
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks = 0
+        self.frames = 0
+        self.idle = 0
+        self.dropped = 0
+        self.samples = 0
+        self.last_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+        self.total_frame_ms = 0.0
+        self._last_tick: float | None = None
+
+    def tick(self, now: float | None = None) -> None:
+        """Account for one timer tick, counting slots skipped since the previous one."""
+        now = time.monotonic() if now is None else now
+        if self._last_tick is not None:
+            missed = round((now - self._last_tick) / self.period_s) - 1
+            if missed > 0:
+                self.dropped += missed
+        self._last_tick = now
+        self.ticks += 1
+
+    def frame(self, duration_s: float, samples: int) -> None:
+        """Record a drawn frame that took ``duration_s`` and consumed ``samples``."""
+        ms = duration_s * 1000
+        self.frames += 1
+        self.samples += samples
+        self.last_frame_ms = ms
+        self.total_frame_ms += ms
+        if ms > self.max_frame_ms:
+            self.max_frame_ms = ms
+
+    def skip(self) -> None:
+        """Record a tick with nothing new to draw."""
+        self.idle += 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "fps_cap": round(1.0 / self.period_s, 3),
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "idle_ticks": self.idle,
+            "dropped_frames": self.dropped,
+            "samples": self.samples,
+            "last_frame_ms": round(self.last_frame_ms, 3),
+            "max_frame_ms": round(self.max_frame_ms, 3),
+            "mean_frame_ms": round(self.total_frame_ms / self.frames, 3) if self.frames else 0.0,
+        }
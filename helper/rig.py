@@ -0,0 +1,285 @@
+"""One acquisition rig: sensor source, sampling engine, live history, session.
+
+Several rigs can run side by side in one process. Each samples its own
+``SensorSource`` on its own ``AcquisitionEngine`` thread and keeps its own
+live ``TieredHistory`` (raw samples plus per-second/per-minute tiers), while every rig's records go to the one shared
+``RecordWriter`` (and therefore the one CSV log and column store). Rows
+from different rigs are told apart by their experiment label, which is why
+experiment numbers are allocated by the caller across all rigs.
+
+Each sample is persisted exactly once, as a record on the shared writer
+(one timestamp, every channel). The per-experiment ``{date}_EXP_n.bin``
+sample log is an export generated from that record store when the
+experiment is finished (or on demand with ``export_experiment``), so the
+two can never disagree.
+
+Stopping is split in two. ``stop_experiment`` only ends sampling and
+recording and returns a ``StoppedExperiment``; ``finish_experiment`` then
+flushes the records, exports the sample log and completes the catalog
+entry. The second part takes as long as the experiment's data does, so
+callers run it off their GUI or control thread.
+
+The engine thread only touches ``pending`` (a deque) and the record queue;
+``drain`` moves pending samples into the history from the GUI thread, so
+the history needs no locking.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from helper.acquisition import AcquisitionEngine, Sample
+from helper.data_insert import flush_experiment_records, record_log_path, submit_experiment_record
+from helper.ring_buffer import TieredHistory
+from helper.sensors import CHANNELS, create_source
+
+# Raw samples kept; longer spans are drawn from the history's aggregate tiers.
+DEFAULT_HISTORY_CAPACITY = 60 * 60 + 1
+
+
+def experiment_label(number: int) -> str:
+    return f"EXP_{number}"
+
+
+def sample_record(sample: Sample, experiment: str) -> dict[str, object]:
+    """The record data_insert expects: raw values plus the epoch-ms timestamp.
+
+    ``date``/``time`` are the local wall-clock text kept for partitioning and
+    auditing; values are formatted only when the CSV row is written.
+    """
+    values = sample.values
+    stamp = datetime.fromtimestamp(sample.ms / 1000)
+    return {
+        "date": stamp.strftime("%Y-%m-%d"),
+        "time": stamp.strftime("%H:%M:%S"),
+        "experiment": experiment,
+        "temp_1": values["temp_1"],
+        "temp_2": values["temp_2"],
+        "weight_1": values["weight_1"],
+        "weight_2": values["weight_2"],
+        "difference": values["weight_1"] - values["weight_2"],
+        "room_temp": values["room_temp"],
+        "ms": int(sample.ms),
+    }
+
+
+@dataclass(frozen=True)
+class StoppedExperiment:
+    """An experiment that stopped recording and is still to be finished."""
+
+    number: int
+    start_ms: int
+    stopped_ms: int
+    samples: int
+    experiment_id: int | None = None
+
+    @property
+    def label(self) -> str:
+        return experiment_label(self.number)
+
+
+def finish_catalog_entry(catalog, stopped: StoppedExperiment, sample_log: Path | None) -> None:
+    """Record ``stopped``'s stop time, sample count and sample log in ``catalog``."""
+    if catalog is None or stopped.experiment_id is None:
+        return
+    try:
+        catalog.finish(
+            stopped.experiment_id,
+            stopped_ms=stopped.stopped_ms,
+            samples=stopped.samples,
+            sample_log=str(sample_log) if sample_log else None,
+        )
+    except Exception as exc:
+        print(f"[rig] Could not complete the catalog entry of {stopped.label}: {exc}")
+
+
+class Rig:
+    """A named sensor source with its own sampling thread and experiment session."""
+
+    def __init__(
+        self,
+        name: str,
+        log_dir: Path | str,
+        *,
+        source: str = "simulator",
+        interval_ms: int = 2000,
+        history_capacity: int = DEFAULT_HISTORY_CAPACITY,
+    ):
+        self.name = name
+        self.log_dir = Path(log_dir)
+        self.source_name = source
+        self.source = create_source(source, walking=lambda: self.recording)
+        self.interval_ms = int(interval_ms)
+        self.history = TieredHistory(history_capacity)
+        self.pending: deque[Sample] = deque()
+        self.latest: Sample | None = None
+
+        self.experiment_number: int | None = None
+        self.last_experiment_number: int | None = None
+        self.experiment_id: int | None = None
+        self.experiment_start_ms = 0
+        self.samples_recorded = 0
+        self.log_file: Path | None = None
+
+        self.engine = AcquisitionEngine(self.source.read, self.interval_ms / 1000)
+        self.engine.subscribe(self.pending.append)
+        self.engine.subscribe(self._record_sample)
+
+    def __repr__(self) -> str:
+        return f"Rig({self.name!r}, source={self.source_name!r})"
+
+    @property
+    def recording(self) -> bool:
+        return self.experiment_number is not None
+
+    @property
+    def experiment(self) -> str | None:
+        number = self.experiment_number
+        return None if number is None else experiment_label(number)
+
+    # ---------------------------------------------------------------- control
+    def start_monitoring(self) -> None:
+        """Sample (and display) without recording."""
+        self.engine.start()
+
+    def start_experiment(
+        self,
+        number: int,
+        interval_ms: int,
+        start_ms: int,
+        history_capacity: int | None = None,
+        experiment_id: int | None = None,
+    ) -> None:
+        """Begin recording ``EXP_<number>``; sampling restarts anchored at the start.
+
+        ``experiment_id`` is the experiment's catalog id, kept for the caller.
+        """
+        self.engine.stop()
+        self.drain()
+        self.source.reset()
+        self.history.clear()
+        if history_capacity:
+            self.history.resize(history_capacity)
+        self.latest = None
+        self.interval_ms = int(interval_ms)
+        self.experiment_start_ms = start_ms
+        self.experiment_id = experiment_id
+        self.samples_recorded = 0
+        self.log_file = None
+        self.experiment_number = number
+        self.engine.set_interval(self.interval_ms / 1000)
+        self.engine.start()
+
+    def stop_experiment(self) -> StoppedExperiment | None:
+        """Stop sampling and recording; returns the experiment that ended, if any.
+
+        Does not wait for a sensor read in progress. Samples taken before the
+        stop are moved into the history first, so the caller can still draw
+        them. Pass the result to ``finish_experiment`` to persist it.
+        """
+        self.engine.stop(timeout=0)
+        self.drain()
+        number, self.experiment_number = self.experiment_number, None
+        if number is None:
+            return None
+        self.last_experiment_number = number
+        return StoppedExperiment(
+            number,
+            int(self.experiment_start_ms),
+            int(time.time() * 1000),
+            self.samples_recorded,
+            self.experiment_id,
+        )
+
+    def finish_experiment(
+        self, stopped: StoppedExperiment, catalog=None, export: bool = True
+    ) -> Path | None:
+        """Flush ``stopped``'s records, export its sample log and complete its catalog entry.
+
+        Slow (it reads the experiment back from the record store), so call it
+        from a worker thread. Returns the sample log's path, or None when it
+        was not exported. The catalog entry is completed even when flushing
+        or exporting fails.
+        """
+        path = None
+        try:
+            flush_experiment_records()
+            if export:
+                path = self.export_experiment(stopped.number, stopped.start_ms)
+        finally:
+            finish_catalog_entry(catalog, stopped, path)
+        return path
+
+    def close(self) -> None:
+        self.engine.stop()
+        self.experiment_number = None
+        self.source.close()
+
+    # -------------------------------------------------------------- samples
+    def drain(self) -> int:
+        """Move samples acquired since the last call into the history (GUI thread).
+
+        Returns how many were taken; samples left over from before the engine
+        was restarted are discarded.
+        """
+        taken = 0
+        while self.pending:
+            sample = self.pending.popleft()
+            if not self.engine.is_current(sample):
+                continue
+            if self.recording:
+                self.history.append({"ms": sample.ms, **sample.values})
+            self.latest = sample
+            taken += 1
+        return taken
+
+    def _record_sample(self, sample: Sample) -> None:
+        """Engine-thread subscriber: queue the sample's one record on the shared writer."""
+        experiment = self.experiment
+        if experiment is None:
+            return
+        if submit_experiment_record(sample_record(sample, experiment)):
+            self.samples_recorded += 1
+
+    # -------------------------------------------------------------- export
+    def export_experiment(
+        self, number: int, start_ms: int, end_ms: int | None = None
+    ) -> Path | None:
+        """Write ``{date}_EXP_<number>.bin`` from the record store; returns its path.
+
+        ``start_ms``/``end_ms`` bound the dates searched (end defaults to now).
+        """
+        from helper import data_get, sample_log
+
+        started = datetime.fromtimestamp(start_ms / 1000)
+        ended = datetime.fromtimestamp(end_ms / 1000) if end_ms is not None else datetime.now()
+        label = experiment_label(number)
+        path = self.log_dir / f"{started:%Y-%m-%d}_{label}{sample_log.SUFFIX}"
+        try:
+            frame = data_get.get_data_by_date_and_experiment(
+                f"{started:%Y-%m-%d}", f"{ended:%Y-%m-%d}", [number], record_log_path()
+            )
+            frame = frame[frame["experiment"] == label]
+            rows = sample_log.write_frame(path, frame, CHANNELS, experiment=label, start_ms=start_ms)
+        except Exception as exc:
+            print(f"[rig] {self.name}: failed to export {path}: {exc}")
+            return None
+        print(f"[rig] {self.name}: exported {rows} records to {path}")
+        return path
+
+
+def rigs_from_spec(spec: str | None, log_dir: Path | str) -> list[Rig]:
+    """Build rigs from ``"source,source,..."`` (one rig per entry; default one simulator).
+
+    Entries may be named: ``"bench-a=simulator,bench-b=modbus-loopback"``.
+    """
+    entries = [part.strip() for part in (spec or "simulator").split(",") if part.strip()]
+    rigs = []
+    for position, entry in enumerate(entries or ["simulator"], start=1):
+        name, _, source = entry.rpartition("=")
+        rigs.append(Rig(name or f"Rig {position}", log_dir, source=source))
+    return rigs
@@ -0,0 +1,238 @@
+"""Fixed-capacity, NumPy-backed history buffer for live dashboard samples.
+
+Every sample is written twice (at ``i`` and ``i + capacity``) into a buffer of
+length ``2 * capacity`` so that the most recent ``n`` samples are always one
+contiguous slice. Appends are O(1) and ``last()`` returns zero-copy views that
+can be handed straight to pyqtgraph.
+
+``TieredHistory`` keeps a short raw ``HistoryBuffer`` plus coarser tiers
+(per-second and per-minute min/max of every channel) that are filled as
+samples arrive, one O(1) update per tier. A view of any time span reads
+from the tier whose bucket width suits it, so drawing a 24 h window costs
+the same as drawing a 60 s one however long the experiment has run.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+HISTORY_COLUMNS = (
+    "ms",
+    "temp_1",
+    "temp_2",
+    "weight_1",
+    "weight_2",
+    "room_temp",
+)
+
+
+class HistoryBuffer:
+    """Ring buffer holding one float64 row per channel."""
+
+    def __init__(self, capacity: int, columns: Sequence[str] = HISTORY_COLUMNS):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.columns = tuple(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self.capacity = int(capacity)
+        self._data = np.full((len(self.columns), 2 * self.capacity), np.nan)
+        self._head = 0  # slot the next sample goes into
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def append(self, sample: Mapping[str, float]) -> None:
+        """Store one sample; channels missing from ``sample`` are stored as NaN."""
+        self.append_row(
+            np.fromiter(
+                (sample.get(name, np.nan) for name in self.columns),
+                dtype=np.float64,
+                count=len(self.columns),
+            )
+        )
+
+    def append_row(self, row: np.ndarray) -> None:
+        """Store one row already laid out in ``columns`` order."""
+        self._data[:, self._head] = row
+        self._data[:, self._head + self.capacity] = row
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def replace_latest(self, row: np.ndarray) -> None:
+        """Overwrite the newest row (e.g. an aggregate bucket still filling up)."""
+        if not self._size:
+            raise IndexError("replace_latest on an empty buffer")
+        slot = (self._head - 1) % self.capacity
+        self._data[:, slot] = row
+        self._data[:, slot + self.capacity] = row
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping as many of the newest samples as fit."""
+        capacity = int(capacity)
+        if capacity == self.capacity:
+            return
+        keep = self.last(capacity).copy()
+        self.capacity = capacity
+        self._data = np.full((len(self.columns), 2 * capacity), np.nan)
+        self._head = 0
+        self._size = 0
+        count = keep.shape[1]
+        if count:
+            self._data[:, :count] = keep
+            self._data[:, capacity:capacity + count] = keep
+            self._head = count % capacity
+            self._size = count
+
+    def last(self, n: int | None = None) -> np.ndarray:
+        """Return a ``(channels, n)`` view of the newest ``n`` samples, oldest first."""
+        count = self._size if n is None else max(0, min(int(n), self._size))
+        end = self._head + self.capacity
+        return self._data[:, end - count:end]
+
+    def column(self, name: str, n: int | None = None) -> np.ndarray:
+        """Return a contiguous view of the newest ``n`` values of one channel."""
+        return self.last(n)[self._index[name]]
+
+    def latest(self, name: str, default: float | None = None) -> float | None:
+        if not self._size:
+            return default
+        return float(self._data[self._index[name], self._head + self.capacity - 1])
+
+
+# Aggregate tiers: name -> (bucket width in ms, buckets kept), finest first.
+DEFAULT_TIERS: dict[str, tuple[int, int]] = {
+    "second": (1000, 60 * 60 + 1),  # one hour
+    "minute": (60_000, 24 * 60 + 1),  # one day
+}
+
+
+class TieredHistory:
+    """Raw samples plus per-bucket min/max tiers, all filled on ``append``.
+
+    Every tier is a ``HistoryBuffer`` whose columns are ``ms`` (bucket start)
+    and ``<channel>.min`` / ``<channel>.max``; the newest bucket is updated in
+    place until a sample lands in the next one. ``series`` picks a tier for
+    the requested span and returns only the rows inside it.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        tiers: Mapping[str, tuple[int, int]] = DEFAULT_TIERS,
+        columns: Sequence[str] = HISTORY_COLUMNS,
+    ):
+        self.raw = HistoryBuffer(capacity, columns)
+        self.channels = tuple(name for name in self.raw.columns if name != "ms")
+        envelope = ["ms"] + [f"{name}.{stat}" for name in self.channels for stat in ("min", "max")]
+        self.widths = {name: int(width) for name, (width, _) in tiers.items()}
+        self.tiers = {name: HistoryBuffer(buckets, envelope) for name, (_, buckets) in tiers.items()}
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    @property
+    def capacity(self) -> int:
+        return self.raw.capacity
+
+    def append(self, sample: Mapping[str, float]) -> None:
+        """Store one sample in the raw buffer and fold it into every tier."""
+        ms = float(sample["ms"])
+        values = np.fromiter(
+            (sample.get(name, np.nan) for name in self.channels), dtype=np.float64, count=len(self.channels)
+        )
+        self.raw.append_row(np.concatenate(([ms], values)))
+        for name, buffer in self.tiers.items():
+            width = self.widths[name]
+            bucket = ms - ms % width
+            if buffer and buffer.latest("ms") == bucket:
+                row = buffer.last(1)[:, 0].copy()
+                row[1::2] = np.fmin(row[1::2], values)
+                row[2::2] = np.fmax(row[2::2], values)
+                buffer.replace_latest(row)
+            else:
+                row = np.empty(1 + 2 * len(values))
+                row[0] = bucket
+                row[1::2] = values
+                row[2::2] = values
+                buffer.append_row(row)
+
+    def clear(self) -> None:
+        self.raw.clear()
+        for buffer in self.tiers.values():
+            buffer.clear()
+
+    def resize(self, capacity: int) -> None:
+        """Change how many raw samples are kept (the tiers keep their size)."""
+        self.raw.resize(capacity)
+
+    def column(self, name: str, n: int | None = None) -> np.ndarray:
+        """Newest ``n`` raw values of one channel (see ``HistoryBuffer.column``)."""
+        return self.raw.column(name, n)
+
+    def latest(self, name: str, default: float | None = None) -> float | None:
+        return self.raw.latest(name, default)
+
+    # ----------------------------------------------------------------- views
+    def _levels(self) -> list[tuple[str, HistoryBuffer, int]]:
+        return [("raw", self.raw, 0)] + [(name, self.tiers[name], self.widths[name]) for name in self.tiers]
+
+    def _cutoff(self, width: int, span_ms: float) -> float:
+        """Oldest row start inside the newest ``span_ms`` for rows ``width`` ms wide."""
+        cutoff = self.raw.latest("ms") - span_ms
+        return cutoff - (width - 1) if width else cutoff  # keep the bucket the cutoff falls into
+
+    def _first_row(self, buffer: HistoryBuffer, width: int, span_ms: float) -> int:
+        """Index (into ``buffer.column("ms")``) of the oldest row inside the span."""
+        return int(np.searchsorted(buffer.column("ms"), self._cutoff(width, span_ms), side="left"))
+
+    def select(self, span_ms: float, max_points: int) -> str:
+        """Level to draw the newest ``span_ms`` from: ``"raw"`` or a tier name.
+
+        The finest level that still holds the whole span in at most
+        ``max_points`` rows; failing that the finest one holding the span,
+        and the coarsest tier when none does.
+        """
+        levels = self._levels()
+        covering = []
+        for name, buffer, width in levels:
+            first = self._first_row(buffer, width, span_ms)
+            # A full buffer whose oldest row is after the cutoff has lost part of the span.
+            if len(buffer) == buffer.capacity and buffer.column("ms")[0] > self._cutoff(width, span_ms):
+                continue
+            if len(buffer) - first <= max_points:
+                return name
+            covering.append(name)
+        return covering[0] if covering else levels[-1][0]
+
+    def series(self, channel: str, span_ms: float, max_points: int) -> tuple[np.ndarray, np.ndarray]:
+        """``(ms, values)`` of ``channel`` over the newest ``span_ms``.
+
+        Raw samples are returned as views into the ring buffer. Tier buckets
+        come back as their min/max envelope (two points per bucket at the
+        bucket start), ready for ``minmax_decimate``.
+        """
+        if not self.raw:
+            empty = np.empty(0)
+            return empty, empty
+        level = self.select(span_ms, max_points)
+        if level == "raw":
+            rows = self.raw.last(len(self.raw) - self._first_row(self.raw, 0, span_ms))
+            return rows[0], rows[self.raw.columns.index(channel)]
+        buffer = self.tiers[level]
+        rows = buffer.last(len(buffer) - self._first_row(buffer, self.widths[level], span_ms))
+        index = 1 + 2 * self.channels.index(channel)
+        return np.repeat(rows[0], 2), rows[index:index + 2].T.ravel()
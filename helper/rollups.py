@@ -0,0 +1,238 @@
+"""Per-minute and per-hour rollups of the experiment record log.
+
+The rollups sit next to the CSV log (``Logs/experiment_records.csv`` is
+paired with ``Logs/experiment_records_rollups``) and use the partition
+layout of helper.partitions, one fixed-size record file per resolution::
+
+    2025-11-08/
+        EXP_1/
+            minute.roll
+            hour.roll
+
+Each record is one time bucket: its start (seconds since midnight), the
+number of rows in it and, for every numeric column, the count of non-NaN
+values, their sum, min, max, first and last. Buckets are kept in time
+order, so appending a batch only rewrites the records from its first
+bucket on (normally just the last one, which is still filling up). This
+happens on the writer thread for every committed batch, so the rollups are
+always as current as the CSV.
+
+``query`` returns CSV-shaped rows (one per bucket, the numeric columns
+holding the bucket mean and ``ms`` the bucket start) plus ``count`` and
+``<column>_min/_max/_first/_last`` columns. It reads the record files through ``np.memmap``, so a month of
+per-hour data is a few hundred records.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from helper import partitions, schema
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "_manifest.json"
+
+# Bucket width in seconds, finest first.
+RESOLUTIONS: dict[str, int] = {"minute": 60, "hour": 3600}
+
+NUMERIC_COLUMNS = schema.NUMERIC_COLUMNS
+_STATS = ("count", "sum", "min", "max", "first", "last")
+
+RECORD_DTYPE = np.dtype(
+    [("bucket", "<i8"), ("rows", "<i8")]
+    + [(f"{column}.{stat}", "<f8") for column in NUMERIC_COLUMNS for stat in _STATS]
+)
+
+
+def rollup_root_for(csv_path: Path | str) -> Path:
+    """Directory holding the rollups of ``csv_path``."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_rollups")
+
+
+def is_ready(root: Path | str) -> bool:
+    """True once the rollups have been built (the manifest is written last)."""
+    return (Path(root) / MANIFEST_NAME).exists()
+
+
+def _rollup_file(partition: Path, resolution: str) -> Path:
+    return partition / f"{resolution}.roll"
+
+
+# ------------------------------------------------------------------ reduction
+def _row_records(seconds: np.ndarray, values: Mapping[str, np.ndarray], width: int) -> np.ndarray:
+    """One single-row record per input row, keyed by its bucket."""
+    records = np.zeros(len(seconds), dtype=RECORD_DTYPE)
+    records["bucket"] = (seconds // width) * width
+    records["rows"] = 1
+    for column in NUMERIC_COLUMNS:
+        v = values[column]
+        valid = ~np.isnan(v)
+        records[f"{column}.count"] = valid
+        records[f"{column}.sum"] = np.where(valid, v, 0.0)
+        for stat in ("min", "max", "first", "last"):
+            records[f"{column}.{stat}"] = v
+    return records
+
+
+def _reduce(records: np.ndarray) -> np.ndarray:
+    """Merge records sharing a bucket; ties keep their order (older first)."""
+    if not len(records):
+        return records
+    records = records[np.argsort(records["bucket"], kind="stable")]
+    buckets, starts = np.unique(records["bucket"], return_index=True)
+    out = np.zeros(len(buckets), dtype=RECORD_DTYPE)
+    out["bucket"] = buckets
+    out["rows"] = np.add.reduceat(records["rows"], starts)
+
+    n = len(records)
+    ends = np.append(starts[1:], n)
+    positions = np.arange(n)
+    for column in NUMERIC_COLUMNS:
+        count = records[f"{column}.count"]
+        valid = count > 0
+        out[f"{column}.count"] = np.add.reduceat(count, starts)
+        out[f"{column}.sum"] = np.add.reduceat(records[f"{column}.sum"], starts)
+        out[f"{column}.min"] = np.fmin.reduceat(records[f"{column}.min"], starts)
+        out[f"{column}.max"] = np.fmax.reduceat(records[f"{column}.max"], starts)
+
+        first_pos = np.minimum.reduceat(np.where(valid, positions, n), starts)
+        last_pos = np.maximum.reduceat(np.where(valid, positions, -1), starts)
+        has_first = first_pos < ends
+        has_last = last_pos >= starts
+        out[f"{column}.first"] = np.where(
+            has_first, records[f"{column}.first"][np.minimum(first_pos, n - 1)], np.nan
+        )
+        out[f"{column}.last"] = np.where(
+            has_last, records[f"{column}.last"][np.maximum(last_pos, 0)], np.nan
+        )
+    return out
+
+
+def _merge_into(path: Path, new: np.ndarray) -> None:
+    """Fold ``new`` (reduced, sorted) into the record file at ``path``."""
+    existing = partitions.map_file(path, RECORD_DTYPE)
+    keep = int(np.searchsorted(existing["bucket"], new["bucket"][0], side="left"))
+    merged = _reduce(np.concatenate([np.array(existing[keep:]), new]))
+    del existing
+    with path.open("r+b" if path.exists() else "wb") as fh:
+        fh.seek(keep * RECORD_DTYPE.itemsize)
+        fh.write(merged.tobytes())
+        fh.truncate()
+
+
+# ---------------------------------------------------------------- ingestion
+def append_rows(root: Path | str, headers: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    """Fold CSV-shaped rows (raw values or text) into the minute and hour rollups.
+
+    Callers are expected to hold the lock that guards the CSV log so batches
+    are applied in log order.
+    """
+    import pandas as pd
+
+    frame = partitions.record_frame(headers, rows)
+    if frame.empty:
+        return
+    root = Path(root)
+    for (day, experiment), group in frame.groupby(["date", "experiment"], sort=False):
+        _, seconds = partitions.epoch_columns(group)
+        ok = seconds >= 0
+        if not ok.any():
+            continue
+        seconds = seconds.astype(np.int64)
+        values = {
+            column: pd.to_numeric(group[column], errors="coerce").to_numpy(dtype=np.float64)[ok]
+            for column in NUMERIC_COLUMNS
+        }
+        partition = root / str(day) / partitions.experiment_dir_name(str(experiment))
+        partition.mkdir(parents=True, exist_ok=True)
+        for resolution, width in RESOLUTIONS.items():
+            _merge_into(_rollup_file(partition, resolution), _reduce(_row_records(seconds[ok], values, width)))
+
+
+def rebuild_from_csv(root: Path | str, csv_path: Path | str, chunksize: int = 200_000) -> int:
+    """Recreate the rollups from the CSV log. Returns the number of rows folded in."""
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    total = 0
+    csv_path = Path(csv_path)
+    if csv_path.exists() and csv_path.stat().st_size > 0:
+        for chunk in schema.read_csv_typed(csv_path, chunksize=chunksize):
+            append_rows(root, list(chunk.columns), chunk.itertuples(index=False, name=None))
+            total += len(chunk)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "resolutions": RESOLUTIONS,
+        "record": RECORD_DTYPE.descr,
+    }
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return total
+
+
+# ------------------------------------------------------------------- queries
+def choose_resolution(span_s: float, max_points: int) -> str:
+    """Coarsest resolution that still puts ``max_points`` buckets across ``span_s``."""
+    chosen = "raw"
+    for resolution, width in RESOLUTIONS.items():
+        if width * max_points <= span_s:
+            chosen = resolution
+    return chosen
+
+
+def query(
+    root: Path | str,
+    start: date,
+    end: date,
+    experiment_numbers: Iterable[int],
+    resolution: str,
+    output_columns: Sequence[str],
+    on_step: Callable[[int, int], None] | None = None,
+):
+    """Read one resolution's buckets into CSV-shaped rows plus the statistics columns.
+
+    ``on_step(done, total)`` is called before each partition is read and once
+    at the end; it may raise to abort the query.
+    """
+    import pandas as pd
+
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of {tuple(RESOLUTIONS)}, got {resolution!r}")
+    extra = ["count"] + [f"{column}_{stat}" for column in NUMERIC_COLUMNS for stat in ("min", "max", "first", "last")]
+    frames = []
+    selected = partitions.select_partitions(root, start, end, experiment_numbers)
+    for done, (day, experiment, partition) in enumerate(selected):
+        if on_step is not None:
+            on_step(done, len(selected))
+        records = partitions.map_file(_rollup_file(partition, resolution), RECORD_DTYPE)
+        if not len(records):
+            continue
+        midnight_ms = int(np.datetime64(day, "ms").astype(np.int64))
+        columns = {
+            "date": day,
+            "time": partitions.format_seconds(records["bucket"]),
+            "experiment": experiment,
+            "ms": schema.local_to_epoch_ms(midnight_ms + np.asarray(records["bucket"]) * 1000),
+            "count": np.asarray(records["rows"]),
+        }
+        for column in NUMERIC_COLUMNS:
+            count = records[f"{column}.count"]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                columns[column] = np.where(count > 0, records[f"{column}.sum"] / count, np.nan)
+            for stat in ("min", "max", "first", "last"):
+                columns[f"{column}_{stat}"] = np.asarray(records[f"{column}.{stat}"])
+        frames.append(pd.DataFrame(columns))
+    if on_step is not None:
+        on_step(len(selected), len(selected))
+    if not frames:
+        return pd.DataFrame(columns=list(output_columns) + extra)
+    return pd.concat(frames, ignore_index=True)[list(output_columns) + extra]
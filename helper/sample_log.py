@@ -0,0 +1,182 @@
+"""Fixed-width binary per-experiment sample log, read back through ``np.memmap``.
+
+Layout (little-endian)::
+
+    header   magic "BPCLSMP\\0", version, header size, record size,
+             channel count, experiment start (epoch ms), experiment label,
+             channel names (16 bytes each), zero padding to a multiple of 64
+    records  fixed-size: ms (int64 epoch milliseconds) + one float64 per channel
+
+Because every record has the same size, opening a log is just mapping it:
+``SampleLog`` costs a header read however long the log is, columns are
+strided views into the mapping and ``between`` finds a time window with a
+binary search, so slices are zero-copy. A trailing record cut short (a copy
+still in progress) is ignored.
+
+Logs are exports of the record store: ``write_frame`` writes one from the
+CSV-shaped rows ``data_get`` returns.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from helper import schema
+
+MAGIC = b"BPCLSMP\0"
+FORMAT_VERSION = 1
+SUFFIX = ".bin"
+
+_PREFIX = struct.Struct("<8sHHHHq32s")
+_NAME_BYTES = 16
+_HEADER_ALIGN = 64
+
+
+class SampleLogError(ValueError):
+    """The file is not a sample log, or not one this version can read."""
+
+
+def record_dtype(channels: Sequence[str]) -> np.dtype:
+    return np.dtype([("ms", "<i8"), *((name, "<f8") for name in channels)])
+
+
+def _header_size(channel_count: int) -> int:
+    size = _PREFIX.size + channel_count * _NAME_BYTES
+    return -(-size // _HEADER_ALIGN) * _HEADER_ALIGN
+
+
+def _encode_header(channels: Sequence[str], start_ms: int, experiment: str) -> bytes:
+    size = _header_size(len(channels))
+    prefix = _PREFIX.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        size,
+        record_dtype(channels).itemsize,
+        len(channels),
+        int(start_ms),
+        experiment.encode("utf-8")[:32],
+    )
+    names = b"".join(name.encode("ascii")[:_NAME_BYTES].ljust(_NAME_BYTES, b"\0") for name in channels)
+    return (prefix + names).ljust(size, b"\0")
+
+
+def read_header(path: Path | str) -> dict[str, object]:
+    """Parse and validate a log header."""
+    with open(path, "rb") as handle:
+        raw = handle.read(_PREFIX.size)
+        if len(raw) < _PREFIX.size:
+            raise SampleLogError(f"{path}: truncated header")
+        magic, version, size, record_size, count, start_ms, experiment = _PREFIX.unpack(raw)
+        if magic != MAGIC:
+            raise SampleLogError(f"{path}: not a sample log")
+        if version != FORMAT_VERSION:
+            raise SampleLogError(f"{path}: unsupported sample log version {version}")
+        names = handle.read(count * _NAME_BYTES)
+    channels = tuple(
+        names[i : i + _NAME_BYTES].rstrip(b"\0").decode("ascii") for i in range(0, len(names), _NAME_BYTES)
+    )
+    dtype = record_dtype(channels)
+    if len(channels) != count or dtype.itemsize != record_size:
+        raise SampleLogError(f"{path}: inconsistent header")
+    return {
+        "header_size": size,
+        "record_size": record_size,
+        "channels": channels,
+        "start_ms": start_ms,
+        "experiment": experiment.rstrip(b"\0").decode("utf-8"),
+        "dtype": dtype,
+    }
+
+
+class SampleLog:
+    """Read-only memory-mapped view of a sample log."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        header = read_header(self.path)
+        self.channels: tuple[str, ...] = header["channels"]
+        self.start_ms: int = header["start_ms"]
+        self.experiment: str = header["experiment"]
+        self.dtype: np.dtype = header["dtype"]
+        count = (self.path.stat().st_size - header["header_size"]) // self.dtype.itemsize
+        if count > 0:
+            self.records = np.memmap(
+                self.path, dtype=self.dtype, mode="r", offset=header["header_size"], shape=(count,)
+            )
+        else:
+            self.records = np.empty(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one field (``"ms"`` or a channel)."""
+        return self.records[name]
+
+    def between(self, start_ms: int | None = None, end_ms: int | None = None) -> np.ndarray:
+        """Zero-copy slice of the records with ``start_ms <= ms < end_ms``."""
+        ms = self.records["ms"]
+        lo = 0 if start_ms is None else int(np.searchsorted(ms, start_ms, side="left"))
+        hi = len(ms) if end_ms is None else int(np.searchsorted(ms, end_ms, side="left"))
+        return self.records[lo:hi]
+
+    def to_frame(self, records: np.ndarray | None = None) -> pd.DataFrame:
+        """Records (all by default) as a DataFrame shaped like the CSV log."""
+        records = self.records if records is None else records
+        ms = np.asarray(records["ms"], dtype=np.int64)
+        local = pd.to_datetime(ms + schema.utc_offset_ms(ms), unit="ms")
+        frame = pd.DataFrame({
+            "date": local.strftime(schema.DATE_FORMAT),
+            "time": local.strftime(schema.TIME_FORMAT),
+            "experiment": self.experiment,
+            "ms": pd.array(ms, dtype="Int64"),
+        })
+        for name in schema.NUMERIC_COLUMNS:
+            if name in self.channels:
+                frame[name] = np.asarray(records[name], dtype=np.float64)
+        if "difference" not in self.channels and {"weight_1", "weight_2"} <= set(self.channels):
+            frame["difference"] = frame["weight_1"] - frame["weight_2"]
+        return schema.conform(frame)[list(schema.COLUMNS)]
+
+
+def write_frame(
+    path: Path | str,
+    frame: pd.DataFrame,
+    channels: Sequence[str],
+    *,
+    experiment: str = "",
+    start_ms: int | None = None,
+) -> int:
+    """Write CSV-shaped rows (``ms`` or ``date``/``time``, plus channels) as a new log.
+
+    Rows without a timestamp are skipped; channels missing from ``frame``
+    are stored as NaN. Returns the number of records written.
+    """
+    channels = tuple(channels)
+    ms = schema.epoch_ms(frame)
+    valid = ms.notna().to_numpy()
+    records = np.empty(int(valid.sum()), dtype=record_dtype(channels))
+    records["ms"] = ms[valid].to_numpy(dtype=np.int64)
+    for name in channels:
+        if name in frame.columns:
+            records[name] = frame[name].to_numpy(dtype=np.float64)[valid]
+        else:
+            records[name] = np.nan
+    if start_ms is None:
+        start_ms = int(records["ms"][0]) if len(records) else 0
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as handle:
+        handle.write(_encode_header(channels, start_ms, experiment))
+        handle.write(records.tobytes())
+    os.replace(tmp, path)
+    return len(records)
+
@@ -0,0 +1,265 @@
+"""Column schema of the experiment record log and its typed load path.
+
+Every reader (data_get, the partition builder and the dashboard's display
+cleaning) goes through these helpers so the CSV is parsed once with declared
+dtypes instead of being inferred and re-coerced:
+
+* ``date`` and ``experiment`` are categoricals (a handful of distinct values
+  repeated millions of times), ``time`` stays text, measurements are float64.
+* dates and times use fixed formats, and are parsed per distinct value.
+* experiment numbers are extracted once per category, not once per row.
+
+Schema versions. The CSV header row is the version header: version 1 logs
+have the nine text/measurement columns below, and version 2 logs
+(``SCHEMA_VERSION``) add ``ms``, the sample's epoch-millisecond timestamp,
+as the last column. The ``date``/``time`` text stays as the partition key
+and for auditing, but ordering and timestamps come from ``ms``, which keeps
+sub-second samples in order. Version 1 columns are a prefix of version 2,
+so positional readers (the offset index) handle both. Readers accept either
+version: ``conform`` derives ``ms`` from the local date/time text of
+version 1 rows.
+
+pandas is imported on first use rather than with the module, so writers
+that only need the column names do not pay for it at startup.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SCHEMA_VERSION = 2
+
+LEGACY_COLUMNS = (
+    "date",
+    "time",
+    "experiment",
+    "temp_1",
+    "temp_2",
+    "weight_1",
+    "weight_2",
+    "difference",
+    "room_temp",
+)
+COLUMNS = (*LEGACY_COLUMNS, "ms")
+TEXT_COLUMNS = ("date", "time", "experiment")
+NUMERIC_COLUMNS = (
+    "temp_1",
+    "temp_2",
+    "weight_1",
+    "weight_2",
+    "difference",
+    "room_temp",
+)
+
+DATE_FORMAT = "%Y-%m-%d"
+TIME_FORMAT = "%H:%M:%S"
+
+CSV_DTYPES: dict[str, Any] = {
+    "date": "category",
+    "time": str,
+    "experiment": "category",
+    **{name: np.float64 for name in NUMERIC_COLUMNS},
+}  # ``ms`` is left to the C parser (int64, or float64 with gaps) and made Int64 by ``conform``
+_TEXT_DTYPES = {name: CSV_DTYPES[name] for name in TEXT_COLUMNS}
+
+_EXP_PATTERN = r"(\d+)"
+
+
+def schema_version(columns) -> int:
+    """Schema version of a log with these header columns."""
+    return 2 if "ms" in columns else 1
+
+
+def read_header(csv_path: Path | str) -> tuple[str, ...]:
+    """Header columns of a CSV log (empty for a missing or empty file)."""
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as handle:
+            return tuple(next(csv.reader(handle), ()))
+    except FileNotFoundError:
+        return ()
+
+
+def read_csv_typed(source, **kwargs) -> pd.DataFrame | Any:
+    """``pd.read_csv`` with the declared schema; extra kwargs pass through.
+
+    Floats are parsed round-trip exact, so values read back from the CSV
+    equal the raw floats that were written. Malformed numeric cells make the
+    C parser reject the float dtype, in which case the file is re-read with
+    text measurements and coerced to NaN. Returns a reader instead of a
+    frame when ``chunksize`` is given.
+    """
+    import pandas as pd
+
+    kwargs.setdefault("float_precision", "round_trip")
+    if kwargs.get("chunksize"):
+        return _TypedChunks(source, kwargs)
+    try:
+        df = pd.read_csv(source, dtype=CSV_DTYPES, **kwargs)
+    except ValueError:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        df = pd.read_csv(source, dtype=_TEXT_DTYPES, **kwargs)
+    return conform(df)
+
+
+class _TypedChunks:
+    """Chunked reader applying the schema to every chunk it yields."""
+
+    def __init__(self, source, kwargs):
+        import pandas as pd
+
+        self._reader = pd.read_csv(source, dtype=_TEXT_DTYPES, **kwargs)
+
+    def __iter__(self):
+        for chunk in self._reader:
+            yield conform(chunk)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._reader.close()
+
+
+def conform(df: pd.DataFrame) -> pd.DataFrame:
+    """Add missing schema columns and coerce the ones present to their dtypes."""
+    import pandas as pd
+
+    for name in TEXT_COLUMNS:
+        if name not in df.columns:
+            df[name] = ""
+        elif name != "time" and not isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].astype("category")
+    for name in NUMERIC_COLUMNS:
+        if name not in df.columns:
+            df[name] = np.nan
+        elif df[name].dtype != np.float64:
+            df[name] = pd.to_numeric(df[name], errors="coerce").astype(np.float64)
+    if "ms" not in df.columns or df["ms"].dtype != "Int64":
+        df["ms"] = epoch_ms(df)
+    return df
+
+
+def _per_category(series: pd.Series, convert) -> pd.Series:
+    """Apply ``convert`` to the distinct values of ``series`` and broadcast back."""
+    import pandas as pd
+
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    categories = convert(pd.Series(series.cat.categories.astype(str)))
+    codes = series.cat.codes.to_numpy()
+    if len(categories):
+        values = categories.to_numpy()[codes]
+    else:
+        values = np.empty(len(codes), dtype=categories.dtype)
+    result = pd.Series(values, index=series.index)
+    if (codes < 0).any():
+        result[codes < 0] = None
+    return result
+
+
+def experiment_numbers(series: pd.Series) -> pd.Series:
+    """Vectorized ``EXP_n`` -> ``n`` (nullable Int64, <NA> when no digits)."""
+    import pandas as pd
+
+    numbers = _per_category(
+        series,
+        lambda cats: pd.to_numeric(cats.str.extract(_EXP_PATTERN, expand=False), errors="coerce"),
+    )
+    return numbers.astype("Float64").astype("Int64")
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """Parse ``yyyy-MM-dd`` values once per distinct date (NaT when invalid)."""
+    import pandas as pd
+
+    parsed = _per_category(
+        series, lambda cats: pd.to_datetime(cats, format=DATE_FORMAT, errors="coerce")
+    )
+    return pd.to_datetime(parsed)
+
+
+def parse_times(series: pd.Series) -> pd.Series:
+    """Parse ``hh:mm:ss`` values into offsets from midnight (NaT when invalid)."""
+    import pandas as pd
+
+    def convert(cats: pd.Series) -> pd.Series:
+        clock = pd.to_datetime(cats, format=TIME_FORMAT, errors="coerce")
+        return clock - clock.dt.normalize()
+
+    return pd.to_timedelta(_per_category(series, convert))
+
+
+def _text_timestamps(df: pd.DataFrame) -> pd.Series:
+    """Combine ``date`` and ``time`` columns without string concatenation."""
+    return parse_dates(df["date"]) + parse_times(df["time"])
+
+
+def epoch_ms(df: pd.DataFrame) -> pd.Series:
+    """Epoch milliseconds per row (nullable Int64).
+
+    Taken from the ``ms`` column where it is set. Rows without it (version 1
+    logs) are derived from their local ``date``/``time`` text.
+    """
+    import pandas as pd
+
+    if "ms" in df.columns:
+        if df["ms"].dtype == np.int64:
+            return df["ms"].astype("Int64")
+        if df["ms"].dtype == "Int64" and not df["ms"].isna().any():
+            return df["ms"]
+        ms = pd.to_numeric(df["ms"], errors="coerce").astype(np.float64).to_numpy(copy=True)
+    else:
+        ms = np.full(len(df), np.nan)
+    missing = np.isnan(ms)
+    if missing.any() and {"date", "time"} <= set(df.columns):
+        local = _text_timestamps(df.loc[missing])
+        valid = local.notna().to_numpy()
+        filled = np.full(len(local), np.nan)
+        filled[valid] = local_to_epoch_ms(local[valid].to_numpy(dtype="datetime64[ms]").astype(np.int64))
+        ms[missing] = filled
+    return pd.Series(ms, index=df.index).round().astype("Int64")
+
+
+def timestamps(df: pd.DataFrame) -> pd.Series:
+    """Local wall-clock timestamps (naive) of each row, from ``epoch_ms``."""
+    import pandas as pd
+
+    ms = epoch_ms(df)
+    valid = ms.notna().to_numpy()
+    local = np.full(len(ms), np.iinfo(np.int64).min, dtype=np.int64)  # NaT
+    values = ms[valid].to_numpy(dtype=np.int64)
+    local[valid] = values + utc_offset_ms(values)
+    return pd.Series(local.view("datetime64[ms]"), index=df.index).astype("datetime64[ns]")
+
+
+def utc_offset_ms(ms: np.ndarray) -> np.ndarray:
+    """Local UTC offset (ms) at each epoch-ms value, looked up once per hour."""
+    hours = np.asarray(ms, dtype=np.int64) // 3_600_000
+    unique, inverse = np.unique(hours, return_inverse=True)
+    offsets = np.array(
+        [datetime.fromtimestamp(hour * 3600).astimezone().utcoffset().total_seconds() * 1000
+         for hour in unique.tolist()],
+        dtype=np.int64,
+    )
+    return offsets[inverse].reshape(hours.shape)
+
+
+def local_to_epoch_ms(naive_ms: np.ndarray) -> np.ndarray:
+    """Local wall-clock milliseconds (naive) -> epoch milliseconds."""
+    naive_ms = np.asarray(naive_ms, dtype=np.int64)
+    return naive_ms - utc_offset_ms(naive_ms)
+
+
+def local_seconds(ms: np.ndarray) -> np.ndarray:
+    """Epoch milliseconds -> local seconds since midnight."""
+    ms = np.asarray(ms, dtype=np.int64)
+    return (ms + utc_offset_ms(ms)) // 1000 % 86_400
@@ -0,0 +1,411 @@
+"""Sensor sources: one driver per channel, polled concurrently.
+
+A ``SensorSource`` maps each dashboard channel (two thermocouples, two load
+cells, room temperature) to a ``ChannelDriver`` and reads all of them in
+parallel on a thread pool, so one slow device adds its own latency to a
+sample instead of the sum of every channel's. A channel that fails, or is
+still busy with an earlier read when the next sample is due, or does not
+answer within ``read_timeout_s``, reports NaN for that sample. Read latency
+is recorded per channel.
+
+Built-in sources (see ``create_source``):
+
+* ``simulator``: the random-walk values the dashboard has always shown.
+* ``modbus-loopback``: the same values served by a simulated Modbus RTU
+  slave over an in-memory serial link with real framing, CRC and line
+  timing, read back through ``ModbusChannel`` drivers. Useful for testing
+  the acquisition path against device-like latency without hardware.
+  Channels on one RS-485 bus share it, so their requests are serialized by
+  the client; channels on separate buses or devices read in parallel.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+import random
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Mapping
+
+CHANNELS = ("temp_1", "temp_2", "weight_1", "weight_2", "room_temp")
+
+
+# ------------------------------------------------------------------ drivers
+class ChannelDriver(abc.ABC):
+    """One physical (or simulated) measurement channel."""
+
+    @abc.abstractmethod
+    def read(self) -> float:
+        """The channel's current value."""
+
+    def reset(self) -> None:
+        """Return to the initial state (called when an experiment starts)."""
+
+    def close(self) -> None:
+        """Release the device."""
+
+
+class ConstantDriver(ChannelDriver):
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def read(self) -> float:
+        return self.value
+
+
+class RandomWalkDriver(ChannelDriver):
+    """Decreases by a random step per read while ``walking()``; rests at ``start`` otherwise."""
+
+    def __init__(
+        self,
+        start: float,
+        min_step: float,
+        max_step: float,
+        walking: Callable[[], bool] = lambda: True,
+    ):
+        self.start = float(start)
+        self.min_step = min_step
+        self.max_step = max_step
+        self.walking = walking
+        self._value: float | None = None
+
+    def reset(self) -> None:
+        self._value = None
+
+    def read(self) -> float:
+        if not self.walking():
+            self._value = None
+            return self.start
+        if self._value is None:
+            self._value = self.start
+        else:
+            self._value -= random.uniform(self.min_step, self.max_step)
+        return self._value
+
+
+# ------------------------------------------------------------------- source
+class ChannelStats:
+    """Read latency and failure counters of one channel."""
+
+    def __init__(self):
+        self.reads = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.busy = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.reads += 1
+        self.last_ms = ms
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "reads": self.reads,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "busy": self.busy,
+            "last_ms": round(self.last_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "mean_ms": round(self.total_ms / self.reads, 3) if self.reads else 0.0,
+        }
+
+
+class SensorSource:
+    """Reads every channel's driver concurrently and returns ``{channel: value}``."""
+
+    def __init__(
+        self,
+        drivers: Mapping[str, ChannelDriver],
+        *,
+        read_timeout_s: float = 1.0,
+        on_reset: Callable[[], None] | None = None,
+        on_close: Callable[[], None] | None = None,
+    ):
+        self.drivers = dict(drivers)
+        self.read_timeout_s = read_timeout_s
+        self._on_reset = on_reset
+        self._on_close = on_close
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, len(self.drivers)), thread_name_prefix="SensorRead"
+        )
+        self._in_flight: dict[str, Future] = {}
+        self._stats = {name: ChannelStats() for name in self.drivers}
+        self._stats_lock = threading.Lock()
+
+    def _timed_read(self, name: str, driver: ChannelDriver) -> float:
+        started = time.perf_counter()
+        try:
+            return float(driver.read())
+        except Exception:
+            with self._stats_lock:
+                self._stats[name].errors += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self._stats[name].record(elapsed_ms)
+
+    def read(self) -> dict[str, float]:
+        values = {name: math.nan for name in self.drivers}
+        started: dict[str, Future] = {}
+        for name, driver in self.drivers.items():
+            previous = self._in_flight.get(name)
+            if previous is not None and not previous.done():
+                with self._stats_lock:
+                    self._stats[name].busy += 1
+                continue
+            started[name] = self._in_flight[name] = self._pool.submit(self._timed_read, name, driver)
+
+        wait(started.values(), timeout=self.read_timeout_s)
+        for name, future in started.items():
+            if not future.done():
+                with self._stats_lock:
+                    self._stats[name].timeouts += 1
+            elif future.exception() is None:
+                values[name] = future.result()
+        return values
+
+    def reset(self) -> None:
+        for driver in self.drivers.values():
+            driver.reset()
+        if self._on_reset is not None:
+            self._on_reset()
+
+    def latency_stats(self) -> dict[str, dict[str, float]]:
+        with self._stats_lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for driver in self.drivers.values():
+            try:
+                driver.close()
+            except Exception as exc:
+                print(f"[sensors] Failed to close driver: {exc}")
+        if self._on_close is not None:
+            self._on_close()
+
+
+# ------------------------------------------------------- Modbus RTU loopback
+def crc16_modbus(payload: bytes) -> int:
+    crc = 0xFFFF
+    for byte in payload:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _frame(payload: bytes) -> bytes:
+    return payload + struct.pack("<H", crc16_modbus(payload))
+
+
+class ModbusError(IOError):
+    """Malformed, unexpected or exception response from a Modbus slave."""
+
+
+class LoopbackSerialPort:
+    """In-memory null-modem cable: bytes written on one end are read on the other.
+
+    Writes take as long as the bytes would on a real line at ``baudrate``
+    (10 bits per byte).
+    """
+
+    def __init__(self, baudrate: int = 19_200):
+        self.baudrate = baudrate
+        self._buffers = (bytearray(), bytearray())
+        self._cond = threading.Condition()
+        self.host = _LoopbackEnd(self, 0)
+        self.device = _LoopbackEnd(self, 1)
+
+
+class _LoopbackEnd:
+    def __init__(self, port: LoopbackSerialPort, side: int):
+        self._port = port
+        self._rx = port._buffers[side]
+        self._tx = port._buffers[1 - side]
+
+    def write(self, data: bytes) -> None:
+        time.sleep(len(data) * 10 / self._port.baudrate)
+        with self._port._cond:
+            self._tx.extend(data)
+            self._port._cond.notify_all()
+
+    def read(self, size: int, timeout: float | None) -> bytes:
+        """Read exactly ``size`` bytes, or fewer if ``timeout`` expires."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._port._cond:
+            while len(self._rx) < size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._port._cond.wait(remaining)
+            data = bytes(self._rx[:size])
+            del self._rx[: len(data)]
+            return data
+
+    def reset_input_buffer(self) -> None:
+        with self._port._cond:
+            self._rx.clear()
+
+
+class ModbusSlaveSimulator:
+    """Modbus RTU slave answering "read holding registers" (0x03) from channel drivers.
+
+    Each channel occupies two registers holding a big-endian signed 32-bit
+    integer equal to ``value * scale``.
+    """
+
+    def __init__(self, port, unit_id: int, registers: Mapping[int, tuple[ChannelDriver, int]]):
+        self.port = port
+        self.unit_id = unit_id
+        self.registers = dict(registers)
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="ModbusSlaveSim", daemon=True)
+
+    def start(self) -> "ModbusSlaveSimulator":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join(1.0)
+
+    def reset(self) -> None:
+        for driver, _ in self.registers.values():
+            driver.reset()
+
+    def _register_values(self, address: int, count: int) -> list[int] | None:
+        words: list[int] = []
+        while len(words) < count:
+            entry = self.registers.get(address + len(words))
+            if entry is None:
+                return None
+            driver, scale = entry
+            raw = int(round(driver.read() * scale))
+            words.extend(struct.unpack(">HH", struct.pack(">i", raw)))
+        return words[:count]
+
+    def _serve(self) -> None:
+        while not self._stopping.is_set():
+            request = self.port.read(8, timeout=0.2)
+            if len(request) < 8:
+                continue
+            if crc16_modbus(request[:6]) != struct.unpack("<H", request[6:])[0]:
+                self.port.reset_input_buffer()
+                continue
+            unit, function, address, count = struct.unpack(">BBHH", request[:6])
+            if unit != self.unit_id:
+                continue
+            words = self._register_values(address, count) if function == 0x03 else None
+            if words is None:
+                code = 0x01 if function != 0x03 else 0x02
+                self.port.write(_frame(struct.pack(">BBB", unit, function | 0x80, code)))
+                continue
+            body = struct.pack(f">BBB{len(words)}H", unit, function, len(words) * 2, *words)
+            self.port.write(_frame(body))
+
+
+class ModbusRtuClient:
+    """Minimal Modbus RTU master; one request on the bus at a time."""
+
+    def __init__(self, port, unit_id: int, timeout_s: float = 0.5):
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout_s = timeout_s
+        self._bus_lock = threading.Lock()
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        request = _frame(struct.pack(">BBHH", self.unit_id, 0x03, address, count))
+        with self._bus_lock:
+            self.port.reset_input_buffer()
+            self.port.write(request)
+            header = self.port.read(3, self.timeout_s)
+            if len(header) < 3:
+                raise ModbusError(f"no response from unit {self.unit_id}")
+            unit, function, size = header
+            if function & 0x80:
+                self.port.read(2, self.timeout_s)  # CRC of the exception frame
+                raise ModbusError(f"unit {unit} exception code {size}")
+            rest = self.port.read(size + 2, self.timeout_s)
+        if len(rest) < size + 2:
+            raise ModbusError("truncated response")
+        frame = header + rest
+        if crc16_modbus(frame[:-2]) != struct.unpack("<H", frame[-2:])[0]:
+            raise ModbusError("CRC mismatch")
+        if unit != self.unit_id or function != 0x03 or size != count * 2:
+            raise ModbusError("unexpected response")
+        return list(struct.unpack(f">{count}H", rest[:size]))
+
+
+class ModbusChannel(ChannelDriver):
+    """Channel read as a scaled signed 32-bit value from two holding registers."""
+
+    def __init__(self, client: ModbusRtuClient, address: int, scale: int):
+        self.client = client
+        self.address = address
+        self.scale = scale
+
+    def read(self) -> float:
+        high, low = self.client.read_holding_registers(self.address, 2)
+        return struct.unpack(">i", struct.pack(">HH", high, low))[0] / self.scale
+
+
+# ---------------------------------------------------------------- factories
+def _simulated_drivers(walking: Callable[[], bool]) -> dict[str, ChannelDriver]:
+    return {
+        "temp_1": ConstantDriver(29.8),
+        "temp_2": ConstantDriver(27.3),
+        "weight_1": RandomWalkDriver(30.15, 0.001, 0.005, walking),
+        "weight_2": RandomWalkDriver(15.18, 0.0005, 0.002, walking),
+        "room_temp": ConstantDriver(0.0),
+    }
+
+
+def simulated_source(walking: Callable[[], bool] = lambda: True, **kwargs) -> SensorSource:
+    """The built-in random-walk simulator."""
+    return SensorSource(_simulated_drivers(walking), **kwargs)
+
+
+def modbus_loopback_source(
+    walking: Callable[[], bool] = lambda: True,
+    *,
+    baudrate: int = 19_200,
+    unit_id: int = 1,
+    scale: int = 10_000,
+    **kwargs,
+) -> SensorSource:
+    """Simulator values served over a loopback Modbus RTU link."""
+    port = LoopbackSerialPort(baudrate)
+    registers = {}
+    channels = {}
+    client = ModbusRtuClient(port.host, unit_id)
+    for offset, (name, driver) in enumerate(_simulated_drivers(walking).items()):
+        address = offset * 2
+        registers[address] = (driver, scale)
+        channels[name] = ModbusChannel(client, address, scale)
+    slave = ModbusSlaveSimulator(port.device, unit_id, registers).start()
+
+    return SensorSource(channels, on_reset=slave.reset, on_close=slave.stop, **kwargs)
+
+
+SOURCES: dict[str, Callable[..., SensorSource]] = {
+    "simulator": simulated_source,
+    "modbus-loopback": modbus_loopback_source,
+}
+
+
+def create_source(name: str = "simulator", **kwargs) -> SensorSource:
+    try:
+        factory = SOURCES[name]
+    except KeyError:
+        raise ValueError(f"unknown sensor source {name!r}; expected one of {sorted(SOURCES)}") from None
+    return factory(**kwargs)
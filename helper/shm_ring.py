@@ -0,0 +1,233 @@
+"""Single-writer sample ring in ``multiprocessing.shared_memory``.
+
+The logger daemon (helper.logger_daemon) publishes every sample of a rig
+into one of these; any number of dashboards attach to it by name and read
+it in place. Layout (little-endian)::
+
+    header   magic "BPCLRNG\\0", version, header size, record size,
+             channel count, capacity, channel names (16 bytes each)
+    status   int64 words: write_seq, heartbeat_ms, generation, experiment
+             number, experiment start ms, experiment id, interval ms,
+             samples recorded, first seq of the experiment
+    records  capacity fixed-size slots: seq, ms (int64), one float64 per
+             channel
+
+Sequence numbers start at 1 and sample ``seq`` lives in slot
+``(seq - 1) % capacity``. The writer fills a slot with its ``seq`` word
+zeroed, sets ``seq`` once the values are in, then advances ``write_seq``,
+so a reader never sees a sample before it is complete. Readers get
+read-only views straight into the segment (``since``); because the writer
+keeps going, a reader that holds a view checks ``still_valid`` afterwards
+to learn whether the oldest sample it used was overwritten meanwhile.
+
+The status words describe the rig's session so a dashboard that attaches
+mid-experiment can pick it up and refill its history from the ring.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Mapping, Sequence
+
+import numpy as np
+
+MAGIC = b"BPCLRNG\0"
+FORMAT_VERSION = 1
+
+_PREFIX = struct.Struct("<8sHHHHq")
+_NAME_BYTES = 16
+_ALIGN = 64
+
+# Status words.
+WRITE_SEQ = 0
+HEARTBEAT_MS = 1
+GENERATION = 2
+EXPERIMENT_NUMBER = 3  # 0 while not recording
+EXPERIMENT_START_MS = 4
+EXPERIMENT_ID = 5  # -1 when the catalog has no entry
+INTERVAL_MS = 6
+SAMPLES_RECORDED = 7
+FIRST_SEQ = 8
+STATUS_WORDS = 16
+
+_STATUS_FIELDS = {
+    "experiment_number": EXPERIMENT_NUMBER,
+    "experiment_start_ms": EXPERIMENT_START_MS,
+    "experiment_id": EXPERIMENT_ID,
+    "interval_ms": INTERVAL_MS,
+    "samples_recorded": SAMPLES_RECORDED,
+    "first_seq": FIRST_SEQ,
+}
+
+
+# Rings created by this process; attaching to one of them must leave its
+# resource-tracker registration (the creator's) alone.
+_created: set[str] = set()
+
+
+class RingError(ValueError):
+    """The segment is not a sample ring, or not one this version can read."""
+
+
+def record_dtype(channels: Sequence[str]) -> np.dtype:
+    return np.dtype([("seq", "<i8"), ("ms", "<i8"), *((name, "<f8") for name in channels)])
+
+
+def _header_size(channel_count: int) -> int:
+    size = _PREFIX.size + channel_count * _NAME_BYTES + STATUS_WORDS * 8
+    return -(-size // _ALIGN) * _ALIGN
+
+
+def _status_offset(channel_count: int) -> int:
+    return _header_size(channel_count) - STATUS_WORDS * 8
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """Attach without registering with the resource tracker.
+
+    Before Python 3.13 every attach is tracked, and the tracker unlinks the
+    segment when the attaching process exits, taking it away from the
+    daemon and every other viewer.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if shm.name in _created:
+        return shm
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class SampleRing:
+    """One rig's ring; ``create`` for the daemon, ``attach`` for viewers."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        raw = bytes(shm.buf[: _PREFIX.size])
+        magic, version, header_size, record_size, count, capacity = _PREFIX.unpack(raw)
+        if magic != MAGIC:
+            raise RingError(f"{shm.name}: not a sample ring")
+        if version != FORMAT_VERSION:
+            raise RingError(f"{shm.name}: unsupported ring version {version}")
+        names = bytes(shm.buf[_PREFIX.size : _PREFIX.size + count * _NAME_BYTES])
+        self.channels = tuple(
+            names[i : i + _NAME_BYTES].rstrip(b"\0").decode("ascii") for i in range(0, len(names), _NAME_BYTES)
+        )
+        self.dtype = record_dtype(self.channels)
+        if self.dtype.itemsize != record_size or header_size != _header_size(count):
+            raise RingError(f"{shm.name}: inconsistent header")
+        self.capacity = int(capacity)
+        self.status = np.ndarray((STATUS_WORDS,), dtype="<i8", buffer=shm.buf, offset=_status_offset(count))
+        self.records = np.ndarray((self.capacity,), dtype=self.dtype, buffer=shm.buf, offset=header_size)
+        if not owner:
+            self.status.flags.writeable = False
+            self.records.flags.writeable = False
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @classmethod
+    def create(cls, name: str, channels: Sequence[str], capacity: int) -> "SampleRing":
+        channels = tuple(channels)
+        if capacity < 2:
+            raise ValueError(f"capacity must be at least 2, got {capacity!r}")
+        header_size = _header_size(len(channels))
+        dtype = record_dtype(channels)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=header_size + capacity * dtype.itemsize)
+        prefix = _PREFIX.pack(MAGIC, FORMAT_VERSION, header_size, dtype.itemsize, len(channels), capacity)
+        names = b"".join(channel.encode("ascii")[:_NAME_BYTES].ljust(_NAME_BYTES, b"\0") for channel in channels)
+        shm.buf[: len(prefix) + len(names)] = prefix + names
+        _created.add(shm.name)
+        ring = cls(shm, owner=True)
+        ring.status[:] = 0
+        ring.status[EXPERIMENT_ID] = -1
+        ring.records["seq"] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "SampleRing":
+        """Read-only view of an existing ring."""
+        return cls(_attach_untracked(name), owner=False)
+
+    def close(self) -> None:
+        """Drop the mapping; the owner also removes the segment."""
+        self.status = self.records = None
+        self._shm.close()
+        if self.owner:
+            _created.discard(self._shm.name)
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------ writer
+    def publish(self, ms: int, values: Mapping[str, float]) -> int:
+        """Append one sample (writer only); returns its sequence number."""
+        seq = int(self.status[WRITE_SEQ]) + 1
+        slot = (seq - 1) % self.capacity
+        records = self.records
+        records["seq"][slot] = 0
+        records["ms"][slot] = ms
+        for name in self.channels:
+            records[name][slot] = values.get(name, np.nan)
+        records["seq"][slot] = seq
+        self.status[WRITE_SEQ] = seq
+        self.status[HEARTBEAT_MS] = int(ms)
+        return seq
+
+    def set_status(self, *, new_session: bool = True, **words: int) -> None:
+        """Update status words by name (writer only).
+
+        With ``new_session`` the generation is bumped last, telling readers
+        the session (experiment, interval) changed.
+        """
+        for key, value in words.items():
+            self.status[_STATUS_FIELDS[key]] = int(value)
+        if new_session:
+            self.status[GENERATION] += 1
+
+    def beat(self) -> None:
+        self.status[HEARTBEAT_MS] = int(time.time() * 1000)
+
+    # ------------------------------------------------------------------ reader
+    @property
+    def write_seq(self) -> int:
+        return int(self.status[WRITE_SEQ])
+
+    def oldest_seq(self, head: int | None = None) -> int:
+        """Oldest sample that is safe to read (the next write may reuse the slot before it)."""
+        head = self.write_seq if head is None else head
+        return max(1, head - self.capacity + 2)
+
+    def since(self, after_seq: int) -> tuple[int, list[np.ndarray]]:
+        """Samples after ``after_seq`` as up to two zero-copy record views, oldest first.
+
+        Returns ``(first_seq, views)``; ``first_seq`` is later than
+        ``after_seq + 1`` when the samples in between were overwritten.
+        """
+        head = self.write_seq
+        first = max(after_seq + 1, self.oldest_seq(head))
+        if first > head:
+            return head + 1, []
+        start = (first - 1) % self.capacity
+        end = (head - 1) % self.capacity + 1
+        if start < end:
+            return first, [self.records[start:end]]
+        return first, [self.records[start:], self.records[:end]]
+
+    def still_valid(self, seq: int) -> bool:
+        """True while sample ``seq`` has not been (and is not being) overwritten."""
+        return seq >= self.oldest_seq()
+
+    def heartbeat_age_s(self) -> float:
+        return max(0.0, time.time() - int(self.status[HEARTBEAT_MS]) / 1000)
@@ -0,0 +1,254 @@
+"""SQLite mirror of the experiment record log (optional storage backend).
+
+Selected with ``BPCL_STORAGE_BACKEND=sqlite`` (see helper.data_insert). The
+database sits next to the CSV log it mirrors (``Logs/experiment_records.csv``
+is paired with ``Logs/experiment_records.sqlite3``) and holds one row per
+record::
+
+    records(id, date, time, experiment, exp_num, ms, temp_1, ..., room_temp)
+
+``ms`` is the epoch-millisecond timestamp (see helper.schema) and
+``exp_num`` the number parsed out of the experiment label once, at insert
+time. ``(date, exp_num)`` is indexed, so a query is an index range scan
+instead of a file scan. The database runs in WAL mode: the writer thread
+commits each batch in one transaction while the GUI reads through its own
+read-only connection without blocking either side.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+from helper import schema
+
+FORMAT_VERSION = 2
+NUMERIC_COLUMNS = schema.NUMERIC_COLUMNS
+
+_COLUMNS = ("date", "time", "experiment", "exp_num", "ms", *NUMERIC_COLUMNS)
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS records (
+    id         INTEGER PRIMARY KEY,
+    date       TEXT NOT NULL,
+    time       TEXT NOT NULL,
+    experiment TEXT NOT NULL,
+    exp_num    INTEGER,
+    ms         INTEGER,
+    {", ".join(f"{name} REAL" for name in NUMERIC_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS records_date_exp ON records (date, exp_num);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+_INSERT = f"INSERT INTO records ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_EXP_RE = re.compile(r"\d+")
+
+# Rows fetched between progress/cancellation checks.
+_FETCH_ROWS = 50_000
+
+
+def db_path_for(csv_path: Path | str) -> Path:
+    """Database mirroring ``csv_path``."""
+    return Path(csv_path).with_suffix(".sqlite3")
+
+
+def connect(path: Path | str) -> sqlite3.Connection:
+    """Open (creating if needed) a read-write connection in WAL mode."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def is_ready(path: Path | str) -> bool:
+    """True once the database has been built from the CSV (marked last)."""
+    path = Path(path)
+    if not path.exists():
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return row is not None and int(row[0]) == FORMAT_VERSION
+
+
+def _float(value: object) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: object) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_params(headers: Sequence[str], row: Sequence[object]) -> tuple | None:
+    record = dict(zip(headers, row))
+    day = str(record.get("date", ""))
+    if not _DATE_RE.match(day):
+        return None
+    experiment = str(record.get("experiment", ""))
+    match = _EXP_RE.search(experiment)
+    return (
+        day,
+        str(record.get("time", "")),
+        experiment,
+        int(match.group()) if match else None,
+        _int(record.get("ms")),
+        *(_float(record.get(name)) for name in NUMERIC_COLUMNS),
+    )
+
+
+def append_rows(conn: sqlite3.Connection, headers: Sequence[str], rows: Iterable[Sequence[object]]) -> int:
+    """Insert CSV-shaped rows (raw values or text) in one transaction. Returns rows inserted."""
+    params = [p for p in (_to_params(headers, row) for row in rows) if p is not None]
+    if params:
+        with conn:
+            conn.executemany(_INSERT, params)
+    return len(params)
+
+
+def rebuild_from_csv(path: Path | str, csv_path: Path | str, chunksize: int = 200_000) -> int:
+    """Recreate the database from the CSV log. Returns the number of rows written."""
+    path = Path(path)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    conn = connect(path)
+    total = 0
+    try:
+        csv_path = Path(csv_path)
+        if csv_path.exists() and csv_path.stat().st_size > 0:
+            for chunk in schema.read_csv_typed(csv_path, chunksize=chunksize):
+                total += append_rows(conn, list(chunk.columns), chunk.itertuples(index=False, name=None))
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('format_version', ?)",
+                (str(FORMAT_VERSION),),
+            )
+    finally:
+        conn.close()
+    return total
+
+
+def _select(
+    conn: sqlite3.Connection, start: date, end: date, numbers: Sequence[int], columns: Sequence[str]
+) -> sqlite3.Cursor:
+    """Open cursor over the matching records, in log order (``columns`` start with ``date``)."""
+    where = f"date BETWEEN ? AND ? AND exp_num IN ({', '.join('?' * len(numbers))})"
+    return conn.execute(
+        f"SELECT {', '.join(columns)} FROM records WHERE {where} ORDER BY date, exp_num, id",
+        (start.isoformat(), end.isoformat(), *numbers),
+    )
+
+
+def _days_done(start: date, block: list[tuple]) -> int:
+    """Days of the query range read completely once ``block`` (rows in date order) is fetched.
+
+    Progress is counted in days rather than rows, so no query has to count
+    its matching rows first.
+    """
+    return (date.fromisoformat(block[-1][0]) - start).days
+
+
+def _to_frame(rows: list[tuple], columns: Sequence[str], output_columns: Sequence[str]):
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(rows, columns=list(columns))
+    for name in NUMERIC_COLUMNS:
+        frame[name] = pd.to_numeric(frame[name], errors="coerce")
+    frame["ms"] = pd.to_numeric(frame["ms"], errors="coerce").astype("Int64")
+    return frame[list(output_columns)]
+
+
+def iter_query(
+    path: Path | str,
+    start: date,
+    end: date,
+    experiment_numbers: Iterable[int],
+    output_columns: Sequence[str],
+    on_step: Callable[[int, int], None] | None = None,
+    chunk_rows: int = _FETCH_ROWS,
+):
+    """Indexed range query yielding CSV-shaped DataFrames of up to ``chunk_rows`` rows.
+
+    ``on_step(done, total)`` is called before each block is fetched and once
+    at the end, counting days of the range; it may raise to abort the query.
+    """
+    numbers = sorted({int(num) for num in experiment_numbers})
+    if not numbers:
+        return
+    columns = ("date", "time", "experiment", "ms", *NUMERIC_COLUMNS)
+    days = (end - start).days + 1
+    conn = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    try:
+        cursor = _select(conn, start, end, numbers, columns)
+        done = 0
+        while True:
+            if on_step is not None:
+                on_step(done, days)
+            block = cursor.fetchmany(max(1, int(chunk_rows)))
+            if not block:
+                break
+            done = _days_done(start, block)
+            yield _to_frame(block, columns, output_columns)
+        if on_step is not None:
+            on_step(days, days)
+    finally:
+        conn.close()
+
+
+def query(
+    path: Path | str,
+    start: date,
+    end: date,
+    experiment_numbers: Iterable[int],
+    output_columns: Sequence[str],
+    on_step: Callable[[int, int], None] | None = None,
+):
+    """Indexed range query returning a DataFrame shaped like the CSV log.
+
+    ``on_step(done, total)`` is called between fetched blocks of rows and
+    once at the end, counting days of the range; it may raise to abort the
+    query.
+    """
+    import pandas as pd
+
+    numbers = sorted({int(num) for num in experiment_numbers})
+    if not numbers:
+        return pd.DataFrame(columns=list(output_columns))
+    columns = ("date", "time", "experiment", "ms", *NUMERIC_COLUMNS)
+
+    days = (end - start).days + 1
+    conn = sqlite3.connect(f"file:{Path(path)}?mode=ro", uri=True)
+    try:
+        cursor = _select(conn, start, end, numbers, columns)
+        rows: list[tuple] = []
+        done = 0
+        while True:
+            if on_step is not None:
+                on_step(done, days)
+            block = cursor.fetchmany(_FETCH_ROWS)
+            if not block:
+                break
+            rows.extend(block)
+            done = _days_done(start, block)
+        if on_step is not None:
+            on_step(days, days)
+    finally:
+        conn.close()
+    return _to_frame(rows, columns, output_columns)
@@ -0,0 +1,41 @@
+"""Wall-clock timing of the dashboard's startup phases.
+
+``source/main.py --profile-startup`` prints the report once the window is
+up and its deferred initialisation has run, then exits. Phases are marked
+in order, so each one's time is the gap since the previous mark; the first
+is measured from ``started``, taken before the heavy imports.
+"""
+
+from __future__ import annotations
+
+import time
+
+
+class StartupProfile:
+    """Ordered ``(phase, seconds)`` marks since a start time."""
+
+    def __init__(self, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """Close ``phase`` now; returns its duration in seconds."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+
+    @property
+    def total_s(self) -> float:
+        return self._last - self.started
+
+    def report(self) -> str:
+        width = max((len(phase) for phase, _ in self.phases), default=5)
+        lines = [f"{'phase':<{width}}  {'ms':>9}  {'cumulative':>10}"]
+        cumulative = 0.0
+        for phase, elapsed in self.phases:
+            cumulative += elapsed
+            lines.append(f"{phase:<{width}}  {elapsed * 1000:9.1f}  {cumulative * 1000:10.1f}")
+        return "\n".join(lines)
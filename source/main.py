@@ -1,22 +1,16 @@
 # In your main PyQt file
 # ... other imports
-from PyQt5.QtGui import QPixmap
-import pyqtgraph as pg
+import time
+
+# Taken before the heavy imports so --profile-startup can time them.
+_STARTUP_STARTED = time.perf_counter()
+
 import sys
 import os
 import re
+import threading
+from datetime import timedelta
 from pathlib import Path
-import pandas as pd
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout,
-    QHBoxLayout, QGridLayout, QComboBox, QLineEdit, QPushButton,
-    QMessageBox, QDateEdit, QSpinBox, QSizePolicy, QLayout, QFrame
-)
-from PyQt5.QtCore import Qt, QTimer, QDateTime, QDate, QTime
-from PyQt5 import QtGui, QtCore
-from PyQt5.QtWidgets import QCalendarWidget
-from PyQt5.QtGui import QPixmap
-import pyqtgraph as pg
 
 # This code ensures that the project's root directory is in the Python import search path (sys.path),
 # so that modules within the project can be imported properly, especially those not in the same directory as this file.
@@ -32,37 +26,76 @@ project_root = _resolve_project_root()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from helper.startup_profile import StartupProfile
+
+startup_profile = StartupProfile(_STARTUP_STARTED)
+
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout,
+    QHBoxLayout, QGridLayout, QComboBox, QLineEdit, QPushButton,
+    QMessageBox, QDateEdit, QSpinBox, QSizePolicy, QLayout, QFrame, QFileDialog
+)
+from PyQt5.QtCore import Qt, QTimer, QDateTime, QDate, QTime
+from PyQt5 import QtGui, QtCore
+from PyQt5.QtWidgets import QCalendarWidget
+from PyQt5.QtGui import QPixmap
+startup_profile.mark("import PyQt5")
+import numpy as np
+import pyqtgraph as pg
+startup_profile.mark("import pyqtgraph")
+
+# pandas and the retrieval code (helper.data_get, helper.schema's parsers) are
+# imported on first use, not here: the live dashboard never needs them.
 from helper.paths import get_project_root
-from helper.data_insert import insert_experiment_record
+from helper.data_insert import (
+    record_log_path,
+    shutdown_record_writer,
+)
+from helper.decimate import minmax_decimate
+from helper.render_stats import FrameStats
+from helper.rig import Rig, rigs_from_spec
+startup_profile.mark("import helpers")
 
 project_root = get_project_root()
-import threading
+
+# Upper bound on dashboard redraws per second, independent of the sampling rate.
+_MAX_RENDER_FPS = 10
+_MIN_INTERVAL_MS = 10
 
 # --- Mocking the 'data' module for file I/O and data simulation ---
 class MockData:
     def __init__(self):
-        self.history = []
-        self.current_exp_file = None
-        self.current_exp_number = 0
         self.log_dir = os.path.join(project_root, "Logs")
+        self.catalog_path = os.path.join(self.log_dir, "experiments.sqlite3")
+        # Written by versions before the catalog; still read so today's numbers are not reused
         self.check_file = os.path.join(self.log_dir, "last_exp.txt")
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
+        self._catalog = None
+
+    @property
+    def catalog(self):
+        """The experiment catalog, opened on first use."""
+        if self._catalog is None:
+            from helper.catalog import ExperimentCatalog
 
-    # --- NEW: File utility to save the last experiment number ---
-    def save_last_experiment(self, exp_num):
-        """Saves the last completed experiment number and date to a file."""
+            self._catalog = ExperimentCatalog(self.catalog_path)
+        return self._catalog
+
+    def close(self):
+        if self._catalog is not None:
+            self._catalog.close()
+            self._catalog = None
+
+    def load_last_experiment(self):
+        """Highest experiment number used today, from the catalog (and a legacy check file)."""
         current_date_str = QDate.currentDate().toString("yyyy-MM-dd")
         try:
-            with open(self.check_file, 'w') as f:
-                f.write(f"{current_date_str},{exp_num}")
+            last = self.catalog.last_number(current_date_str)
         except Exception as e:
-            print(f"Error saving check file: {e}")
+            print(f"Error reading experiment catalog: {e}")
+            last = 0
+        return max(last, self._load_legacy_check_file(current_date_str))
 
-    # --- NEW: File utility to load the last experiment number ---
-    def load_last_experiment(self):
-        """Loads the last experiment number from the file, checking the date."""
-        current_date_str = QDate.currentDate().toString("yyyy-MM-dd")
+    def _load_legacy_check_file(self, current_date_str):
         if os.path.exists(self.check_file):
             try:
                 with open(self.check_file, 'r') as f:
@@ -75,55 +108,6 @@ class MockData:
                 print(f"Error reading or parsing check file: {e}")
         return 0 # Return 0 if file not found, date mismatch, or error
 
-    # Mock data generation (unchanged)
-    def data_send(self, is_running, exp_num):
-        T1, T2 = 29.8, 27.3
-        W1, W2 = 30.15, 15.18
-        
-        if is_running and self.history:
-            import random
-            last_w1, last_w2 = self.history[-1][1], self.history[-1][2]
-            W1 = last_w1 - random.uniform(0.001, 0.005)
-            W2 = last_w2 - random.uniform(0.0005, 0.002)
-            
-            if self.current_exp_file:
-                timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss.zzz")
-                data_line = f"{timestamp},{T1:.2f},{T2:.2f},{W1:.4f},{W2:.4f}\n"
-                self.current_exp_file.write(data_line)
-        
-        if not self.history:
-             W1, W2 = 30.15, 15.18
-
-        self.history.append((QDateTime.currentDateTime().toMSecsSinceEpoch(), W1, W2))
-        return T1, T2, W1, W2, exp_num, 0, 0, self.history
-
-    def start_new_experiment(self, exp_num):
-        self.current_exp_number = exp_num
-        self.history = []
-        
-        if self.current_exp_file:
-            self.current_exp_file.close()
-        
-        file_name = QDate.currentDate().toString("yyyy-MM-dd") + f"_EXP_{exp_num}.txt"
-        full_path = os.path.join(self.log_dir, file_name)
-        
-        try:
-            # Use 'w' mode (write)
-            self.current_exp_file = open(full_path, 'w')
-            self.current_exp_file.write("Timestamp,Temp1(C),Temp2(C),Weight1(kg),Weight2(kg)\n")
-            print(f"✅ Data logging started to: {full_path}")
-        except Exception as e:
-            print(f"❌ ERROR starting file logging: {e}")
-            self.current_exp_file = None
-
-    def stop_experiment(self):
-        if self.current_exp_file:
-            self.current_exp_file.close()
-            self.current_exp_file = None
-            print("🛑 Data logging file closed.")
-            # 🔑 CRITICAL: Save the last experiment number upon STOP
-            self.save_last_experiment(self.current_exp_number)
-
 data = MockData()
 # --- End of Mocking ---
 
@@ -158,21 +142,179 @@ class TimeAxisItem(pg.AxisItem):
         return strings
 
 
+class RetrievalWorker(QtCore.QObject):
+    """Runs one historical query plus display cleaning off the GUI thread.
+
+    Every signal carries the request id so the window can ignore results from
+    queries that were superseded or cancelled in the meantime.
+    """
+    progress = QtCore.pyqtSignal(int, int)          # request id, percent
+    finished = QtCore.pyqtSignal(int, object)       # request id, cleaned DataFrame
+    failed = QtCore.pyqtSignal(int, str)            # request id, message
+    cancelled = QtCore.pyqtSignal(int)              # request id
+
+    def __init__(self, request_id, start_date, end_date, experiment_numbers, prepare, query_options=None):
+        super().__init__()
+        self.request_id = request_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.experiment_numbers = experiment_numbers
+        self._prepare = prepare
+        self._query_options = query_options or {}
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _report(self, fraction):
+        self.progress.emit(self.request_id, int(fraction * 100))
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        from helper.data_get import (
+            QueryCancelled,
+            QueryMemoryLimitExceeded,
+            get_data_by_date_and_experiment,
+        )
+        try:
+            df = get_data_by_date_and_experiment(
+                self.start_date,
+                self.end_date,
+                self.experiment_numbers,
+                progress=self._report,
+                cancel_event=self.cancel_event,
+                **self._query_options,
+            )
+            if self.cancel_event.is_set():
+                raise QueryCancelled()
+            cleaned = self._prepare(df)
+            cleaned.attrs["resolution"] = df.attrs.get("resolution", "raw")
+        except QueryCancelled:
+            self.cancelled.emit(self.request_id)
+            return
+        except QueryMemoryLimitExceeded as exc:
+            self.failed.emit(self.request_id, str(exc))
+            return
+        except Exception as exc:
+            self.failed.emit(self.request_id, f"Retrieval failed: {exc}")
+            return
+        if self.cancel_event.is_set():
+            self.cancelled.emit(self.request_id)
+            return
+        self.finished.emit(self.request_id, (len(df), cleaned))
+
+
+class ExportWorker(QtCore.QObject):
+    """Streams one query's rows from the record store into an export file.
+
+    Rows go from storage to the file chunk by chunk (helper.export), so the
+    result set is never held by the GUI process.
+    """
+    progress = QtCore.pyqtSignal(int)               # percent
+    finished = QtCore.pyqtSignal(int)               # rows written
+    failed = QtCore.pyqtSignal(str)                 # message
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, destination, start_date, end_date, experiment_numbers):
+        super().__init__()
+        self.destination = destination
+        self.start_date = start_date
+        self.end_date = end_date
+        self.experiment_numbers = experiment_numbers
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        from helper.data_get import QueryCancelled
+        from helper.export import ExportError, export_query
+        try:
+            rows = export_query(
+                self.destination,
+                self.start_date,
+                self.end_date,
+                self.experiment_numbers,
+                progress=lambda fraction: self.progress.emit(int(fraction * 100)),
+                cancel_event=self.cancel_event,
+            )
+        except QueryCancelled:
+            self.cancelled.emit()
+            return
+        except ExportError as exc:
+            self.failed.emit(str(exc))
+            return
+        except Exception as exc:
+            self.failed.emit(f"Export failed: {exc}")
+            return
+        self.finished.emit(rows)
+
+
+class ExperimentFinisher(QtCore.QObject):
+    """Finishes a stopped experiment off the GUI thread.
+
+    Flushing its records, exporting its sample log and completing its catalog
+    entry (``Rig.finish_experiment``) take as long as the experiment's data.
+    """
+    finished = QtCore.pyqtSignal(object, object, object)    # rig, stopped experiment, sample log
+    failed = QtCore.pyqtSignal(object, object, str)         # rig, stopped experiment, message
+
+    def __init__(self, rig, stopped, catalog):
+        super().__init__()
+        self.rig = rig
+        self.stopped = stopped
+        self.catalog = catalog
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        try:
+            path = self.rig.finish_experiment(self.stopped, catalog=self.catalog)
+        except Exception as exc:
+            self.failed.emit(self.rig, self.stopped, f"Finishing {self.stopped.label} failed: {exc}")
+            return
+        self.finished.emit(self.rig, self.stopped, path)
+
+
 class FullScreenWindow(QMainWindow):
+    # Emitted once the window has been shown and the deferred startup work ran
+    startup_finished = QtCore.pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("BPCL Real-Time Dashboard")
         self._init_popup_window()
         self._centered_once = False
 
+        # --- Rigs: each samples its own sources; all share one record writer ---
+        # BPCL_RIGS lists one sensor source per rig, e.g. "simulator,modbus-loopback"
+        # or "Bench A=simulator,Bench B=simulator".
+        # BPCL_LOGGER_DAEMON=[host:]port attaches to a running logger daemon
+        # (python -m helper.logger_daemon) instead: it owns sampling and
+        # logging, and this window only views and controls its rigs.
+        self.rigs = self._attach_logger_daemon(os.environ.get("BPCL_LOGGER_DAEMON")) or rigs_from_spec(
+            os.environ.get("BPCL_RIGS") or os.environ.get("BPCL_SENSOR_SOURCE"), data.log_dir
+        )
+        self.active_rig_index = 0
+        self.view_mode = "Single"
+        self._tiles = []
+        startup_profile.mark("window: rigs")
+
         # --- Experiment State Variables ---
-        self.is_running = False
+        # experiment_number is the last number handed out today, across all rigs
         self.experiment_number = 0  
-        self.logging_interval_ms = 2000
-        self.data_interval_ms = 2000 
         self.last_reset_date = QDate.currentDate()
-        self.experiment_start_ms = 0
         self.displaying_history = False
+        self.last_retrieved_data = None
+        self._last_retrieval = None
+        self._plotted_series = None
+        self._retrieval_id = 0
+        self._retrieval_jobs = {}
+        self._retrieval_request = None
+        self._export_job = None
+        self._finish_id = 0
+        self._finish_jobs = {}
+        self._http_api = None
 
         # --- Time Scale Configuration ---
         self.time_scales = {
@@ -181,7 +323,6 @@ class FullScreenWindow(QMainWindow):
             "Hours":    {'range': 24,  'step': 2, 'unit_label': 'hours'},   
         }
         self.current_time_scale = 'Seconds'  
-        self.max_history_points = self._calculate_max_points(self.current_time_scale)
 
         # --- Theme/Layout Setup ---
         self.bg_color = "#0B1120"
@@ -248,24 +389,126 @@ class FullScreenWindow(QMainWindow):
         left_layout.addStretch()
 
         self.chart_widget, self.w1_curve, self.w2_curve = self._create_line_chart_widget()
+        self.tile_widget = self._create_tile_widget()
+        self.tile_widget.hide()
         self.main_grid.addWidget(self.left_column_container, 1, 0, 4, 1, Qt.AlignTop)
         self.main_grid.addWidget(self.chart_widget, 1, 1, 3, 1)
+        self.main_grid.addWidget(self.tile_widget, 1, 1, 3, 1)
         self._setup_footer_area()
         self.main_grid.addWidget(self.footer_container, 5, 0, 1, 2)
+        startup_profile.mark("window: widgets")
 
         # --- Timers (Omitted for brevity) ---
         self.datetime_timer = QTimer(self); self.datetime_timer.timeout.connect(self.update_datetime); self.datetime_timer.start(1000)
         self.update_datetime()
-        self.data_timer = QTimer(self); self.data_timer.timeout.connect(self.update_data); self.data_timer.setInterval(self.data_interval_ms); self.data_timer.start()
         self.daily_reset_timer = QTimer(self); self.daily_reset_timer.timeout.connect(self._check_daily_reset); self.daily_reset_timer.start(30000)
 
-        # 🔑 CRITICAL: Load the last experiment number from the check file on startup
-        self._load_last_experiment_number()
-        
+        # --- Acquisition: every rig samples in its own thread, the GUI is one subscriber ---
+        # Samples pile up in each rig's pending deque and the frame timer draws
+        # whatever arrived since the last frame. Sampling starts in
+        # _finish_startup, once the window is on screen.
+        self.frame_stats = FrameStats(_MAX_RENDER_FPS)
+        self.frame_timer = QTimer(self); self.frame_timer.timeout.connect(self._render_frame)
+        self._startup_done = False
+
         # Initial check to set the experiment number display
-        self.exp_label.setText(f"EXPERIMENT : {self.experiment_number}")
+        self._update_experiment_label()
         QTimer.singleShot(0, self._lock_to_content_minimum_size)
+        startup_profile.mark("window: timers")
 
+    def _finish_startup(self):
+        """Work deferred until the window is visible: sampling and the experiment counter."""
+        if self._startup_done:
+            return
+        self._startup_done = True
+        startup_profile.mark("window: first show")
+        for rig in self.rigs:
+            rig.start_monitoring()
+        self.frame_timer.start(1000 // _MAX_RENDER_FPS)
+
+        # 🔑 CRITICAL: Load the last experiment number from the catalog on startup
+        self._load_last_experiment_number()
+        self._update_experiment_label()
+        self._update_experiment_hint()
+        startup_profile.mark("deferred: sampling + experiment counter")
+
+        # BPCL_HTTP_API=[host:]port serves the live feed and historical
+        # queries to browsers (helper.http_api); off unless set.
+        if os.environ.get("BPCL_HTTP_API"):
+            from helper.http_api import start_from_env
+            self._http_api = start_from_env(self.rigs)
+            startup_profile.mark("deferred: HTTP API")
+        self.startup_finished.emit()
+
+
+    # ================== RIGS ==================
+
+    @property
+    def rig(self):
+        """The rig shown in the labels and main chart, and driven by the controls."""
+        return self.rigs[self.active_rig_index]
+
+    @property
+    def is_running(self):
+        return self.rig.recording
+
+    @property
+    def data_interval_ms(self):
+        return self.rig.interval_ms
+
+    @property
+    def experiment_start_ms(self):
+        return self.rig.experiment_start_ms
+
+    @staticmethod
+    def _attach_logger_daemon(address):
+        """The logger daemon's rigs, or None to sample in this process."""
+        if not address:
+            return None
+        from helper.logger_daemon import attach_rigs
+        try:
+            rigs = attach_rigs(address)
+        except (OSError, ConnectionError, ValueError) as e:
+            print(f"Could not attach to the logger daemon at {address}: {e}; sampling in this process instead.")
+            return None
+        print(f"Attached to the logger daemon at {address}: {', '.join(rig.name for rig in rigs)}")
+        return rigs
+
+    def _rig_prefix(self, rig):
+        return f"{rig.name}: " if len(self.rigs) > 1 else ""
+
+    def _update_experiment_label(self):
+        rig = self.rig
+        number = rig.experiment_number if rig.recording else self.experiment_number
+        self.exp_label.setText(f"{self._rig_prefix(rig)}EXPERIMENT : {number}")
+
+    def _sync_controls_to_rig(self):
+        running = self.rig.recording
+        self.start_button.setEnabled(not running)
+        self.stop_button.setEnabled(running)
+
+    def _handle_rig_change(self, index):
+        if index < 0 or index == self.active_rig_index:
+            return
+        self.active_rig_index = index
+        self._exit_history_mode()
+        self._sync_controls_to_rig()
+        self._update_experiment_label()
+        if self.rig.latest is not None:
+            self.update_data()
+        else:
+            self._clear_plot_items()
+
+    def _handle_view_change(self, index):
+        self.view_mode = self.view_combo.currentText()
+        tiled = self.view_mode == "Tile"
+        self.chart_widget.setVisible(not tiled)
+        self.tile_widget.setVisible(tiled)
+        self._refresh_plot()
+
+    def _close_rigs(self):
+        for rig in self.rigs:
+            rig.close()
 
     def _init_popup_window(self):
         """Start maximized while keeping the frame resizable."""
@@ -292,6 +535,8 @@ class FullScreenWindow(QMainWindow):
         if not self._centered_once:
             self._center_on_screen()
             self._centered_once = True
+            # Let the first paint happen before the deferred startup work
+            QTimer.singleShot(0, self._finish_startup)
 
     def _lock_to_content_minimum_size(self):
         """Prevent shrinking below the size required by the layout contents."""
@@ -301,38 +546,12 @@ class FullScreenWindow(QMainWindow):
 
     def _load_last_experiment_number(self):
         """
-        Loads the last experiment number from the check file. 
-        If the file date is old or file is missing, it resets to 0.
+        Loads today's highest experiment number from the experiment catalog
+        (0 on a new day). The next START EXPERIMENT click allocates the one after it.
         """
-        max_exp_num = data.load_last_experiment()
-            
-        # Set the experiment number to the last completed one.
-        # The next START EXPERIMENT click will increment it.
-        self.experiment_number = max_exp_num
-        if max_exp_num > 0:
-            print(f"Loaded max experiment number for today from check file: {max_exp_num}. Next experiment will be: {self.experiment_number + 1}")
-        else:
-             # Fallback to file scanning if check file is missing/old/error (optional, but robust)
-             self.experiment_number = self._scan_log_directory()
-             print(f"Check file failed. Scanned logs and found max: {self.experiment_number}. Next experiment will be: {self.experiment_number + 1}")
+        self.experiment_number = data.load_last_experiment()
+        print(f"Loaded max experiment number for today from the catalog: {self.experiment_number}. Next experiment will be: {self.experiment_number + 1}")
 
-    def _scan_log_directory(self):
-        """Helper function to scan files if the check file is unavailable/old."""
-        log_dir = data.log_dir
-        current_date_str = QDate.currentDate().toString("yyyy-MM-dd")
-        pattern = re.compile(rf"^{re.escape(current_date_str)}_EXP_(\d+)\.txt$", re.IGNORECASE)
-        max_exp_num = 0
-        try:
-            for filename in os.listdir(log_dir):
-                match = pattern.match(filename)
-                if match:
-                    exp_num = int(match.group(1))
-                    if exp_num > max_exp_num:
-                        max_exp_num = exp_num
-        except FileNotFoundError:
-            pass
-        return max_exp_num
-        
     # ================== DAILY RESET & EXPERIMENT LOGIC ==================
 
     def _check_daily_reset(self, startup=False):
@@ -345,15 +564,14 @@ class FullScreenWindow(QMainWindow):
         
         if (current_date > self.last_reset_date) and (current_time.hour() == 0 and current_time.minute() < 1) and not startup:
             
-            if self.is_running:
-                self._stop_experiment(silent=True)
+            self._stop_all_experiments(silent=True)
             
             self.last_reset_date = current_date
             
             # 🔑 CRITICAL: Reload experiment number for the new day
             self._load_last_experiment_number()
             
-            self.exp_label.setText(f"EXPERIMENT : {self.experiment_number}")
+            self._update_experiment_label()
             print(f"🕛 Daily Reset triggered. Next experiment number loaded: {self.experiment_number + 1}.")
 
 
@@ -379,56 +597,117 @@ class FullScreenWindow(QMainWindow):
             new_interval_ms = int(interval_value * 60 * 1000)
         else:
             new_interval_ms = 2000  # fallback
+        if new_interval_ms < _MIN_INTERVAL_MS:
+            QMessageBox.warning(self, "Invalid Input", f"The interval must be at least {_MIN_INTERVAL_MS} ms.")
+            return
 
         # --- Continue existing logic ---
-        self.experiment_number += 1
-        self.experiment_start_ms = QDateTime.currentDateTime().toMSecsSinceEpoch()
-        self.exp_label.setText(f"Experiment : {self.experiment_number}")
-
-        self.is_running = True
-        self.logging_interval_ms = new_interval_ms
-        self.data_interval_ms = new_interval_ms
-        self.data_timer.setInterval(self.data_interval_ms)
-        self.data_timer.start()
+        # Numbers are shared by all rigs so every rig's rows stay distinct in the log;
+        # the catalog hands out the next one for today and records the start.
+        rig = self.rig
+        start_ms = QDateTime.currentDateTime().toMSecsSinceEpoch()
+        experiment_id = None
+        try:
+            entry = data.catalog.begin(
+                QDate.currentDate().toString("yyyy-MM-dd"),
+                rig=rig.name,
+                source=rig.source_name,
+                interval_ms=new_interval_ms,
+                started_ms=start_ms,
+                record_log=str(record_log_path()),
+                min_number=self.experiment_number,
+            )
+            self.experiment_number, experiment_id = entry.number, entry.id
+        except Exception as e:
+            print(f"Error recording experiment start in the catalog: {e}")
+            self.experiment_number += 1
 
-        data.start_new_experiment(self.experiment_number)
+        # Restart the rig's sampling so its schedule is anchored at the experiment start
+        rig.start_experiment(
+            self.experiment_number, new_interval_ms, start_ms, self._history_capacity(new_interval_ms),
+            experiment_id=experiment_id,
+        )
+        print(f"✅ Data logging started to: {record_log_path()}")
+        self._update_experiment_label()
 
-        self.start_button.setEnabled(False)
-        self.stop_button.setEnabled(True)
+        self._sync_controls_to_rig()
         self.interval_input.setEnabled(True)
         self.interval_unit_combo.setEnabled(True)
 
-        self.max_history_points = self._calculate_max_points(self.current_time_scale)
-        print(f"--- Experiment EXP_{self.experiment_number} STARTED (Interval: {new_interval_ms}ms, Unit: {unit}) ---")
+        print(f"--- {self._rig_prefix(rig)}Experiment EXP_{self.experiment_number} STARTED (Interval: {new_interval_ms}ms, Unit: {unit}) ---")
 
 
 
 
-    def _stop_experiment(self, silent=False):
-        """Stops the logging session."""
-        if not self.is_running:
+    def _stop_experiment(self, silent=False, rig=None):
+        """Stops the logging session of ``rig`` (the active rig by default)."""
+        rig = rig or self.rig
+        if not rig.recording:
             return
-        self._exit_history_mode()
-
-        # 1. Update State and Timer
-        self.is_running = False
-        self.data_timer.stop()
-        
-        # 2. Stop File I/O Logic (This calls data.save_last_experiment internally)
-        data.stop_experiment()
+        if rig is self.rig:
+            self._exit_history_mode()
+            # 1. Stop sampling (without waiting on a sensor read) and draw what already arrived
+            rig.engine.stop(timeout=0)
+            self._render_frame()
+
+        # 2. Stop recording. Flushing the records, exporting the sample log and
+        #    completing the catalog entry run on a worker, so drawing carries on
+        stopped = rig.stop_experiment()
+        number = stopped.number if stopped is not None else None
+        print("🛑 Data logging stopped")
+        if stopped is not None:
+            self._finish_experiment(rig, stopped)
 
         # 3. Update UI (Omitted for brevity)
-        self.start_button.setEnabled(True)
-        self.stop_button.setEnabled(False)
+        self._sync_controls_to_rig()
         self.interval_input.setEnabled(True)
         
         if not silent:
-            print(f"--- Experiment EXP_{self.experiment_number} STOPPED ---")
+            print(f"--- {self._rig_prefix(rig)}Experiment EXP_{number} STOPPED ---")
+
+    def _stop_all_experiments(self, silent=False, local_only=False):
+        for rig in self.rigs:
+            if not local_only or isinstance(rig, Rig):
+                self._stop_experiment(silent=silent, rig=rig)
+
+    def _finish_experiment(self, rig, stopped):
+        """Persist a stopped experiment on an ``ExperimentFinisher`` thread."""
+        self._finish_id += 1
+        job_id = self._finish_id
+        worker = ExperimentFinisher(rig, stopped, data.catalog)
+        thread = QtCore.QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_experiment_finished)
+        worker.failed.connect(self._on_experiment_finish_failed)
+        for signal in (worker.finished, worker.failed):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self._finish_jobs.pop(job_id, None))
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._finish_jobs[job_id] = (thread, worker)
+        thread.start()
+
+    def _shutdown_finishers(self, timeout_ms=60000):
+        """Let stopped experiments finish persisting; they are not cancelled."""
+        for thread, _ in list(self._finish_jobs.values()):
+            thread.quit()
+            thread.wait(timeout_ms)
+
+    def _on_experiment_finished(self, rig, stopped, path):
+        if not rig.recording and rig.last_experiment_number == stopped.number:
+            rig.log_file = path
+        print(f"💾 {self._rig_prefix(rig)}{stopped.label} saved; sample log: {path}")
+        self._update_experiment_hint()
+
+    def _on_experiment_finish_failed(self, rig, stopped, message):
+        print(f"Error: {self._rig_prefix(rig)}{message}")
+        self._update_experiment_hint()
 
     # ================== (Other methods remain unchanged) ==================
 
-    def _calculate_max_points(self, scale_key):
-        data_interval_s = self.data_interval_ms / 1000 
+    def _calculate_max_points(self, scale_key, interval_ms=None):
+        data_interval_s = (interval_ms or self.data_interval_ms) / 1000 
         scale_data = self.time_scales[scale_key]
         range_value = scale_data['range']
         unit_label = scale_data['unit_label']
@@ -442,6 +721,50 @@ class FullScreenWindow(QMainWindow):
             return 30 
         return int(range_s / data_interval_s) + 1
         
+    def _history_capacity(self, interval_ms=None):
+        """Raw samples kept: twice what fills the narrowest time scale, for timing jitter.
+
+        Wider scales are drawn from the rig history's per-second/per-minute tiers.
+        """
+        return 2 * min(self._calculate_max_points(key, interval_ms) for key in self.time_scales)
+
+    def _add_rig_selector_inner(self):
+        widget = QWidget()
+        h_layout = QHBoxLayout(widget)
+        h_layout.setContentsMargins(0, 0, 0, 0)
+        h_layout.setSpacing(10)
+        label = QLabel("Rig:")
+        label.setFont(QtGui.QFont("Segoe UI", 12, QtGui.QFont.Bold))
+        label.setStyleSheet(f"color: {self.fg_color};")
+        h_layout.addWidget(label)
+        self.rig_combo = QComboBox()
+        self.rig_combo.addItems([rig.name for rig in self.rigs])
+        self.view_combo = QComboBox()
+        self.view_combo.addItems(["Single", "Tile"])
+        for combo in (self.rig_combo, self.view_combo):
+            combo.setFont(QtGui.QFont("Segoe UI", 10, QtGui.QFont.Bold))
+            combo.setMinimumHeight(40)
+            combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+            combo.setStyleSheet("""
+                QComboBox {
+                    border: 1px solid #1F2A44;
+                    border-radius: 10px;
+                    padding: 6px 12px;
+                    background-color: #0F172A;
+                    color: #E2E8F0;
+                    font-weight: 600;
+                }
+                QComboBox QAbstractItemView {
+                    background-color: #111B2E;
+                    selection-background-color: #1E293B;
+                    color: #F8FAFC;
+                }
+            """)
+            h_layout.addWidget(combo)
+        self.rig_combo.currentIndexChanged.connect(self._handle_rig_change)
+        self.view_combo.currentIndexChanged.connect(self._handle_view_change)
+        return widget
+
     def _add_time_scale_selector_inner(self):
         widget = QWidget()
         h_layout = QHBoxLayout(widget)
@@ -485,13 +808,29 @@ class FullScreenWindow(QMainWindow):
             return
         self.current_time_scale = new_scale
         scale_data = self.time_scales[new_scale]
-        self.max_history_points = self._calculate_max_points(new_scale)
         self.plot_widget.setXRange(0, scale_data['range'], padding=0.05)
         axis_label = f"Time ({scale_data['unit_label'].capitalize()})"
         label_font = QtGui.QFont("Segoe UI", 14, QtGui.QFont.Bold)
         self.plot_widget.getAxis("bottom").setLabel(text=axis_label, font=label_font, color="#F8FAFC")
         self.x_axis.set_time_unit(scale_data['unit_label'].capitalize())
-        self.update_data()
+        self._refresh_plot()
+
+    def _refresh_plot(self):
+        """Redraw the current view (live or retrieved) without taking a sample."""
+        if self.displaying_history and self.last_retrieved_data is not None:
+            self._plot_dataframe(self.last_retrieved_data)
+            if (
+                self._last_retrieval is not None
+                and self._retrieval_request is None
+                and self._last_retrieval[3] != self._history_resolution()
+            ):
+                # Fetch the resolution the new scale needs; the current data stays up meanwhile
+                self._start_retrieval(*self._last_retrieval[:3], quiet=True)
+            return
+        if self.view_mode == "Tile":
+            self._plot_tiles()
+        if self.is_running and self.rig.history:
+            self._plot_live_history(self.rig.history)
 
     @staticmethod
     def _safe_float(value):
@@ -515,27 +854,16 @@ class FullScreenWindow(QMainWindow):
         if self.displaying_history:
             self.displaying_history = False
 
-    def _prepare_dataframe_for_display(self, df):
+    @staticmethod
+    def _prepare_dataframe_for_display(df):
+        from helper import schema
+
         if df.empty:
             return df
-        clean_df = df.copy()
-        clean_df["date"] = clean_df["date"].astype(str)
-        clean_df["time"] = clean_df["time"].astype(str)
-        clean_df["timestamp"] = pd.to_datetime(
-            clean_df["date"] + " " + clean_df["time"], errors="coerce"
-        )
+        clean_df = schema.conform(df.copy())
+        clean_df["timestamp"] = schema.timestamps(clean_df)
         clean_df = clean_df.dropna(subset=["timestamp"])
-        numeric_cols = [
-            "temp_1",
-            "temp_2",
-            "weight_1",
-            "weight_2",
-            "difference",
-            "room_temp",
-        ]
-        for col in numeric_cols:
-            clean_df[col] = pd.to_numeric(clean_df[col], errors="coerce")
-        clean_df.sort_values("timestamp", inplace=True)
+        clean_df.sort_values("timestamp", inplace=True, kind="stable")
         clean_df.reset_index(drop=True, inplace=True)
         return clean_df
 
@@ -544,20 +872,26 @@ class FullScreenWindow(QMainWindow):
             self._clear_plot_items()
             return
         self._enter_history_mode()
+        if self.view_mode == "Tile":
+            self.view_combo.setCurrentText("Single")
 
         latest = df.iloc[-1]
+        # Rollup rows hold bucket means; the labels show the bucket's last reading
+        def last(column):
+            return latest.get(f"{column}_last", latest.get(column))
+
         experiment_label = latest.get("experiment", "N/A")
         self.exp_label.setText(f"EXPERIMENT : {experiment_label}")
-        self._set_measure_label(self.t1_label, "TEMP -1", latest.get("temp_1"), "C")
-        self._set_measure_label(self.t2_label, "TEMP -2", latest.get("temp_2"), "C")
-        self._set_measure_label(self.w1_label, "WEIGHT -1", latest.get("weight_1"), "kg", precision=4)
-        self._set_measure_label(self.w2_label, "WEIGHT -2", latest.get("weight_2"), "kg", precision=4)
-        self._set_measure_label(self.rt1_label, "ROOM TEMP", latest.get("room_temp"), "C")
-
-        diff_value = latest.get("difference")
-        if pd.isna(diff_value):
-            w1 = self._safe_float(latest.get("weight_1"))
-            w2 = self._safe_float(latest.get("weight_2"))
+        self._set_measure_label(self.t1_label, "TEMP -1", last("temp_1"), "C")
+        self._set_measure_label(self.t2_label, "TEMP -2", last("temp_2"), "C")
+        self._set_measure_label(self.w1_label, "WEIGHT -1", last("weight_1"), "kg", precision=4)
+        self._set_measure_label(self.w2_label, "WEIGHT -2", last("weight_2"), "kg", precision=4)
+        self._set_measure_label(self.rt1_label, "ROOM TEMP", last("room_temp"), "C")
+
+        diff_value = self._safe_float(last("difference"))
+        if diff_value is None or diff_value != diff_value:
+            w1 = self._safe_float(last("weight_1"))
+            w2 = self._safe_float(last("weight_2"))
             diff_value = (w1 - w2) if (w1 is not None and w2 is not None) else None
         self._set_measure_label(self.w_diff_label, "DIFF (W1-W2)", diff_value, "kg", precision=4)
 
@@ -568,23 +902,47 @@ class FullScreenWindow(QMainWindow):
             self._clear_plot_items()
             return
 
-        df_to_plot = df.tail(self.max_history_points).copy()
+        # The last scale-width of time, whatever the rows' spacing (raw or rollup buckets)
+        timestamps = df["timestamp"]
+        cutoff = timestamps.iloc[-1] - timedelta(seconds=self._scale_span_s())
+        first = int(timestamps.searchsorted(cutoff, side="left"))
+        df_to_plot = df.iloc[first:]
         timestamps = df_to_plot["timestamp"]
-        base_ts = timestamps.iloc[0]
-        seconds = (timestamps - base_ts).dt.total_seconds()
-        scale_unit = self.time_scales[self.current_time_scale]["unit_label"]
-        if scale_unit == "minutes":
-            x_data = (seconds / 60).tolist()
-        elif scale_unit == "hours":
-            x_data = (seconds / 3600).tolist()
-        else:
-            x_data = seconds.tolist()
+        seconds = (timestamps - timestamps.iloc[0]).dt.total_seconds()
+        x_data = (seconds * 1000 / self._scale_unit_ms()).to_numpy()
+
+        w1_values = df_to_plot["weight_1"].ffill().bfill().fillna(0.0).to_numpy()
+        w2_values = df_to_plot["weight_2"].ffill().bfill().fillna(0.0).to_numpy()
+        self._set_plot_series(x_data, w1_values, w2_values)
+
+    def _set_plot_series(self, x_data, w1_values, w2_values):
+        """Remember the full-resolution series and draw its decimated form."""
+        self._plotted_series = (x_data, w1_values, w2_values)
+        self._render_plot_series()
 
-        w1_values = df_to_plot["weight_1"].ffill().bfill().fillna(0.0).tolist()
-        w2_values = df_to_plot["weight_2"].ffill().bfill().fillna(0.0).tolist()
-        self.w1_curve.setData(x_data, w1_values)
-        self.w2_curve.setData(x_data, w2_values)
-        self._update_axis_ranges(x_data, w1_values, w2_values)
+    def _plot_buckets(self):
+        """One decimation bucket per horizontal pixel of the plot area."""
+        width = int(self.plot_widget.getPlotItem().getViewBox().width())
+        return width if width > 0 else 1000
+
+    def _render_plot_series(self):
+        if self._plotted_series is None:
+            return
+        x_data, w1_values, w2_values = self._plotted_series
+        buckets = self._plot_buckets()
+        x1, w1 = minmax_decimate(x_data, w1_values, buckets)
+        x2, w2 = minmax_decimate(x_data, w2_values, buckets)
+        self.w1_curve.setData(x1, w1)
+        self.w2_curve.setData(x2, w2)
+        if len(w1) and len(w2):
+            self._update_axis_ranges(x1, w1, w2)
+
+    def _on_plot_resized(self):
+        """Re-decimate for the new width; live views are re-read from the buffer."""
+        if self.is_running and not self.displaying_history:
+            self._plot_live_history(self.rig.history)
+        else:
+            self._render_plot_series()
 
 
     def _setup_control_panel(self):
@@ -597,6 +955,11 @@ class FullScreenWindow(QMainWindow):
         main_layout.setContentsMargins(8, 0, 8, 0)
         main_layout.setSpacing(12)
 
+        # --- Rig / view selector (only shown when several rigs are configured) ---
+        rig_widget = self._add_rig_selector_inner()
+        rig_widget.setVisible(len(self.rigs) > 1)
+        main_layout.addWidget(rig_widget)
+
         # --- Time scale (graph) selector ---
         time_scale_widget = self._add_time_scale_selector_inner()
         main_layout.addWidget(time_scale_widget)
@@ -881,16 +1244,41 @@ class FullScreenWindow(QMainWindow):
         w2_curve = self.plot_widget.plot(name="Weight 2 (W2)", pen=w2_pen, antialias=True)
         for curve in (w1_curve, w2_curve):
             curve.setClipToView(True)
+        self.plot_widget.getPlotItem().getViewBox().sigResized.connect(self._on_plot_resized)
 
         return self.plot_widget, w1_curve, w2_curve
 
     # # ... (inside the FullScreenWindow class) ...
 
+    def _render_frame(self):
+        """Frame timer slot: draw every sample that arrived since the last frame once."""
+        self.frame_stats.tick()
+        taken = sum(rig.drain() for rig in self.rigs)
+        if not taken:
+            self.frame_stats.skip()
+            return
+        started = time.perf_counter()
+        self.update_data()
+        self.frame_stats.frame(time.perf_counter() - started, taken)
+
+    def render_stats(self):
+        """Frame-time / dropped-frame counters of the render loop."""
+        return self.frame_stats.stats()
+
     def update_data(self):
-        """Main data update handler — updates UI, plots, and inserts into DB."""
+        """Redraw labels and plots from the rigs' latest samples and live histories."""
         if self.displaying_history and not self.is_running:
             return
-        T1, T2, W1, W2, exp_num, W4, W5, history = data.data_send(self.is_running, self.experiment_number)
+        if self.view_mode == "Tile":
+            self._plot_tiles()
+        rig = self.rig
+        if rig.latest is None:
+            return
+        history = rig.history
+        values = rig.latest.values
+        T1, T2 = values["temp_1"], values["temp_2"]
+        W1, W2 = values["weight_1"], values["weight_2"]
+        W4 = values["room_temp"]
 
         # ====== 🖥️ UI LABEL UPDATES ======
         self.t1_label.setText(f"TEMP -1 : {T1:.2f} °C")
@@ -903,55 +1291,91 @@ class FullScreenWindow(QMainWindow):
         weight_difference = W1 - W2
         self.w_diff_label.setText(f"DIFF (W1-W2) : {weight_difference:.4f} kg")
 
-        # ====== 🧩 DATABASE INSERTION ======
-        if self.is_running:
-            record = {
-                'date': QDate.currentDate().toString("yyyy-MM-dd"),
-                'time': QTime.currentTime().toString("hh:mm:ss"),
-                'experiment': f'EXP_{self.experiment_number}',
-                'temp_1': f'{T1:.2f}',
-                'temp_2': f'{T2:.2f}',
-                'weight_1': f'{W1:.4f}',
-                'weight_2': f'{W2:.4f}',
-                'difference': f'{weight_difference:.4f}',
-                'room_temp': f'{W4:.2f}'
-            }
-
-            # ✅ Run DB insertion in background thread (no GUI lag)
-            threading.Thread(target=insert_experiment_record, args=(record,), daemon=True).start()
-
         # ====== 📈 GRAPH PLOTTING ======
         if not self.is_running or not history:
             self._clear_plot_items()
             return
+        self._plot_live_history(history)
+
+    def _plot_live_history(self, history):
+        if not history:
+            return
+        # Only the rows of the visible window, from the history tier that suits the scale
+        ms, w1_values, w2_values = self._live_window(history, self._plot_buckets())
+        x_data = (ms - self.experiment_start_ms) / self._scale_unit_ms()
 
-        # Limit data to max history points
-        history_to_plot = history[-self.max_history_points:]
-        timestamps_ms, w1_values, w2_values = zip(*history_to_plot)
+        # Update curves (decimated to the plot width)
+        self._set_plot_series(x_data, w1_values, w2_values)
+
+    def _live_window(self, history, buckets):
+        """``(ms, weight_1, weight_2)`` of the current time scale from a rig history.
+
+        Allows up to ``4 * buckets`` rows, what minmax decimation keeps anyway.
+        """
+        span_ms = self._scale_span_s() * 1000
+        ms, w1_values = history.series("weight_1", span_ms, 4 * buckets)
+        _, w2_values = history.series("weight_2", span_ms, 4 * buckets)
+        return ms, w1_values, w2_values
 
-        # Time scale calculations
-        start_ref_ms = self.experiment_start_ms
-        time_diff_ms = [t_ms - start_ref_ms for t_ms in timestamps_ms]
+    def _scale_unit_ms(self):
         scale_unit = self.time_scales[self.current_time_scale]['unit_label']
+        return {'seconds': 1000, 'minutes': 60000, 'hours': 3600000}.get(scale_unit, 1000)
 
-        if scale_unit == 'seconds':
-            x_data = [t / 1000 for t in time_diff_ms]
-        elif scale_unit == 'minutes':
-            x_data = [t / 60000 for t in time_diff_ms]
-        elif scale_unit == 'hours':
-            x_data = [t / 3600000 for t in time_diff_ms]
-        else:
-            x_data = [t / 1000 for t in time_diff_ms]
+    def _scale_span_s(self):
+        """Width of the current graph time scale in seconds."""
+        return self.time_scales[self.current_time_scale]['range'] * self._scale_unit_ms() / 1000
+
+    def _history_resolution(self):
+        """Coarsest stored resolution that still fills the plot at the current scale."""
+        from helper.rollups import choose_resolution
 
-        # Update curves and focus markers
-        self.w1_curve.setData(x_data, w1_values)
-        self.w2_curve.setData(x_data, w2_values)
-        self._update_focus_points(x_data, w1_values, w2_values)
-        self._update_axis_ranges(x_data, w1_values, w2_values)
-        self._update_axis_ranges(x_data, w1_values, w2_values)
+        return choose_resolution(self._scale_span_s(), self._plot_buckets())
 
-    def _update_axis_ranges(self, x_data, w1_values, w2_values):
-        if not x_data:
+    def _create_tile_widget(self):
+        """One small chart per rig, shown instead of the main chart in Tile view."""
+        widget = QWidget()
+        grid = QGridLayout(widget)
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setSpacing(12)
+        columns = 2 if len(self.rigs) > 1 else 1
+        for position, rig in enumerate(self.rigs):
+            plot = pg.PlotWidget()
+            plot.setMouseEnabled(x=False, y=False)
+            plot.hideButtons()
+            plot.setMenuEnabled(False)
+            plot.setBackground("#0F172A")
+            plot.showGrid(x=True, y=True, alpha=0.1)
+            plot.setTitle(f"<span style='color:#F8FAFC;font-size:12pt;font-weight:600;'>{rig.name}</span>")
+            w1 = plot.plot(pen=pg.mkPen(color="#38BDF8", width=2))
+            w2 = plot.plot(pen=pg.mkPen(color="#F97316", width=2))
+            for curve in (w1, w2):
+                curve.setClipToView(True)
+            grid.addWidget(plot, position // columns, position % columns)
+            self._tiles.append((plot, w1, w2))
+        return widget
+
+    def _plot_tiles(self):
+        unit_ms = self._scale_unit_ms()
+        for rig, (plot, w1_curve, w2_curve) in zip(self.rigs, self._tiles):
+            history = rig.history
+            if not (rig.recording and history):
+                w1_curve.setData([], [])
+                w2_curve.setData([], [])
+                continue
+            width = int(plot.getPlotItem().getViewBox().width())
+            buckets = width if width > 0 else 500
+            ms, w1_values, w2_values = self._live_window(history, buckets)
+            x_data = (ms - rig.experiment_start_ms) / unit_ms
+            x1, w1 = minmax_decimate(x_data, w1_values, buckets)
+            x2, w2 = minmax_decimate(x_data, w2_values, buckets)
+            w1_curve.setData(x1, w1)
+            w2_curve.setData(x2, w2)
+            if len(w1) and len(w2):
+                self._update_axis_ranges(x1, w1, w2, plot)
+
+    def _update_axis_ranges(self, x_data, w1_values, w2_values, plot_widget=None):
+        plot_widget = plot_widget or self.plot_widget
+        if len(x_data) == 0:
             return
         latest_x = x_data[-1]
         window = self.time_scales[self.current_time_scale]["range"]
@@ -961,20 +1385,20 @@ class FullScreenWindow(QMainWindow):
         else:
             start = 0
             end = window
-        self.plot_widget.setXRange(start, end, padding=0)
+        plot_widget.setXRange(start, end, padding=0)
 
-        combined = list(w1_values) + list(w2_values)
-        ymin = min(combined)
-        ymax = max(combined)
+        ymin = float(min(np.nanmin(w1_values), np.nanmin(w2_values)))
+        ymax = float(max(np.nanmax(w1_values), np.nanmax(w2_values)))
         span = max(0.2, ymax - ymin)
         padding = span * 0.1
         lower = max(0, ymin - padding)
         upper = ymax + padding
         if lower == upper:
             upper = lower + 1
-        self.plot_widget.setYRange(lower, upper, padding=0)
+        plot_widget.setYRange(lower, upper, padding=0)
 
     def _clear_plot_items(self):
+        self._plotted_series = None
         self.w1_curve.setData([], [])
         self.w2_curve.setData([], [])
 
@@ -983,10 +1407,11 @@ class FullScreenWindow(QMainWindow):
         if self.is_running:
             self._stop_experiment(silent=True)
 
+        self._cancel_retrieval()
         self._exit_history_mode()
         self.last_retrieved_data = None
 
-        self.exp_label.setText(f"EXPERIMENT : {self.experiment_number}")
+        self._update_experiment_label()
         self._set_measure_label(self.t1_label, "TEMP -1", None, "C")
         self._set_measure_label(self.t2_label, "TEMP -2", None, "C")
         self._set_measure_label(self.w1_label, "WEIGHT -1", None, "kg")
@@ -1001,8 +1426,8 @@ class FullScreenWindow(QMainWindow):
         self.interval_input.setEnabled(True)
         self.interval_unit_combo.setEnabled(True)
 
-        if hasattr(data, "history") and isinstance(getattr(data, "history"), list):
-            data.history.clear()
+        self.rig.history.clear()
+        self.rig.latest = None
 
 
 
@@ -1107,6 +1532,8 @@ class FullScreenWindow(QMainWindow):
             QCalendarWidget QSpinBox { color: #E2E8F0; }
         """)
         self.end_date_edit.setCalendarWidget(calendar_end)
+        self.start_date_edit.dateChanged.connect(self._update_experiment_hint)
+        self.end_date_edit.dateChanged.connect(self._update_experiment_hint)
         end_row.addWidget(self.end_date_edit)
         end_row.addStretch()
         main_layout.addLayout(end_row)
@@ -1150,35 +1577,161 @@ class FullScreenWindow(QMainWindow):
         self.get_data_button.clicked.connect(self.retrieve_historical_data)
         main_layout.addWidget(self.get_data_button)
 
+        # --- Export Button (click again to cancel a running export) ---
+        self.export_button = QPushButton("Export Data...")
+        self.export_button.setStyleSheet("""
+            QPushButton {background-color: #0F172A; color: #E2E8F0; border: 1px solid #F97316; border-radius: 12px; padding: 10px 20px; font-weight: 600;}
+            QPushButton:hover {background-color: #1E293B;}
+        """)
+        self.export_button.setMinimumHeight(40)
+        self.export_button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.export_button.clicked.connect(self.export_historical_data)
+        main_layout.addWidget(self.export_button)
+
         return self.data_retrieval_widget
 
-
-    def retrieve_historical_data(self):
-        '''
-        Called when 'Get Data' button is clicked.
-        Fetches records from storage between selected dates and experiment numbers,
-        updates the UI labels, and plots the retrieved data.
-        '''
-        from helper.data_get import get_data_by_date_and_experiment
-        import re
-        from PyQt5.QtWidgets import QMessageBox
-
+    def _update_experiment_hint(self):
+        """List the catalogued experiments of the selected date range in the input's hint."""
+        start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
+        end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
+        try:
+            experiments = data.catalog.between(start_date, end_date)
+        except Exception as e:
+            print(f"Error reading experiment catalog: {e}")
+            return
+        if not experiments:
+            self.exp_input.setPlaceholderText("No experiments logged")
+            self.exp_input.setToolTip("")
+            return
+        numbers = sorted({exp.number for exp in experiments})
+        self.exp_input.setPlaceholderText("Available: " + ", ".join(map(str, numbers)))
+        lines = []
+        for exp in experiments:
+            started = QDateTime.fromMSecsSinceEpoch(exp.started_ms).toString("yyyy-MM-dd HH:mm:ss")
+            status = "running" if exp.running else f"{exp.samples} samples"
+            lines.append(f"{exp.label}  {started}  {exp.rig}  every {exp.interval_ms} ms  ({status})")
+        self.exp_input.setToolTip("\n".join(lines))
+
+
+    def _query_inputs(self):
+        """(start date, end date, experiment numbers) from the retrieval panel, or None."""
         start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
         end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
 
         exp_text = self.exp_input.text().strip()
         if not exp_text:
             QMessageBox.warning(self, "Input Error", "Please enter at least one experiment number.")
-            return
+            return None
 
         experiment_numbers = [int(x) for x in re.findall(r"\d+", exp_text)]
         if not experiment_numbers:
             QMessageBox.warning(self, "Input Error", "Invalid experiment number format.")
-            return
+            return None
+        return start_date, end_date, experiment_numbers
 
+    def retrieve_historical_data(self):
+        '''
+        Called when 'Get Data' button is clicked.
+        Starts a background query for records between the selected dates and
+        experiment numbers; any query still running is cancelled first. The
+        result is applied to the labels and plot in _on_retrieval_finished.
+        '''
+        inputs = self._query_inputs()
+        if inputs is not None:
+            self._start_retrieval(*inputs)
+
+    def _start_retrieval(self, start_date, end_date, experiment_numbers, quiet=False):
+        """Query in the background at the resolution the current scale needs.
+
+        ``quiet`` re-runs (after a scale change) redraw without message boxes.
+        """
+        self._cancel_retrieval()
+        self._retrieval_id += 1
+        request_id = self._retrieval_id
+        self._retrieval_request = (start_date, end_date, experiment_numbers, quiet)
+        resolution = self._history_resolution()
+        self._last_retrieval = (start_date, end_date, experiment_numbers, resolution)
         print(f"? Fetching data from {start_date} to {end_date} for experiments {experiment_numbers}...")
-        df = get_data_by_date_and_experiment(start_date, end_date, experiment_numbers)
-        if df.empty:
+
+        worker = RetrievalWorker(
+            request_id, start_date, end_date, experiment_numbers,
+            self._prepare_dataframe_for_display,
+            {"resolution": resolution, "max_points": self._plot_buckets()},
+        )
+        thread = QtCore.QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_retrieval_progress)
+        worker.finished.connect(self._on_retrieval_finished)
+        worker.failed.connect(self._on_retrieval_failed)
+        worker.cancelled.connect(self._on_retrieval_cancelled)
+        for signal in (worker.finished, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self._retrieval_jobs.pop(request_id, None))
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._retrieval_jobs[request_id] = (thread, worker)
+
+        self.get_data_button.setText("Retrieving... 0%")
+        thread.start()
+
+    def _cancel_retrieval(self):
+        """Cancel every running query; their late results are ignored by id."""
+        for _, worker in list(self._retrieval_jobs.values()):
+            worker.cancel()
+        self._retrieval_request = None
+        self.get_data_button.setText("Retrieve Data")
+
+    def _shutdown_retrievals(self, timeout_ms=3000):
+        self._cancel_retrieval()
+        for thread, _ in list(self._retrieval_jobs.values()):
+            thread.quit()
+            thread.wait(timeout_ms)
+
+    def closeEvent(self, event):
+        self.frame_timer.stop()
+        # Experiments sampled in this window end with it (a logger daemon's
+        # carry on); _shutdown_finishers below waits for their export
+        self._stop_all_experiments(silent=True, local_only=True)
+        self._close_rigs()
+        self._shutdown_retrievals()
+        self._shutdown_export()
+        self._shutdown_finishers()
+        if self._http_api is not None:
+            self._http_api.stop()
+            self._http_api = None
+        super().closeEvent(event)
+
+    def _on_retrieval_progress(self, request_id, percent):
+        if request_id == self._retrieval_id and self._retrieval_request is not None:
+            self.get_data_button.setText(f"Retrieving... {percent}%")
+
+    def _on_retrieval_cancelled(self, request_id):
+        print(f"?? Retrieval #{request_id} cancelled.")
+
+    def _on_retrieval_failed(self, request_id, message):
+        if request_id != self._retrieval_id or self._retrieval_request is None:
+            return
+        self._retrieval_request = None
+        self.get_data_button.setText("Retrieve Data")
+        QMessageBox.warning(self, "Query Failed", message)
+
+    def _on_retrieval_finished(self, request_id, result):
+        if request_id != self._retrieval_id or self._retrieval_request is None:
+            return
+        start_date, end_date, experiment_numbers, quiet = self._retrieval_request
+        self._retrieval_request = None
+        self.get_data_button.setText("Retrieve Data")
+        raw_count, cleaned_df = result
+
+        if quiet:
+            print(f"? Redrawn at {cleaned_df.attrs.get('resolution', 'raw')} resolution: {len(cleaned_df)} rows")
+            if not cleaned_df.empty:
+                self.last_retrieved_data = cleaned_df
+                self._apply_historical_dataset(cleaned_df)
+            return
+
+        if raw_count == 0:
             QMessageBox.information(
                 self,
                 "No Data Found",
@@ -1189,7 +1742,6 @@ class FullScreenWindow(QMainWindow):
             self._clear_plot_items()
             return
 
-        cleaned_df = self._prepare_dataframe_for_display(df)
         if cleaned_df.empty:
             QMessageBox.information(
                 self,
@@ -1200,9 +1752,12 @@ class FullScreenWindow(QMainWindow):
             return
 
         row_count = len(cleaned_df)
-        print(f"\n? Data retrieved successfully: {row_count} rows")
+        print(f"\n? Data retrieved successfully: {row_count} rows ({cleaned_df.attrs.get('resolution', 'raw')} resolution)")
         print(cleaned_df.head())
 
+        self.last_retrieved_data = cleaned_df
+        self._apply_historical_dataset(cleaned_df)
+
         QMessageBox.information(
             self,
             "Data Retrieved",
@@ -1210,9 +1765,82 @@ class FullScreenWindow(QMainWindow):
             f"for EXP {', '.join(map(str, experiment_numbers))}.",
         )
 
-        self.last_retrieved_data = cleaned_df
-        self._apply_historical_dataset(cleaned_df)
 
+    def export_historical_data(self):
+        """Stream the selected records to a CSV/Parquet/Excel file in the background.
+
+        Clicking the button while an export runs cancels it.
+        """
+        if self._export_job is not None:
+            self._cancel_export()
+            return
+        inputs = self._query_inputs()
+        if inputs is None:
+            return
+        start_date, end_date, experiment_numbers = inputs
+        suggested = os.path.join(data.log_dir, f"records_{start_date}_{end_date}.csv")
+        destination, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Records",
+            suggested,
+            "CSV (*.csv);;Parquet (*.parquet);;Excel (*.xlsx)",
+        )
+        if not destination:
+            return
+        if not Path(destination).suffix:
+            destination += ".csv"
+        print(f"? Exporting {start_date} to {end_date} for experiments {experiment_numbers} to {destination}...")
+
+        worker = ExportWorker(destination, start_date, end_date, experiment_numbers)
+        thread = QtCore.QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_export_progress)
+        worker.finished.connect(self._on_export_finished)
+        worker.failed.connect(self._on_export_failed)
+        worker.cancelled.connect(self._on_export_cancelled)
+        for signal in (worker.finished, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._export_job = (thread, worker)
+
+        self.export_button.setText("Exporting... 0% (click to cancel)")
+        thread.start()
+
+    def _cancel_export(self):
+        if self._export_job is not None:
+            self._export_job[1].cancel()
+            self.export_button.setText("Cancelling export...")
+
+    def _shutdown_export(self, timeout_ms=3000):
+        if self._export_job is not None:
+            thread, worker = self._export_job
+            worker.cancel()
+            thread.quit()
+            thread.wait(timeout_ms)
+
+    def _end_export(self):
+        self._export_job = None
+        self.export_button.setText("Export Data...")
+
+    def _on_export_progress(self, percent):
+        if self._export_job is not None and not self._export_job[1].cancel_event.is_set():
+            self.export_button.setText(f"Exporting... {percent}% (click to cancel)")
+
+    def _on_export_finished(self, rows):
+        destination = self._export_job[1].destination
+        self._end_export()
+        print(f"? Exported {rows} records to {destination}")
+        QMessageBox.information(self, "Export Complete", f"? Exported {rows} records to\n{destination}")
+
+    def _on_export_failed(self, message):
+        self._end_export()
+        QMessageBox.warning(self, "Export Failed", message)
+
+    def _on_export_cancelled(self):
+        self._end_export()
+        print("?? Export cancelled.")
 
 # --- Main Application Execution ---
 if __name__ == '__main__':
@@ -1221,7 +1849,25 @@ if __name__ == '__main__':
     if hasattr(QtCore.Qt, 'AA_UseHighDpiPixmaps'):
         QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
 
+    # --profile-startup: print per-phase import/initialisation times once the
+    # window is up, then exit.
+    profile_startup = "--profile-startup" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--profile-startup")
+
     app = QApplication(sys.argv)
+    startup_profile.mark("QApplication")
     window = FullScreenWindow()
+    # Rigs stop (and queue their last records) before the writer drains
+    app.aboutToQuit.connect(window._close_rigs)
+    app.aboutToQuit.connect(shutdown_record_writer)
+    app.aboutToQuit.connect(data.close)
+    if profile_startup:
+        def _report_startup():
+            print(startup_profile.report())
+            print(f"startup total: {startup_profile.total_s * 1000:.1f} ms")
+            app.quit()
+
+        window.startup_finished.connect(_report_startup)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,59 @@
+"""helper.csv_index: byte ranges of rigs whose rows interleave in the CSV log."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from helper import data_get
+from helper.acquisition import Sample
+from helper.csv_index import MERGE_GAP_BYTES, CsvIndex
+from helper.data_insert import insert_experiment_records
+from helper.rig import sample_record
+
+DAY = date(2025, 1, 1)
+VALUES = {"temp_1": 29.8, "temp_2": 27.3, "weight_1": 30.15, "weight_2": 15.18, "room_temp": 21.0}
+FIRST_MS = int(datetime(2025, 1, 1, 8).timestamp() * 1000)
+
+
+def test_interleaved_rows_keep_one_range_per_experiment(tmp_path):
+    index = CsvIndex(tmp_path / "experiment_records.csv")
+    for row in range(6):
+        index.add("2025-01-01", f"EXP_{1 + row % 2}", row * 10, row * 10 + 10)
+    assert index.ranges == {"2025-01-01": {"EXP_1": [[0, 50]], "EXP_2": [[10, 60]]}}
+    assert index.select(DAY, DAY, [1]) == [(0, 50)]
+    assert index.select(DAY, DAY, [1, 2]) == [(0, 60)]
+
+    # Rows that do not follow on from the last one start a new run
+    index.add("2025-01-01", "EXP_1", 100, 110)
+    index.add("2025-01-01", "EXP_2", 110, 120)
+    assert index.ranges["2025-01-01"]["EXP_1"] == [[0, 50], [100, 110]]
+    assert index.select(DAY, DAY, [1]) == [(0, 50), (100, 110)]
+    assert index.select(DAY, date(2025, 1, 2), [3]) == []
+
+
+def test_a_long_stretch_of_another_rig_splits_the_range(tmp_path):
+    index = CsvIndex(tmp_path / "experiment_records.csv")
+    index.add("2025-01-01", "EXP_1", 0, 10)
+    index.add("2025-01-01", "EXP_2", 10, 10 + MERGE_GAP_BYTES + 1)
+    index.add("2025-01-01", "EXP_1", 11 + MERGE_GAP_BYTES, 21 + MERGE_GAP_BYTES)
+    assert index.ranges["2025-01-01"]["EXP_1"] == [[0, 10], [11 + MERGE_GAP_BYTES, 21 + MERGE_GAP_BYTES]]
+
+
+def test_queries_over_interleaved_rigs_return_only_the_selected_experiment(tmp_path):
+    csv_path = tmp_path / "experiment_records.csv"
+    records = [sample_record(Sample(i, FIRST_MS + i * 500, 0.0, VALUES), f"EXP_{1 + i % 2}") for i in range(40)]
+    for batch in range(0, 40, 8):
+        insert_experiment_records(records[batch : batch + 8], csv_path=csv_path)
+
+    index = CsvIndex.load(csv_path)
+    assert index.ranges == CsvIndex(csv_path).rebuild().ranges
+    assert {experiment: len(spans) for experiment, spans in index.ranges["2025-01-01"].items()} == {
+        "EXP_1": 1,
+        "EXP_2": 1,
+    }
+    for number in (1, 2):
+        frame = data_get.get_data_by_date_and_experiment(
+            "2025-01-01", "2025-01-01", [number], csv_path, use_partitions=False
+        )
+        assert set(frame["experiment"]) == {f"EXP_{number}"}
+        assert frame["ms"].tolist() == [FIRST_MS + i * 500 for i in range(number - 1, 40, 2)]
@@ -0,0 +1,27 @@
+"""helper.data_get: reading experiment records back from the CSV log."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from helper import data_get
+from helper.acquisition import Sample
+from helper.data_insert import insert_experiment_records
+from helper.rig import sample_record
+
+VALUES = {"temp_1": 29.8, "temp_2": 27.3, "weight_1": 30.15, "weight_2": 15.18, "room_temp": 21.0}
+
+
+def test_query_scans_the_csv_when_the_offset_index_fails(tmp_path, monkeypatch, capsys):
+    csv_path = tmp_path / "experiment_records.csv"
+    start = int(datetime(2025, 1, 1, 8).timestamp() * 1000)
+    records = [sample_record(Sample(i, start + i * 1000, 0.0, VALUES), f"EXP_{1 + i % 2}") for i in range(10)]
+    insert_experiment_records(records, csv_path=csv_path)
+
+    def fail(*args, **kwargs):
+        raise ValueError("corrupt index")
+
+    monkeypatch.setattr(data_get, "_read_indexed", fail)
+    frame = data_get.get_data_by_date_and_experiment("2025-01-01", "2025-01-01", [1], csv_path, use_partitions=False)
+    assert frame["ms"].tolist() == [start + i * 1000 for i in range(0, 10, 2)]
+    assert "Offset index unavailable (corrupt index)" in capsys.readouterr().out
@@ -0,0 +1,119 @@
+"""helper.data_insert: appending to record logs and mirroring them into the stores."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from helper import data_get, data_insert, partitions, schema
+
+V1_ROWS = [
+    "2026-10-17,09:59:58,EXP_1,29.8,27.3,30.15,15.18,14.97,21.0",
+    "2026-10-17,09:59:59,EXP_1,29.9,27.4,30.14,15.18,14.96,21.0",
+]
+FIRST_MS = int(datetime(2026, 10, 17, 10, 0, 1).timestamp() * 1000)
+
+
+def record(ms: int) -> dict[str, object]:
+    stamp = datetime.fromtimestamp(ms / 1000)
+    return {
+        "date": stamp.strftime("%Y-%m-%d"),
+        "time": stamp.strftime("%H:%M:%S"),
+        "experiment": "EXP_1",
+        "temp_1": 29.8,
+        "temp_2": 27.3,
+        "weight_1": 30.15,
+        "weight_2": 15.18,
+        "difference": 14.97,
+        "room_temp": 21.0,
+        "ms": ms,
+    }
+
+
+@pytest.fixture
+def v1_log(tmp_path):
+    csv_path = tmp_path / "experiment_records.csv"
+    csv_path.write_text("\r\n".join([",".join(schema.LEGACY_COLUMNS), *V1_ROWS]) + "\r\n", encoding="utf-8")
+    return csv_path
+
+
+def v1_ms(time_text: str) -> int:
+    return int(datetime.fromisoformat(f"2026-10-17T{time_text}").timestamp() * 1000)
+
+
+def query_ms(csv_path, **kwargs) -> list[int]:
+    frame = data_get.get_data_by_date_and_experiment("2026-10-17", "2026-10-17", [1], csv_path, **kwargs)
+    return frame["ms"].tolist()
+
+
+def test_reading_a_version_1_log_derives_ms_from_date_and_time(v1_log):
+    frame = schema.read_csv_typed(v1_log)
+    assert schema.schema_version(schema.read_header(v1_log)) == 1
+    assert frame["ms"].tolist() == [v1_ms("09:59:58"), v1_ms("09:59:59")]
+    assert frame["temp_1"].tolist() == [29.8, 29.9]
+
+
+def test_appending_to_a_version_1_log_upgrades_it_first(v1_log):
+    stamps = [FIRST_MS + 250 * i for i in range(4)]
+    data_insert.insert_experiment_records([record(ms) for ms in stamps], csv_path=v1_log)
+
+    assert schema.read_header(v1_log) == schema.COLUMNS
+    lines = v1_log.read_bytes().split(b"\r\n")
+    assert lines[1] == f"{V1_ROWS[0]},{v1_ms('09:59:58')}".encode()
+    expected = [v1_ms("09:59:58"), v1_ms("09:59:59"), *stamps]
+    assert schema.read_csv_typed(v1_log)["ms"].tolist() == expected
+    assert query_ms(v1_log, use_partitions=False) == expected
+    assert query_ms(v1_log, streaming=True) == expected
+
+
+def test_writer_keeps_sub_second_ms_in_a_version_1_log_and_rebuilt_stores(v1_log):
+    stamps = [FIRST_MS + 250 * i for i in range(4)]
+    writer = data_insert.RecordWriter(v1_log, fsync="never", backend="partitions").start()
+    for ms in stamps:
+        assert writer.submit(record(ms))
+    assert writer.flush()
+    writer.close()
+
+    expected = [v1_ms("09:59:58"), v1_ms("09:59:59"), *stamps]
+    assert query_ms(v1_log) == expected
+
+    (partitions.partition_root_for(v1_log) / partitions.MANIFEST_NAME).unlink()
+    data_insert.ensure_partition_store(v1_log)
+    assert partitions.is_ready(partitions.partition_root_for(v1_log))
+    assert query_ms(v1_log) == expected
+
+
+def test_version_2_logs_are_appended_to_as_they_are(tmp_path):
+    csv_path = tmp_path / "experiment_records.csv"
+    data_insert.insert_experiment_records([record(FIRST_MS)], csv_path=csv_path)
+    before = csv_path.stat().st_ino
+    assert not data_insert.needs_upgrade(csv_path)
+    data_insert.insert_experiment_records([record(FIRST_MS + 250)], csv_path=csv_path)
+    assert csv_path.stat().st_ino == before
+    assert query_ms(csv_path, use_partitions=False) == [FIRST_MS, FIRST_MS + 250]
+
+
+def test_failed_sqlite_insert_discards_the_store_until_it_is_rebuilt(tmp_path, monkeypatch):
+    from helper import sqlite_store
+
+    csv_path = tmp_path / "experiment_records.csv"
+    db_path = sqlite_store.db_path_for(csv_path)
+    writer = data_insert.RecordWriter(csv_path, fsync="never", backend="sqlite").start()
+    assert writer.submit(record(FIRST_MS)) and writer.flush()
+    assert sqlite_store.is_ready(db_path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk I/O error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sqlite_store, "append_rows", fail)
+        assert writer.submit(record(FIRST_MS + 250)) and writer.flush()
+    assert not sqlite_store.is_ready(db_path)
+    assert query_ms(csv_path, backend="sqlite") == [FIRST_MS, FIRST_MS + 250]  # read from the CSV
+
+    assert writer.submit(record(FIRST_MS + 500)) and writer.flush()
+    writer.close()
+    data_insert.ensure_store(csv_path, "sqlite")
+    assert sqlite_store.is_ready(db_path)
+    assert query_ms(csv_path, backend="sqlite") == [FIRST_MS, FIRST_MS + 250, FIRST_MS + 500]
@@ -0,0 +1,205 @@
+"""helper.http_api: live feed, query cache and the HTTP endpoints on localhost."""
+
+from __future__ import annotations
+
+import gzip
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+from helper.acquisition import Sample
+from helper.data_insert import insert_experiment_records
+from helper.http_api import LiveFeed, QueryCache, RecordQueries
+from helper.rig import sample_record
+
+VALUES = {"temp_1": 29.8, "temp_2": 27.3, "weight_1": 30.15, "weight_2": 15.18, "room_temp": 21.0}
+
+
+def write_records(csv_path, day: str, number: int, count: int, first_second: int = 0) -> None:
+    """``count`` records of ``EXP_<number>`` on ``day``, one per second from ``first_second``."""
+    start = datetime.fromisoformat(f"{day}T08:00:00").timestamp() * 1000
+    records = [
+        sample_record(Sample(i, int(start + (first_second + i) * 1000), 0.0, VALUES), f"EXP_{number}")
+        for i in range(count)
+    ]
+    insert_experiment_records(records, csv_path=csv_path)
+
+
+@pytest.fixture
+def record_log(tmp_path):
+    csv_path = tmp_path / "experiment_records.csv"
+    write_records(csv_path, "2025-01-01", 1, 200)
+    write_records(csv_path, "2025-01-02", 1, 200)
+    write_records(csv_path, "2025-01-02", 2, 200)
+    return csv_path
+
+
+# ---------------------------------------------------------------- live feed
+def test_live_feed_returns_events_after_id():
+    feed = LiveFeed()
+    ids = [feed.publish({"n": n}) for n in range(5)]
+    assert ids == [1, 2, 3, 4, 5]
+    assert [event_id for event_id, _ in feed.wait(2, timeout=0)] == [3, 4, 5]
+    assert feed.wait(5, timeout=0) == []
+
+
+def test_live_feed_skips_ahead_past_its_backlog():
+    feed = LiveFeed(backlog=3)
+    for n in range(10):
+        feed.publish({"n": n})
+    assert [event_id for event_id, _ in feed.wait(1, timeout=0)] == [8, 9, 10]
+
+
+def test_live_feed_stream_resumes_after_id():
+    feed = LiveFeed()
+    for n in range(3):
+        feed.publish({"n": n})
+    stream = feed.stream(1, "sse")
+    assert next(stream) == b"retry: 2000\n\n"
+    assert next(stream) == b'id: 2\ndata: {"n":1}\n\nid: 3\ndata: {"n":2}\n\n'
+    feed.close()
+
+
+# ------------------------------------------------------------- query cache
+def test_query_cache_evicts_least_recently_used_within_byte_bound():
+    cache = QueryCache(max_bytes=100)
+    cache.put("a", {"identity": b"a" * 40})
+    cache.put("b", {"identity": b"b" * 40})
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", {"identity": b"c" * 40})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_query_cache_skips_entries_larger_than_its_bound():
+    cache = QueryCache(max_bytes=100)
+    cache.put("a", {"identity": b"a" * 60})
+    cache.put("big", {"identity": b"x" * 80, "gzip": b"x" * 30})
+    assert cache.get("big") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["bytes"] == 60
+
+
+def test_query_versions_follow_the_queried_rows(record_log):
+    queries = RecordQueries(record_log)
+    past = RecordQueries.parse({"start": "2025-01-01", "experiments": "1"})
+    latest = RecordQueries.parse({"start": "2025-01-02", "experiments": "1"})
+    past_etag, _ = queries.version(past)
+    latest_etag, _ = queries.version(latest)
+
+    write_records(record_log, "2025-01-02", 1, 10, first_second=200)
+    assert queries.version(past)[0] == past_etag
+    assert queries.version(latest)[0] != latest_etag
+
+
+# ------------------------------------------------------------------- routes
+@pytest.fixture
+def client(record_log):
+    pytest.importorskip("flask")
+    from helper.http_api import create_app
+
+    feed = LiveFeed()
+    queries = RecordQueries(record_log, QueryCache(max_bytes=64 * 1024))
+    app = create_app([], feed, queries)
+    yield app.test_client(), feed, queries
+    feed.close()
+
+
+def test_records_answer_conditional_requests_with_304(client, record_log):
+    http, _, _ = client
+    url = "/api/records?start=2025-01-01&end=2025-01-02&experiments=1"
+    first = http.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert len(first.get_json()["data"]) == 400
+
+    again = http.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+    write_records(record_log, "2025-01-02", 1, 10, first_second=200)
+    changed = http.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.get_json()["data"]) == 410
+
+
+def test_records_are_gzipped_only_when_accepted(client):
+    http, _, _ = client
+    url = "/api/records?start=2025-01-02&experiments=1,2"
+    plain = http.get(url)
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+
+    packed = http.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(packed.data) == plain.data
+    assert len(packed.data) < len(plain.data)
+
+
+def test_records_reject_invalid_queries(client):
+    http, _, _ = client
+    assert http.get("/api/records?start=2025-01-02&end=2025-01-01&experiments=1").status_code == 400
+    assert http.get("/api/records?start=yesterday&experiments=1").status_code == 400
+    assert http.get("/api/records?start=2025-01-01").status_code == 400
+
+
+def test_records_cache_stays_within_its_byte_bound(client):
+    http, _, queries = client
+    for resolution in ("raw", "minute", "hour"):
+        for experiments in ("1", "2", "1,2"):
+            url = f"/api/records?start=2025-01-01&end=2025-01-02&experiments={experiments}&resolution={resolution}"
+            assert http.get(url).status_code == 200
+    stats = queries.cache.stats()
+    assert 0 < stats["bytes"] <= queries.cache.max_bytes
+    assert stats["misses"] == 9
+
+    http.get("/api/records?start=2025-01-01&end=2025-01-02&experiments=1,2&resolution=hour")
+    assert queries.cache.stats()["hits"] >= 1
+
+
+def test_live_stream_resumes_after_last_event_id(client):
+    http, feed, _ = client
+    for n in range(4):
+        feed.publish({"n": n})
+    response = http.get("/api/live", headers={"Last-Event-ID": "2"}, buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert next(chunks) == b"retry: 2000\n\n"
+    assert next(chunks) == b'id: 3\ndata: {"n":2}\n\nid: 4\ndata: {"n":3}\n\n'
+    response.close()
+
+    assert http.get("/api/live?since=nope").status_code == 400
+
+
+def test_api_server_serves_on_an_ephemeral_localhost_port(record_log):
+    pytest.importorskip("flask")
+    from helper.http_api import ApiServer
+
+    server = ApiServer([], record_log, port=0).start()
+    try:
+        assert server.port != 0
+        url = f"{server.url}/api/records?start=2025-01-02&experiments=2"
+        request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            assert response.headers["Content-Encoding"] == "gzip"
+            etag = response.headers["ETag"]
+            assert gzip.decompress(response.read()).startswith(b'{"columns"')
+
+        request = urllib.request.Request(url, headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(request, timeout=10)
+        assert raised.value.code == 304
+
+        server.feed.publish({"n": 0})
+        server.feed.publish({"n": 1})
+        request = urllib.request.Request(f"{server.url}/api/live", headers={"Last-Event-ID": "1"})
+        with urllib.request.urlopen(request, timeout=10) as stream:
+            lines = [stream.readline() for _ in range(5)]
+        assert lines[2:4] == [b"id: 2\n", b'data: {"n":1}\n']
+    finally:
+        server.stop()
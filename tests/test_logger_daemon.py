@@ -0,0 +1,154 @@
+"""helper.logger_daemon: a daemon on a loopback port, viewed through RemoteRig."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from helper import data_insert, logger_daemon
+from helper.http_api import LiveFeed
+from helper.rig import Rig
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+@pytest.fixture(autouse=True)
+def no_explicit_key(monkeypatch):
+    monkeypatch.delenv("BPCL_LOGGER_AUTHKEY", raising=False)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    previous = data_insert.set_record_writer(
+        data_insert.RecordWriter(tmp_path / "experiment_records.csv", fsync="never").start()
+    )
+    address = ("127.0.0.1", free_port())
+    instance = logger_daemon.LoggerDaemon([Rig("Bench A", tmp_path, interval_ms=20)], log_dir=tmp_path)
+    thread = threading.Thread(target=instance.serve, args=(address,), daemon=True)
+    thread.start()
+    wait_for(lambda: instance.rigs[0].engine.running)
+    rigs = None
+    try:
+        rigs = logger_daemon.attach_rigs(f"{address[0]}:{address[1]}", log_dir=tmp_path)
+        yield instance, rigs
+    finally:
+        for rig in rigs or ():
+            rig.close()
+        instance.stop()
+        thread.join(10)
+        data_insert.set_record_writer(previous)
+
+
+def test_daemon_generates_a_key_only_its_owner_can_read(tmp_path):
+    with pytest.raises(ConnectionError):
+        logger_daemon.authkey(tmp_path)
+
+    key = logger_daemon.authkey(tmp_path, create=True)
+    assert len(key) == 64
+    assert logger_daemon.authkey(tmp_path, create=True) == key
+    assert logger_daemon.authkey(tmp_path) == key
+    if os.name == "posix":
+        mode = stat.S_IMODE(logger_daemon.key_path(tmp_path).stat().st_mode)
+        assert mode == 0o600
+
+
+def test_explicit_key_wins_over_the_key_file(tmp_path, monkeypatch):
+    logger_daemon.authkey(tmp_path, create=True)
+    monkeypatch.setenv("BPCL_LOGGER_AUTHKEY", "shared secret")
+    assert logger_daemon.authkey(tmp_path) == b"shared secret"
+
+
+def test_non_loopback_addresses_need_an_explicit_key(monkeypatch):
+    logger_daemon.check_address(("127.0.0.1", 8766))
+    logger_daemon.check_address(("::1", 8766))
+    logger_daemon.check_address(("localhost", 8766))
+    for host in ("0.0.0.0", "", "192.168.1.20", "bench-pc"):
+        with pytest.raises(ValueError):
+            logger_daemon.check_address((host, 8766))
+        with pytest.raises(ValueError):
+            logger_daemon.LoggerDaemon([]).serve((host, 8766))
+
+    monkeypatch.setenv("BPCL_LOGGER_AUTHKEY", "shared secret")
+    logger_daemon.check_address(("0.0.0.0", 8766))
+
+
+def test_dashboards_with_another_key_are_turned_away(daemon, tmp_path, monkeypatch):
+    _, rigs = daemon
+    host, port = rigs[0]._client.address
+    monkeypatch.setenv("BPCL_LOGGER_AUTHKEY", "wrong key")
+    with pytest.raises(ConnectionError):
+        logger_daemon.attach_rigs(f"{host}:{port}", log_dir=tmp_path)
+
+
+def test_remote_rig_subscribers_get_samples_published_after_subscribing(daemon):
+    _, (rig,) = daemon
+    wait_for(lambda: rig.ring.write_seq >= 3)
+    subscribed_at = rig.ring.write_seq
+    received = []
+    unsubscribe = rig.engine.subscribe(received.append)
+
+    wait_for(lambda: rig.ring.write_seq >= subscribed_at + 3)
+    rig.drain()
+    assert received
+    assert all(sample.seq > subscribed_at for sample in received)
+    assert [sample.seq for sample in received] == list(range(received[0].seq, received[-1].seq + 1))
+
+    unsubscribe()
+    count = len(received)
+    wait_for(lambda: rig.ring.write_seq > received[-1].seq)
+    rig.drain()
+    assert len(received) == count
+
+
+def test_live_feed_follows_a_daemon_backed_rig(daemon):
+    _, rigs = daemon
+    feed = LiveFeed()
+    feed.attach(rigs)
+    try:
+        wait_for(lambda: rigs[0].drain() and feed.last_id > 0)
+        events = [json.loads(payload) for _, payload in feed.wait(0, timeout=0)]
+        assert events[0]["rig"] == "Bench A"
+        assert events[0]["experiment"] is None
+        assert set(events[0]["values"]) == set(rigs[0].ring.channels)
+    finally:
+        feed.close()
+
+
+def test_http_api_serves_a_daemon_backed_rig(daemon, tmp_path):
+    pytest.importorskip("flask")
+    from helper.http_api import ApiServer
+
+    _, rigs = daemon
+    server = ApiServer(rigs, tmp_path / "experiment_records.csv", port=0).start()
+    try:
+        client = server.app.test_client()
+        listed = client.get("/api/rigs").get_json()["rigs"]
+        assert [row["name"] for row in listed] == ["Bench A"]
+
+        wait_for(lambda: rigs[0].drain() and server.feed.last_id >= 2)
+        response = client.get("/api/live", headers={"Last-Event-ID": "1"}, buffered=False)
+        chunks = iter(response.response)
+        assert next(chunks) == b"retry: 2000\n\n"
+        first = next(chunks).split(b"\n\n")[0]
+        assert first.startswith(b"id: 2\ndata: ")
+        assert json.loads(first.split(b"data: ", 1)[1])["rig"] == "Bench A"
+        response.close()
+    finally:
+        server.stop()
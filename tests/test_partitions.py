@@ -0,0 +1,73 @@
+"""helper.partitions: appends that tear between the column files and ``_rows``."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import numpy as np
+
+from helper import partitions, schema
+
+DAY = "2025-01-01"
+FIRST_MS = int(datetime(2025, 1, 1, 8).timestamp() * 1000)
+
+
+def rows(first: int, count: int) -> list[tuple]:
+    return [
+        (DAY, f"08:00:{second:02d}", "EXP_1", 20.0 + second, 27.3, 30.15, 15.18, 14.97, 21.0, FIRST_MS + second * 1000)
+        for second in range(first, first + count)
+    ]
+
+
+def stored_ms(root) -> list[int]:
+    frame = partitions.query(root, date(2025, 1, 1), date(2025, 1, 1), [1], schema.COLUMNS)
+    assert frame["temp_1"].tolist() == [20.0 + (ms - FIRST_MS) / 1000 for ms in frame["ms"]]
+    return frame["ms"].tolist()
+
+
+def test_rows_past_the_committed_count_are_ignored_then_overwritten(tmp_path):
+    root = tmp_path / "partitions"
+    partitions.append_rows(root, schema.COLUMNS, rows(0, 3))
+    partition = root / DAY / "EXP_1"
+
+    # An append that died after writing some column files, before ``_rows``
+    for column, suffix in (("ms", "i8"), ("temp_1", "f8")):
+        with (partition / f"{column}.{suffix}").open("ab") as fh:
+            fh.write(np.full(2, 99, dtype=f"<{suffix}").tobytes())
+    assert partitions.committed_rows(partition) == 3
+    assert stored_ms(root) == [FIRST_MS, FIRST_MS + 1000, FIRST_MS + 2000]
+
+    partitions.append_rows(root, schema.COLUMNS, rows(3, 2))
+    assert partitions.committed_rows(partition) == 5
+    assert stored_ms(root) == [FIRST_MS + second * 1000 for second in range(5)]
+    assert (partition / "ms.i8").stat().st_size == 5 * 8
+
+
+def test_a_torn_rows_marker_update_keeps_the_last_committed_count(tmp_path):
+    root = tmp_path / "partitions"
+    partitions.append_rows(root, schema.COLUMNS, rows(0, 3))
+    partition = root / DAY / "EXP_1"
+
+    # ``_rows`` is replaced atomically; a crash can only leave its temp file behind
+    (partition / f"{partitions.ROWS_NAME}.tmp").write_text("4", encoding="ascii")
+    assert partitions.committed_rows(partition) == 3
+    assert stored_ms(root) == [FIRST_MS, FIRST_MS + 1000, FIRST_MS + 2000]
+
+    partitions.append_rows(root, schema.COLUMNS, rows(3, 1))
+    assert stored_ms(root) == [FIRST_MS + second * 1000 for second in range(4)]
+    assert not (partition / f"{partitions.ROWS_NAME}.tmp").exists()
+
+
+def test_stores_without_a_rows_marker_trim_to_the_shortest_column(tmp_path):
+    root = tmp_path / "partitions"
+    partitions.append_rows(root, schema.COLUMNS, rows(0, 3))
+    partition = root / DAY / "EXP_1"
+    (partition / partitions.ROWS_NAME).unlink()
+    with (partition / "ms.i8").open("ab") as fh:
+        fh.write(np.full(1, 99, dtype="<i8").tobytes())
+
+    assert partitions.committed_rows(partition) is None
+    assert stored_ms(root) == [FIRST_MS, FIRST_MS + 1000, FIRST_MS + 2000]
+    partitions.append_rows(root, schema.COLUMNS, rows(3, 1))
+    assert partitions.committed_rows(partition) == 4
+    assert stored_ms(root) == [FIRST_MS + second * 1000 for second in range(4)]
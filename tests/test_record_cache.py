@@ -0,0 +1,111 @@
+"""helper.record_cache: raw query results cached per day over the active store."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from helper import data_get, record_cache
+from helper.acquisition import Sample
+from helper.data_insert import insert_experiment_records
+from helper.rig import sample_record
+
+VALUES = {"temp_1": 29.8, "temp_2": 27.3, "weight_1": 30.15, "weight_2": 15.18, "room_temp": 21.0}
+
+
+def write_records(csv_path, day: str, number: int, count: int, first_second: int = 0) -> None:
+    start = datetime.fromisoformat(f"{day}T08:00:00").timestamp() * 1000
+    records = [
+        sample_record(Sample(i, int(start + (first_second + i) * 1000), 0.0, VALUES), f"EXP_{number}")
+        for i in range(count)
+    ]
+    insert_experiment_records(records, csv_path=csv_path)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = record_cache.RecordCache()
+    monkeypatch.setattr(record_cache, "_CACHE", fresh)
+    return fresh
+
+
+@pytest.fixture
+def record_log(tmp_path):
+    csv_path = tmp_path / "experiment_records.csv"
+    write_records(csv_path, "2025-01-01", 1, 50)
+    write_records(csv_path, "2025-01-02", 1, 50)
+    write_records(csv_path, "2025-01-02", 2, 50)
+    return csv_path
+
+
+def query(csv_path, start="2025-01-01", end="2025-01-02", numbers=(1, 2), **kwargs):
+    return data_get.get_data_by_date_and_experiment(start, end, list(numbers), csv_path, **kwargs)
+
+
+def counts(cache) -> tuple[int, int]:
+    stats = cache.stats()
+    return stats["hits"], stats["misses"]
+
+
+@pytest.mark.parametrize("backend", ["partitions", "sqlite"])
+def test_repeated_queries_are_answered_from_the_cache(cache, record_log, backend):
+    uncached = query(record_log, backend=backend, use_cache=False)
+    first = query(record_log, backend=backend)
+    assert counts(cache) == (0, 4)
+    again = query(record_log, backend=backend)
+    assert counts(cache) == (4, 4)
+    for frame in (first, again):
+        assert frame["ms"].tolist() == uncached["ms"].tolist()
+        assert frame.dtypes.to_dict() == uncached.dtypes.to_dict()
+
+    query(record_log, end="2025-01-03", backend=backend)  # one more day: only its pairs are read
+    assert counts(cache) == (8, 6)
+    assert cache.stats()["refreshes"] == 2
+
+
+def test_a_commit_refreshes_only_the_pairs_it_appended_to(cache, record_log):
+    query(record_log)
+    write_records(record_log, "2025-01-02", 2, 5, first_second=50)
+    assert cache.stats()["invalidations"] == 1
+
+    frame = query(record_log)
+    assert counts(cache) == (3, 5)
+    assert len(frame[frame["experiment"] == "EXP_2"]) == 55
+    assert cache.stats()["tail_scans"] == 0
+
+
+def test_rows_appended_by_another_process_are_found_in_the_tail(cache, record_log, monkeypatch):
+    query(record_log)
+    with monkeypatch.context() as patch:
+        patch.setattr(record_cache, "note_commit", lambda *args: None)
+        write_records(record_log, "2025-01-01", 1, 5, first_second=50)
+
+    frame = query(record_log)
+    stats = cache.stats()
+    assert (stats["tail_scans"], stats["invalidations"]) == (1, 1)
+    assert counts(cache) == (3, 5)
+    assert len(frame[frame["experiment"] == "EXP_1"]) == 105
+
+
+def test_a_replaced_log_drops_its_entries(cache, record_log):
+    query(record_log)
+    record_log.write_bytes(record_log.read_bytes())  # same bytes, rewritten
+    query(record_log)
+    assert counts(cache) == (0, 8)
+
+
+def test_least_recently_used_days_are_evicted_over_the_cap(cache, record_log):
+    query(record_log, start="2025-01-01", end="2025-01-01")
+    query(record_log, start="2025-01-02", end="2025-01-02")
+    query(record_log, start="2025-01-01", end="2025-01-01")  # 2025-01-02 is now the oldest
+    cache.configure(cache.stats()["memory_bytes"] - 1)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["cached_days"] == 1
+    assert stats["memory_bytes"] <= stats["max_bytes"]
+    hits, misses = counts(cache)
+    query(record_log, start="2025-01-01", end="2025-01-01")
+    assert counts(cache) == (hits + 2, misses)
+    query(record_log, start="2025-01-02", end="2025-01-02")
+    assert counts(cache) == (hits + 2, misses + 2)
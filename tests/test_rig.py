@@ -0,0 +1,31 @@
+"""helper.rig: finishing a stopped experiment in the background."""
+
+from __future__ import annotations
+
+import time
+
+from helper import data_get
+from helper.catalog import ExperimentCatalog
+from helper.rig import Rig, StoppedExperiment
+
+
+def test_catalog_entry_is_completed_when_the_export_fails(tmp_path, monkeypatch):
+    catalog = ExperimentCatalog(tmp_path / "experiments.sqlite3")
+    now = int(time.time() * 1000)
+    entry = catalog.begin("2026-10-17", rig="Bench A", interval_ms=2000, started_ms=now)
+    stopped = StoppedExperiment(entry.number, now, now + 4000, 2, experiment_id=entry.id)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("unreadable record log")
+
+    monkeypatch.setattr(data_get, "get_data_by_date_and_experiment", fail)
+    rig = Rig("Bench A", tmp_path)
+    try:
+        assert rig.finish_experiment(stopped, catalog=catalog) is None
+    finally:
+        rig.close()
+
+    finished = catalog.get(entry.id)
+    assert not finished.running
+    assert (finished.stopped_ms, finished.samples, finished.sample_log) == (now + 4000, 2, None)
+    catalog.close()
@@ -0,0 +1,55 @@
+"""helper.sample_log: exported per-experiment logs, read back through a memory map."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper import sample_log, schema
+from helper.sensors import CHANNELS
+
+FIRST_MS = int(datetime(2025, 1, 1, 8).timestamp() * 1000)
+
+
+def export_frame(count: int) -> pd.DataFrame:
+    ms = [FIRST_MS + i * 250 for i in range(count)]
+    frame = pd.DataFrame({"ms": pd.array(ms, dtype="Int64"), "experiment": "EXP_1"})
+    for position, name in enumerate(schema.NUMERIC_COLUMNS):
+        frame[name] = np.arange(count, dtype=np.float64) + position
+    return frame
+
+
+def test_exported_logs_map_back_to_the_rows_written(tmp_path):
+    path = tmp_path / f"2025-01-01_EXP_1{sample_log.SUFFIX}"
+    frame = export_frame(40)
+    assert sample_log.write_frame(path, frame, CHANNELS, experiment="EXP_1", start_ms=FIRST_MS) == 40
+
+    log = sample_log.SampleLog(path)
+    assert (len(log), log.channels, log.experiment, log.start_ms) == (40, CHANNELS, "EXP_1", FIRST_MS)
+    assert isinstance(log.records, np.memmap)
+    assert log.column("ms").tolist() == frame["ms"].tolist()
+
+    window = log.between(FIRST_MS + 1000, FIRST_MS + 2000)
+    assert window["ms"].tolist() == [FIRST_MS + 1000, FIRST_MS + 1250, FIRST_MS + 1500, FIRST_MS + 1750]
+    rows = log.to_frame(window)
+    assert list(rows.columns) == list(schema.COLUMNS)
+    assert rows["temp_1"].tolist() == [4.0, 5.0, 6.0, 7.0]
+    assert rows["ms"].tolist() == window["ms"].tolist()
+
+
+def test_a_record_cut_short_is_ignored(tmp_path):
+    path = tmp_path / f"log{sample_log.SUFFIX}"
+    sample_log.write_frame(path, export_frame(3), CHANNELS)
+    with path.open("ab") as handle:
+        handle.write(b"\0" * 10)
+    assert len(sample_log.SampleLog(path)) == 3
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "notes.bin"
+    path.write_bytes(b"not a sample log at all, but long enough to hold a header")
+    with pytest.raises(sample_log.SampleLogError):
+        sample_log.SampleLog(path)
@@ -0,0 +1,40 @@
+"""helper.sqlite_store: queries over the SQLite mirror of a record log."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from helper import schema, sqlite_store
+
+
+def test_query_reports_progress_by_day_without_counting_rows(tmp_path):
+    db_path = tmp_path / "records.sqlite3"
+    rows = [
+        (day, f"08:00:{second:02d}", f"EXP_{number}", 29.8, 27.3, 30.15, 15.18, 14.97, 21.0, second)
+        for day in ("2025-01-01", "2025-01-03")
+        for number in (1, 2)
+        for second in range(5)
+    ]
+    with sqlite_store.connect(db_path) as conn:
+        sqlite_store.append_rows(conn, schema.COLUMNS, rows)
+    conn.close()
+
+    steps: list[tuple[int, int]] = []
+
+    def on_step(done: int, total: int) -> None:
+        steps.append((done, total))
+
+    frames = list(
+        sqlite_store.iter_query(
+            db_path, date(2025, 1, 1), date(2025, 1, 4), [1], schema.COLUMNS, on_step, chunk_rows=3
+        )
+    )
+    assert sum(len(frame) for frame in frames) == 10
+    assert set(frames[0]["experiment"]) == {"EXP_1"}
+    assert steps[0] == (0, 4) and steps[-1] == (4, 4)
+    assert [done for done, _ in steps] == sorted(done for done, _ in steps)
+
+    steps.clear()
+    frame = sqlite_store.query(db_path, date(2025, 1, 2), date(2025, 1, 3), [2], schema.COLUMNS, on_step)
+    assert frame["date"].astype(str).tolist() == ["2025-01-03"] * 5
+    assert steps[-1] == (2, 2)